@@ -5,6 +5,16 @@ import logging
 import io
 from google.colab import files
 import re
+import os
+import json
+import time
+import bisect
+import numpy as np
+
+try:
+    from openpyxl import load_workbook
+except ImportError:
+    load_workbook = None
 
 # Loglama ayarlarını yapılandır
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -12,6 +22,14 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 # Çıktı dosyasının adını belirle
 OUTPUT_CSV_FILENAME = 'umai_icd_codes.csv'
 
+# Hiyerarşik ICD-10 indeks dosyasının adı
+OUTPUT_INDEX_FILENAME = 'umai_icd_index.bin'
+
+# Başlık satırı için incelenecek ilk satır sayısı
+HEADER_PROBE_ROWS = 3
+# Bu boyutun üzerindeki .xlsx dosyaları satır satır (read-only) okunur
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+
 def clean_icd_code(code):
     """
     ICD kodunu temizler ve 'A00' formatına standardize eder.
@@ -49,6 +67,627 @@ def clean_disease_name(name):
 
     return name
 
+def _cell_to_str(value):
+    """Excel hücresini pd.read_excel(dtype=str) ile aynı biçimde metne çevirir."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def detect_header_row(rows, max_probe=HEADER_PROBE_ROWS):
+    """
+    İlk satırlar arasında en az iki dolu hücre içeren ilk satırı başlık kabul eder.
+    Bulunamazsa None döner.
+    """
+    for index, row in enumerate(rows[:max_probe]):
+        filled = [cell for cell in row if cell is not None and not pd.isna(cell) and str(cell).strip()]
+        if len(filled) >= 2:
+            return index
+    return None
+
+def _header_to_columns(header):
+    """
+    Başlık satırını sütun adlarına çevirir (boş hücreler 'Unnamed: i').
+    Tekrarlanan adlar pd.read_excel(header=h) gibi 'Kod', 'Kod.1', 'Kod.2' olarak ayrılır.
+    """
+    columns = []
+    unnamed = []
+    for index, cell in enumerate(header):
+        if cell is None or pd.isna(cell) or not str(cell).strip():
+            columns.append(f"Unnamed: {index}")
+            unnamed.append(index)
+        else:
+            columns.append(str(cell).strip())
+
+    # pandas'ın ad ayrıştırması: başlıkta zaten bulunan sonekler atlanır, adsız sütunlar en son ele alınır
+    counts = {}
+    for index in [i for i in range(len(columns)) if i not in unnamed] + unnamed:
+        column = columns[index]
+        count = counts.get(column, 0)
+        if count > 0:
+            base = column
+            while count > 0:
+                counts[base] = count + 1
+                column = f"{base}.{count}"
+                count = count + 1 if column in columns else counts.get(column, 0)
+            columns[index] = column
+        counts[column] = count + 1
+    return columns
+
+def read_icd_workbook(file_content, max_header_probe=HEADER_PROBE_ROWS):
+    """
+    Çalışma kitabını tek seferde başlıksız okur, başlık satırını ilk satırlardan çıkarır.
+    (DataFrame, başlık satırı) döner; başlık bulunamazsa (None, None).
+    """
+    raw = pd.read_excel(io.BytesIO(file_content), dtype=str, header=None)
+
+    header_row = detect_header_row(raw.head(max_header_probe).values.tolist(), max_header_probe)
+    if header_row is None:
+        return None, None
+
+    df = raw.iloc[header_row + 1:].reset_index(drop=True)
+    df.columns = _header_to_columns(raw.iloc[header_row].tolist())
+    return df, header_row
+
+def iter_icd_workbook_chunks(source, chunk_size=50000, max_header_probe=HEADER_PROBE_ROWS):
+    """
+    .xlsx dosyasını openpyxl read-only modunda satır satır okur ve
+    chunk_size satırlık DataFrame parçaları üretir; bellek kullanımı satır sayısından bağımsızdır.
+    """
+    if load_workbook is None:
+        raise ImportError("Akışlı okuma için openpyxl gerekli: pip install openpyxl")
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+
+        # Başlığı bulmak için yalnızca ilk birkaç satır tamponlanır
+        probe = []
+        for row in rows:
+            probe.append([_cell_to_str(value) for value in row])
+            if len(probe) >= max_header_probe:
+                break
+
+        header_row = detect_header_row(probe, max_header_probe)
+        if header_row is None:
+            raise ValueError("Excel dosyasında başlık satırı bulunamadı.")
+
+        columns = _header_to_columns(probe[header_row])
+        width = len(columns)
+
+        def to_frame(chunk):
+            # read-only modda satır uzunlukları farklı olabilir, başlık genişliğine getir
+            chunk = [(row + [None] * width)[:width] for row in chunk]
+            return pd.DataFrame(chunk, columns=columns, dtype=object)
+
+        chunk = probe[header_row + 1:]
+        for row in rows:
+            chunk.append([_cell_to_str(value) for value in row])
+            if len(chunk) >= chunk_size:
+                yield to_frame(chunk)
+                chunk = []
+        if chunk:
+            yield to_frame(chunk)
+    finally:
+        workbook.close()
+
+def clean_icd_workbook_streaming(source, chunk_size=50000):
+    """
+    Büyük çalışma kitaplarını parça parça temizler; tekrarlanan kodlar parçalar arasında elenir.
+    (temiz DataFrame, okunan satır sayısı, sütun adları) döner.
+    """
+    seen_codes = set()
+    cleaned_chunks = []
+    total_rows = 0
+    columns = None
+
+    for chunk in iter_icd_workbook_chunks(source, chunk_size):
+        if columns is None:
+            columns = list(chunk.columns)
+            valid_columns = [col for col in columns if not str(col).startswith('Unnamed')]
+            if len(valid_columns) < 2:
+                raise ValueError("Excel dosyasında yeterli sütun bulunamadı.")
+            code_column, desc_column = valid_columns[0], valid_columns[1]
+
+        total_rows += len(chunk)
+        cleaned = clean_icd_table(chunk, code_column, desc_column)
+        cleaned = cleaned.drop_duplicates(subset=['icd_code'], keep='first')
+        cleaned = cleaned[~cleaned['icd_code'].isin(seen_codes)]
+        seen_codes.update(cleaned['icd_code'])
+        cleaned_chunks.append(cleaned)
+
+    if not cleaned_chunks:
+        return pd.DataFrame(columns=['icd_code', 'disease_name']), total_rows, columns or []
+
+    return pd.concat(cleaned_chunks, ignore_index=True), total_rows, columns
+
+def clean_icd_table(df, code_column, desc_column):
+    """
+    Kod ve açıklama sütunlarını vektörel pandas işlemleriyle tek geçişte temizler.
+    clean_icd_code / clean_disease_name ile satır satır temizlemeyle aynı sonucu verir.
+    """
+    # Python 're' ve str semantiğini korumak için object dtype (pyarrow string değil)
+    codes = df[code_column].fillna('').astype(str).astype(object)
+    names = df[desc_column].fillna('').astype(str).astype(object)
+
+    codes = codes.str.strip().str.upper()
+    names = names.str.strip().str.replace(r'\s+', ' ', regex=True)
+
+    # Geçerli ICD-10 formatı (Harf + 2 Rakam) ve boş olmayan isim
+    mask = codes.str.match(r'^[A-Z]\d{2}').fillna(False).astype(bool) & (names != '')
+
+    return pd.DataFrame({
+        'icd_code': codes[mask].to_numpy(),
+        'disease_name': names[mask].to_numpy()
+    })
+
+def clean_icd_table_rowwise(df, code_column, desc_column):
+    """
+    Eski satır satır (iterrows) temizleme; karşılaştırma ve benchmark için tutulur.
+    """
+    df = df[[code_column, desc_column]].fillna('')
+
+    cleaned_data = []
+    for index, row in df.iterrows():
+        clean_code = clean_icd_code(row[code_column])
+        clean_name = clean_disease_name(row[desc_column])
+
+        # Sadece geçerli kod ve isimleri listeye ekle
+        if clean_code and clean_name:
+            cleaned_data.append({
+                'icd_code': clean_code,
+                'disease_name': clean_name
+            })
+
+    return pd.DataFrame(cleaned_data)
+
+def benchmark_icd_cleaning(n_rows=150000, seed=42):
+    """
+    ICD-10-TR benzeri sentetik bir tabloda satır satır ve vektörel temizlemeyi karşılaştırır.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Geçerli kodlar, alt kodlar, bölüm başlıkları, boş hücreler ve bozuk girdiler karışımı
+    letters = rng.choice(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'), n_rows)
+    numbers = rng.integers(0, 100, n_rows)
+    subcodes = rng.integers(0, 10, n_rows)
+    kinds = rng.choice(['code', 'subcode', 'lower', 'header', 'empty'], n_rows, p=[0.35, 0.4, 0.1, 0.1, 0.05])
+
+    codes = []
+    names = []
+    for letter, number, subcode, kind in zip(letters, numbers, subcodes, kinds):
+        if kind == 'code':
+            codes.append(f"{letter}{number:02d}")
+        elif kind == 'subcode':
+            codes.append(f" {letter}{number:02d}.{subcode} ")
+        elif kind == 'lower':
+            codes.append(f"{letter.lower()}{number:02d}")
+        elif kind == 'header':
+            codes.append(f"BÖLÜM {number}")
+        else:
+            codes.append(None)
+        names.append(None if kind == 'empty' else f"  Hastalık   adı {letter}{number}\t{subcode}  ")
+
+    df = pd.DataFrame({'KOD': codes, 'TANI': names}, dtype=str)
+
+    start = time.perf_counter()
+    rowwise = clean_icd_table_rowwise(df, 'KOD', 'TANI')
+    rowwise_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = clean_icd_table(df, 'KOD', 'TANI')
+    vectorized_seconds = time.perf_counter() - start
+
+    identical = rowwise.reset_index(drop=True).equals(vectorized.reset_index(drop=True))
+
+    logging.info(f"{n_rows} satır: satır satır {rowwise_seconds:.2f} sn, vektörel {vectorized_seconds:.3f} sn "
+                 f"({rowwise_seconds / vectorized_seconds:.0f}x), çıktılar aynı: {identical}")
+
+    return {
+        'rows': n_rows,
+        'rowwise_seconds': rowwise_seconds,
+        'vectorized_seconds': vectorized_seconds,
+        'identical': identical
+    }
+
+# DSÖ ICD-10 bölümleri: (Romen rakamı, başlangıç, bitiş, başlık)
+ICD10_CHAPTERS = [
+    ('I', 'A00', 'B99', 'Bazı enfeksiyöz ve paraziter hastalıklar'),
+    ('II', 'C00', 'D48', 'Neoplazmlar'),
+    ('III', 'D50', 'D89', 'Kan ve kan yapıcı organ hastalıkları ve bağışıklık mekanizması bozuklukları'),
+    ('IV', 'E00', 'E90', 'Endokrin, beslenme ve metabolizma hastalıkları'),
+    ('V', 'F00', 'F99', 'Ruhsal ve davranışsal bozukluklar'),
+    ('VI', 'G00', 'G99', 'Sinir sistemi hastalıkları'),
+    ('VII', 'H00', 'H59', 'Göz ve adneks hastalıkları'),
+    ('VIII', 'H60', 'H95', 'Kulak ve mastoid çıkıntı hastalıkları'),
+    ('IX', 'I00', 'I99', 'Dolaşım sistemi hastalıkları'),
+    ('X', 'J00', 'J99', 'Solunum sistemi hastalıkları'),
+    ('XI', 'K00', 'K93', 'Sindirim sistemi hastalıkları'),
+    ('XII', 'L00', 'L99', 'Deri ve deri altı doku hastalıkları'),
+    ('XIII', 'M00', 'M99', 'Kas-iskelet sistemi ve bağ dokusu hastalıkları'),
+    ('XIV', 'N00', 'N99', 'Genitoüriner sistem hastalıkları'),
+    ('XV', 'O00', 'O99', 'Gebelik, doğum ve lohusalık'),
+    ('XVI', 'P00', 'P96', 'Perinatal dönemden kaynaklanan durumlar'),
+    ('XVII', 'Q00', 'Q99', 'Konjenital malformasyonlar, deformasyonlar ve kromozom anomalileri'),
+    ('XVIII', 'R00', 'R99', 'Başka yerde sınıflandırılmamış semptomlar, belirtiler ve anormal bulgular'),
+    ('XIX', 'S00', 'T98', 'Yaralanma, zehirlenme ve dış nedenlerin bazı diğer sonuçları'),
+    ('XXII', 'U00', 'U99', 'Özel amaçlı kodlar'),
+    ('XX', 'V01', 'Y98', 'Morbidite ve mortalitenin dış nedenleri'),
+    ('XXI', 'Z00', 'Z99', 'Sağlık durumunu ve sağlık hizmetleriyle ilişkiyi etkileyen faktörler'),
+]
+
+class ICD10Index:
+    """
+    Dizi tabanlı hiyerarşik ICD-10 indeksi (bölüm, blok, kategori, alt kategori).
+
+    Kodlar sıralı sabit genişlikli bir bayt dizisinde tutulur; önek ve aralık sorguları
+    ikili arama (O(log n)) ile yapılır. İndeks tek bir dosyaya yazılır ve np.memmap ile
+    kopyalanmadan açılabilir.
+    """
+
+    MAGIC = b'UMAIICD1'
+
+    LEVEL_CHAPTER = 0
+    LEVEL_BLOCK = 1
+    LEVEL_CATEGORY = 2
+    LEVEL_SUBCATEGORY = 3
+    LEVEL_NAMES = {0: 'chapter', 1: 'block', 2: 'category', 3: 'subcategory'}
+
+    BLOCK_PATTERN = re.compile(r'^([A-Z]\d{2})-([A-Z]\d{2})$')
+
+    def __init__(self, arrays):
+        self.codes = arrays['codes']
+        self.levels = arrays['levels']
+        self.parents = arrays['parents']
+        self.name_offsets = arrays['name_offsets']
+        self.names_blob = arrays['names_blob']
+        self.block_starts = arrays['block_starts']
+        self.block_ends = arrays['block_ends']
+        self.block_name_offsets = arrays['block_name_offsets']
+        self.block_names_blob = arrays['block_names_blob']
+
+        # Bölüm tablosu küçük ve sabit olduğu için dosyada tutulmaz
+        self._chapter_starts = [start for _, start, _, _ in ICD10_CHAPTERS]
+
+    # ---- Kurulum ----
+
+    @staticmethod
+    def _pack_names(names):
+        """İsimleri tek bir UTF-8 blob'a ve ofset dizisine çevirir."""
+        encoded = [name.encode('utf-8') for name in names]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            offsets[1:] = np.cumsum([len(item) for item in encoded])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8) if encoded else np.zeros(0, dtype=np.uint8)
+        return offsets, blob
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """icd_code / disease_name sütunlu bir DataFrame'den indeks oluşturur."""
+        blocks = {}
+        entries = {}
+        for code, name in zip(df['icd_code'], df['disease_name']):
+            code = str(code).strip().upper()
+            match = cls.BLOCK_PATTERN.match(code)
+            if match:
+                blocks.setdefault((match.group(1), match.group(2)), str(name))
+            else:
+                entries.setdefault(code, str(name))
+
+        codes = sorted(entries, key=lambda code: code.encode('utf-8'))
+        encoded_codes = [code.encode('utf-8') for code in codes]
+        width = max((len(code) for code in encoded_codes), default=1)
+        code_array = np.array(encoded_codes, dtype=f'S{width}')
+
+        # Noktalı kodlar alt kategoridir ('E11.9'); 'G01*' gibi işaretli kodlar kategori sayılır
+        levels = np.array([cls.LEVEL_SUBCATEGORY if '.' in code else cls.LEVEL_CATEGORY for code in codes],
+                          dtype=np.int8)
+
+        # Alt kategorinin üst düğümü ilk üç karakterlik kategori kodudur
+        position = {code: index for index, code in enumerate(codes)}
+        parents = np.array([position.get(code[:3], -1) if '.' in code else -1 for code in codes],
+                           dtype=np.int32)
+
+        name_offsets, names_blob = cls._pack_names([entries[code] for code in codes])
+
+        # Bölüm aralıkları (A00-B99) bölüm tablosundan gelir; başka blokları kapsayan üst aralıklar
+        # da atlanır, çünkü block_of blokların iç içe olmadığını varsayar
+        chapter_ranges = {(start, end) for _, start, end, _ in ICD10_CHAPTERS}
+        block_keys = [key for key in sorted(blocks) if key not in chapter_ranges]
+        block_keys = [key for key in block_keys
+                      if not any(other != key and key[0] <= other[0] and other[1] <= key[1] for other in block_keys)]
+        block_name_offsets, block_names_blob = cls._pack_names([blocks[key] for key in block_keys])
+
+        return cls({
+            'codes': code_array,
+            'levels': levels,
+            'parents': parents,
+            'name_offsets': name_offsets,
+            'names_blob': names_blob,
+            'block_starts': np.array([start.encode('ascii') for start, _ in block_keys], dtype='S3'),
+            'block_ends': np.array([end.encode('ascii') for _, end in block_keys], dtype='S3'),
+            'block_name_offsets': block_name_offsets,
+            'block_names_blob': block_names_blob,
+        })
+
+    @classmethod
+    def from_csv(cls, csv_path=OUTPUT_CSV_FILENAME):
+        """Faz1,1 çıktısı olan CSV dosyasından indeks oluşturur."""
+        return cls.from_dataframe(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
+
+    # ---- Serileştirme ----
+
+    def _arrays(self):
+        return {
+            'codes': self.codes,
+            'levels': self.levels,
+            'parents': self.parents,
+            'name_offsets': self.name_offsets,
+            'names_blob': self.names_blob,
+            'block_starts': self.block_starts,
+            'block_ends': self.block_ends,
+            'block_name_offsets': self.block_name_offsets,
+            'block_names_blob': self.block_names_blob,
+        }
+
+    def save(self, path=OUTPUT_INDEX_FILENAME):
+        """
+        İndeksi tek dosyaya yazar: MAGIC + başlık uzunluğu + JSON başlık + 8 bayt hizalı diziler.
+        """
+        arrays = self._arrays()
+
+        # Dizi ofsetleri başlık uzunluğuna bağlı; başlık sabitlenene kadar hesapla
+        header_size = 0
+        while True:
+            offset = len(self.MAGIC) + 8 + header_size
+            offset += -offset % 8
+            layout = {}
+            for name, array in arrays.items():
+                layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+                offset += array.nbytes
+                offset += -offset % 8
+            header = json.dumps({'arrays': layout}).encode('utf-8')
+            if len(header) == header_size:
+                break
+            header_size = len(header)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for name, array in arrays.items():
+                f.write(b'\0' * (layout[name]['offset'] - f.tell()))
+                f.write(np.ascontiguousarray(array).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=OUTPUT_INDEX_FILENAME, mmap=True):
+        """İndeks dosyasını açar; mmap=True ise diziler dosyaya eşlenir, belleğe kopyalanmaz."""
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        else:
+            with open(path, 'rb') as f:
+                buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+        if bytes(buffer[:len(cls.MAGIC)]) != cls.MAGIC:
+            raise ValueError(f"Geçersiz ICD indeks dosyası: {path}")
+
+        start = len(cls.MAGIC)
+        header_size = int.from_bytes(bytes(buffer[start:start + 8]), 'little')
+        header = json.loads(bytes(buffer[start + 8:start + 8 + header_size]).decode('utf-8'))
+
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'])) if spec['shape'] else 1
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                         offset=spec['offset']).reshape(spec['shape'])
+        return cls(arrays)
+
+    # ---- Yardımcılar ----
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return self._position(code) is not None
+
+    @staticmethod
+    def normalize_code(code):
+        """'e119' / 'E11.9' / ' E11.9 ' gibi girdileri 'E11.9' biçimine getirir."""
+        code = str(code).strip().upper()
+        if len(code) > 3 and code[3].isalnum():
+            code = code[:3] + '.' + code[3:]
+        return code
+
+    def _position(self, code):
+        key = self.normalize_code(code).encode('utf-8')
+        index = int(np.searchsorted(self.codes, key, side='left'))
+        if index < len(self.codes) and self.codes[index] == key:
+            return index
+        return None
+
+    def _name(self, index):
+        start, end = self.name_offsets[index], self.name_offsets[index + 1]
+        return bytes(self.names_blob[start:end]).decode('utf-8')
+
+    def _node(self, index):
+        return {
+            'code': self.codes[index].decode('utf-8'),
+            'name': self._name(index),
+            'level': self.LEVEL_NAMES[int(self.levels[index])],
+        }
+
+    def _block_node(self, index):
+        start, end = self.block_name_offsets[index], self.block_name_offsets[index + 1]
+        return {
+            'code': f"{self.block_starts[index].decode('ascii')}-{self.block_ends[index].decode('ascii')}",
+            'name': bytes(self.block_names_blob[start:end]).decode('utf-8'),
+            'level': 'block',
+        }
+
+    @staticmethod
+    def _chapter_node(chapter):
+        roman, start, end, title = chapter
+        return {'code': f"{start}-{end}", 'name': f"{roman}. {title}", 'level': 'chapter'}
+
+    # ---- Sorgular ----
+
+    def lookup(self, code):
+        """Tek bir kodu (kategori, alt kategori, blok veya bölüm aralığı) döndürür."""
+        code = self.normalize_code(code)
+        match = self.BLOCK_PATTERN.match(code)
+        if match:
+            for chapter in ICD10_CHAPTERS:
+                if (chapter[1], chapter[2]) == match.groups():
+                    return self._chapter_node(chapter)
+            block = self._block_position(*match.groups())
+            return self._block_node(block) if block is not None else None
+        index = self._position(code)
+        return self._node(index) if index is not None else None
+
+    def prefix_slice(self, prefix):
+        """Önek ile başlayan kodların [başlangıç, bitiş) dizi aralığını döndürür."""
+        key = self.normalize_code(prefix).encode('utf-8')
+        lo = int(np.searchsorted(self.codes, key, side='left'))
+        hi = int(np.searchsorted(self.codes, key + b'\xff', side='left'))
+        return lo, hi
+
+    def prefix(self, prefix):
+        """Önek altındaki tüm kodlar (örn. 'E11' -> E11, E11.0, ... E11.9)."""
+        lo, hi = self.prefix_slice(prefix)
+        return [self._node(index) for index in range(lo, hi)]
+
+    def range_slice(self, spec):
+        """'A00-B99' gibi bir aralığın (uçlar dahil) [başlangıç, bitiş) dizi aralığını döndürür."""
+        start, _, end = str(spec).strip().upper().partition('-')
+        end = end or start
+        lo = int(np.searchsorted(self.codes, start.encode('utf-8'), side='left'))
+        hi = int(np.searchsorted(self.codes, end.encode('utf-8') + b'\xff', side='left'))
+        return lo, hi
+
+    def range(self, spec):
+        """Aralıktaki tüm kodlar (örn. 'A00-B99' -> I. bölümün tüm kodları)."""
+        lo, hi = self.range_slice(spec)
+        return [self._node(index) for index in range(lo, hi)]
+
+    def _block_position(self, start, end):
+        for index in range(*self._block_slice(start, end)):
+            if self.block_starts[index] == start.encode('ascii') and self.block_ends[index] == end.encode('ascii'):
+                return index
+        return None
+
+    def _block_slice(self, start, end):
+        """Başlangıcı [start, end] aralığında olan blokların dizi aralığı."""
+        lo = int(np.searchsorted(self.block_starts, start.encode('ascii'), side='left'))
+        hi = int(np.searchsorted(self.block_starts, end.encode('ascii'), side='right'))
+        return lo, hi
+
+    def chapter_of(self, code):
+        """Kodun ait olduğu bölümü döndürür."""
+        category = self.normalize_code(code)[:3]
+        index = bisect.bisect_right(self._chapter_starts, category) - 1
+        if index >= 0 and category <= ICD10_CHAPTERS[index][2]:
+            return self._chapter_node(ICD10_CHAPTERS[index])
+        return None
+
+    def block_of(self, code):
+        """Kategorinin ait olduğu bloğu döndürür (blok satırları CSV'de yoksa None)."""
+        category = self.normalize_code(code)[:3].encode('ascii', errors='ignore')
+        # Bloklar iç içe değil: kapsayan blok, başlangıcı kategoriden küçük/eşit olan son bloktur
+        index = int(np.searchsorted(self.block_starts, category, side='right')) - 1
+        if index >= 0 and category <= self.block_ends[index]:
+            return self._block_node(index)
+        return None
+
+    def parent(self, code):
+        """Bir üst düzeyi döndürür: alt kategori -> kategori -> blok -> bölüm."""
+        code = self.normalize_code(code)
+        match = self.BLOCK_PATTERN.match(code)
+        if match:
+            node = self.lookup(code)
+            if node is None or node['level'] == 'chapter':
+                return None
+            return self.chapter_of(match.group(1))
+
+        index = self._position(code)
+        if index is not None and self.parents[index] >= 0:
+            return self._node(int(self.parents[index]))
+        if '.' in code:
+            # Kategori satırı CSV'de yoksa alt kategori yine de bloğa/bölüme bağlanır
+            category = self.lookup(code[:3])
+            if category is not None:
+                return category
+        return self.block_of(code) or self.chapter_of(code)
+
+    def children(self, code):
+        """Bir alt düzeydeki düğümleri döndürür."""
+        node = self.lookup(code)
+        if node is None:
+            return []
+
+        if node['level'] == 'chapter':
+            start, end = node['code'].split('-')
+            lo, hi = self._block_slice(start, end)
+            if hi > lo:
+                return [self._block_node(index) for index in range(lo, hi)]
+            return [item for item in self.range(node['code']) if item['level'] == 'category']
+
+        if node['level'] == 'block':
+            return [item for item in self.range(node['code']) if item['level'] == 'category']
+
+        if node['level'] == 'category':
+            return [item for item in self.prefix(node['code']) if item['level'] == 'subcategory']
+
+        return []
+
+def check_icd_index_hierarchy():
+    """
+    Bölüm ve üst aralık satırları içeren küçük bir tabloyla indeksin üst/alt düğüm
+    sorgularını doğrular; beklenmeyen sonuçta AssertionError yükseltir.
+    """
+    df = pd.DataFrame({
+        'icd_code': ['A00-B99', 'A00-A09', 'A00', 'A00.0', 'A15-A19', 'A15', 'C00-C97', 'C00-C14', 'C00'],
+        'disease_name': ['Enfeksiyöz hastalıklar', 'Bağırsak enfeksiyonları', 'Kolera', 'Kolera, klasik',
+                         'Tüberküloz', 'Solunum tüberkülozu', 'Malign neoplazmlar', 'Dudak, ağız, farenks',
+                         'Dudak malign neoplazmı']
+    })
+    index = ICD10Index.from_dataframe(df)
+
+    def codes(nodes):
+        return [node['code'] for node in nodes]
+
+    assert index.parent('A00') == index.lookup('A00-A09'), index.parent('A00')
+    assert index.parent('A00-A09')['code'] == 'A00-B99'
+    assert index.lookup('A00-B99')['level'] == 'chapter'
+    assert codes(index.children('A00-B99')) == ['A00-A09', 'A15-A19'], index.children('A00-B99')
+    assert index.parent('C00')['code'] == 'C00-C14', index.parent('C00')
+    assert codes(index.children('C00-D48')) == ['C00-C14'], index.children('C00-D48')
+    assert index.lookup('C00-C97') is None
+    logging.info("ICD indeks hiyerarşisi doğrulandı")
+    return True
+
+def build_icd_index(csv_path=OUTPUT_CSV_FILENAME, index_path=OUTPUT_INDEX_FILENAME):
+    """CSV'den hiyerarşik indeksi oluşturur, kaydeder ve yükleme süresini raporlar."""
+    index = ICD10Index.from_csv(csv_path)
+    index.save(index_path)
+
+    start = time.perf_counter()
+    loaded = ICD10Index.load(index_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    logging.info(f"ICD indeksi '{index_path}' oluşturuldu: {len(loaded)} kod, "
+                 f"{len(loaded.block_starts)} blok, {os.path.getsize(index_path) / 1024:.0f} KB, "
+                 f"yükleme {load_ms:.1f} ms")
+    return loaded
+
 def process_all_icd10_codes_colab():
     """
     Colab'da yüklenen bir ICD-10 Excel dosyasını okur,
@@ -67,51 +706,40 @@ def process_all_icd10_codes_colab():
         file_content = uploaded[file_name]
         logging.info(f"'{file_name}' dosyası yüklendi, işleniyor...")
 
-        # 2. Adım: Dosyayı okuma (farklı başlık satırlarını deneyerek)
-        df = None
-        for header_row in [0, 1, 2]:
-            try:
-                df = pd.read_excel(io.BytesIO(file_content), dtype=str, header=header_row)
-                df.columns = [str(col).strip() for col in df.columns]
-                valid_columns = [col for col in df.columns if not str(col).startswith('Unnamed')]
-                if len(valid_columns) >= 2:
-                    logging.info(f"Başlıklar {header_row}. satırda bulundu.")
-                    break
-            except Exception as e:
-                logging.warning(f"Header={header_row} ile okuma başarısız: {e}")
-                continue
-
-        if df is None or len(df.columns) < 2:
-            logging.error("Excel dosyası okunamadı veya yeterli sütun bulunamadı.")
-            return
+        # 2-4. Adım: Dosyayı okuma ve temizleme
+        streaming = (file_name.lower().endswith('.xlsx') and load_workbook is not None
+                     and len(file_content) > STREAMING_THRESHOLD_BYTES)
 
-        logging.info(f"Dosyadaki sütunlar: {list(df.columns)}")
-
-        # Kod ve açıklama için kullanılacak sütunları otomatik tespit et
-        valid_columns = [col for col in df.columns if not str(col).startswith('Unnamed')]
-        code_column = valid_columns[0]
-        desc_column = valid_columns[1]
-        logging.info(f"Kod sütunu: '{code_column}', Açıklama sütunu: '{desc_column}'")
-        logging.info(f"Toplam {len(df)} satır okundu.")
-
-        # 3. Adım: Veri temizleme
-        df[code_column] = df[code_column].fillna('')
-        df[desc_column] = df[desc_column].fillna('')
-
-        cleaned_data = []
-        for index, row in df.iterrows():
-            clean_code = clean_icd_code(row[code_column])
-            clean_name = clean_disease_name(row[desc_column])
-
-            # Sadece geçerli kod ve isimleri listeye ekle
-            if clean_code and clean_name:
-                cleaned_data.append({
-                    'icd_code': clean_code,
-                    'disease_name': clean_name
-                })
-
-        # 4. Adım: Temizlenmiş veriyi DataFrame'e çevir
-        final_df = pd.DataFrame(cleaned_data)
+        if streaming:
+            # Büyük dosya: read-only modda parça parça oku ve temizle
+            logging.info("Büyük dosya algılandı, akışlı okuma kullanılıyor...")
+            try:
+                final_df, total_rows, columns = clean_icd_workbook_streaming(file_content)
+            except ValueError as e:
+                logging.error(f"Excel dosyası okunamadı: {e}")
+                return
+            logging.info(f"Dosyadaki sütunlar: {columns}")
+            logging.info(f"Toplam {total_rows} satır okundu.")
+        else:
+            # Çalışma kitabı tek seferde okunur, başlık satırı ilk satırlardan çıkarılır
+            df, header_row = read_icd_workbook(file_content)
+
+            if df is None or len(df.columns) < 2:
+                logging.error("Excel dosyası okunamadı veya yeterli sütun bulunamadı.")
+                return
+
+            logging.info(f"Başlıklar {header_row}. satırda bulundu.")
+            logging.info(f"Dosyadaki sütunlar: {list(df.columns)}")
+
+            # Kod ve açıklama için kullanılacak sütunları otomatik tespit et
+            valid_columns = [col for col in df.columns if not str(col).startswith('Unnamed')]
+            code_column = valid_columns[0]
+            desc_column = valid_columns[1]
+            logging.info(f"Kod sütunu: '{code_column}', Açıklama sütunu: '{desc_column}'")
+            logging.info(f"Toplam {len(df)} satır okundu.")
+
+            # Veriyi vektörel olarak temizle ve DataFrame'e çevir
+            final_df = clean_icd_table(df, code_column, desc_column)
 
         if final_df.empty:
             logging.warning("Temizleme sonrası geçerli veri kalmadı.")
@@ -140,8 +768,12 @@ def process_all_icd10_codes_colab():
         logging.info(f"İlk 5 satır:\n{final_df.head()}")
         logging.info(f"Son 5 satır:\n{final_df.tail()}")
 
-        # Dosyayı indir
+        # 7. Adım: Hiyerarşik indeksi oluştur
+        build_icd_index(OUTPUT_CSV_FILENAME, OUTPUT_INDEX_FILENAME)
+
+        # Dosyaları indir
         files.download(OUTPUT_CSV_FILENAME)
+        files.download(OUTPUT_INDEX_FILENAME)
         logging.info("Dosya indirme işlemi başlatıldı.")
 
     except Exception as e:
@@ -6,10 +6,26 @@ import time
 import json
 import random
 import zipfile
+import gzip
+import queue
+import threading
+import itertools
+import asyncio
+import hashlib
+import sqlite3
+import zlib
+import socket
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from urllib.parse import urlsplit, urljoin
+from html.parser import HTMLParser
+from email.utils import parsedate_to_datetime
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, Future
+from functools import partial
 from typing import Dict, List, Optional, Tuple
 import logging
 from tqdm import tqdm
@@ -23,6 +39,18 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
+# Asenkron HTTP motoru için isteğe bağlı bağımlılık
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Tarayıcısız sayfa okumada hızlı HTML ayrıştırıcı için isteğe bağlı bağımlılık
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
 # Google Colab specific imports
 from google.colab import files
 import shutil
@@ -34,10 +62,1845 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class ChromeDriverPool:
+    """Headless Chrome sürücülerini kodlar arasında yeniden kullanan sınırlı, thread-safe havuz"""
+
+    def __init__(self, driver_factory, user_agents: List[str], max_size: int = 2,
+                 max_pages_per_driver: int = 50):
+        self.driver_factory = driver_factory
+        self.max_size = max_size
+        self.max_pages_per_driver = max_pages_per_driver
+
+        # Geri dönüşümde sıradaki User-Agent kullanılır
+        self._user_agents = itertools.cycle(user_agents)
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._page_counts = {}
+        self._closed = False
+
+        self.stats = {
+            "created": 0,
+            "recycled": 0,
+            "acquisitions": 0,
+            "wait_seconds": 0.0
+        }
+
+    def _new_driver(self) -> webdriver.Chrome:
+        """Sıradaki User-Agent ile yeni bir sürücü başlatır"""
+        with self._lock:
+            user_agent = next(self._user_agents)
+        driver = self.driver_factory(user_agent)
+        with self._lock:
+            self._page_counts[id(driver)] = 0
+            self.stats["created"] += 1
+        return driver
+
+    def _is_healthy(self, driver) -> bool:
+        """Sürücünün hâlâ yanıt verip vermediğini kontrol eder"""
+        try:
+            driver.current_url
+            return len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        """Sürücüyü kapatır ve havuzdan düşer"""
+        with self._lock:
+            self._page_counts.pop(id(driver), None)
+            self.stats["recycled"] += 1
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Sürücü kapatma hatası: {e}")
+
+    def acquire(self) -> webdriver.Chrome:
+        """Havuzdan sağlıklı bir sürücü ödünç alır, gerekirse yenisini oluşturur"""
+        start = time.monotonic()
+        self._slots.acquire()
+        with self._lock:
+            self.stats["wait_seconds"] += time.monotonic() - start
+            self.stats["acquisitions"] += 1
+
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._new_driver()
+
+                if self._is_healthy(driver):
+                    return driver
+
+                logger.warning("Yanıt vermeyen sürücü geri dönüştürülüyor")
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, broken: bool = False):
+        """Sürücüyü havuza iade eder; çökmüş veya N sayfayı aşmışsa geri dönüştürür"""
+        try:
+            with self._lock:
+                pages = self._page_counts.get(id(driver), 0) + 1
+                self._page_counts[id(driver)] = pages
+
+            if broken or self._closed or pages >= self.max_pages_per_driver:
+                self._discard(driver)
+                return
+
+            # Açık kalan ek sekmeleri kapat
+            try:
+                handles = driver.window_handles
+                for handle in handles[1:]:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                driver.switch_to.window(handles[0])
+            except Exception:
+                self._discard(driver)
+                return
+
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def driver(self):
+        """`with pool.driver() as driver:` kullanımı için ödünç alma bağlamı"""
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except WebDriverException as e:
+            # Zaman aşımı sürücünün bozulduğu anlamına gelmez
+            broken = not isinstance(e, TimeoutException)
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    def close(self):
+        """Havuzdaki tüm boşta sürücüleri kapatır"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._page_counts.pop(id(driver), None)
+
+
+class CheckpointArchive:
+    """Ara kayıtlarda ZIP arşivine yalnızca son kayıttan beri eklenen JSON dosyalarını ekler"""
+
+    ARCHIVE_PREFIX = "collected_data/content/collected_json"
+
+    def __init__(self, source_dir: str, zip_filename: str = "collected_data.zip",
+                 archive_prefix: str = ARCHIVE_PREFIX, compression: int = zipfile.ZIP_DEFLATED):
+        self.source_dir = source_dir
+        self.zip_filename = zip_filename
+        self.archive_prefix = archive_prefix
+        self.compression = compression
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._archived = set()
+        self._stale = set()
+
+        # Önceki çalışmadan kalan arşivin üyelerini hatırla
+        if os.path.exists(zip_filename):
+            try:
+                with zipfile.ZipFile(zip_filename, 'r') as zipf:
+                    self._archived = set(zipf.namelist())
+            except zipfile.BadZipFile:
+                logger.warning(f"Bozuk arşiv yeniden oluşturulacak: {zip_filename}")
+                os.remove(zip_filename)
+
+    def contains(self, filename: str) -> bool:
+        """Dosyanın arşivde olup olmadığını döndürür"""
+        with self._lock:
+            return self.arcname(filename) in self._archived
+
+    def arcname(self, filename: str) -> str:
+        """Dosyanın arşiv içindeki yolunu döndürür"""
+        return f"{self.archive_prefix}/{filename}"
+
+    def add(self, filename: str):
+        """Bir sonraki ara kayıtta arşive eklenecek dosyayı işaretler"""
+        with self._lock:
+            self._pending[filename] = None
+
+    def checkpoint(self) -> Optional[str]:
+        """Bekleyen dosyaları mevcut arşive ekler (mevcut üyeler yeniden sıkıştırılmaz)"""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+
+            if not batch:
+                return self.zip_filename if os.path.exists(self.zip_filename) else None
+
+            try:
+                mode = 'a' if os.path.exists(self.zip_filename) else 'w'
+                with zipfile.ZipFile(self.zip_filename, mode, self.compression) as zipf:
+                    for filename in batch:
+                        arcname = self.arcname(filename)
+
+                        # ZIP üyeleri yerinde güncellenemez, yeniden yazılanlar sonda toparlanır
+                        if arcname in self._archived:
+                            self._stale.add(arcname)
+                            continue
+
+                        zipf.write(os.path.join(self.source_dir, filename), arcname)
+                        self._archived.add(arcname)
+
+                logger.info(f"ZIP arşivine {len(batch)} yeni dosya eklendi: {self.zip_filename}")
+                return self.zip_filename
+
+            except Exception as e:
+                # Eklenemeyen dosyalar bir sonraki ara kayıtta tekrar denenir
+                for filename in batch:
+                    self._pending[filename] = None
+                logger.error(f"ZIP ara kayıt hatası: {e}")
+                return None
+
+    def finalize(self) -> Optional[str]:
+        """Son ara kaydı alır; güncellenen dosya varsa arşivi bir kez yeniden yazar"""
+        zip_filename = self.checkpoint()
+
+        with self._lock:
+            if not self._stale:
+                return zip_filename or (self.zip_filename if os.path.exists(self.zip_filename) else None)
+
+            try:
+                temp_filename = self.zip_filename + ".tmp"
+                with zipfile.ZipFile(self.zip_filename, 'r') as old_zipf, \
+                        zipfile.ZipFile(temp_filename, 'w', self.compression) as zipf:
+                    for arcname in sorted(self._archived):
+                        # Güncellenen üyeler kaynak dosyadan yeniden yazılır; diğerleri (başka
+                        # arşivleyicinin üyeleri, diskten silinmiş dosyalar) eski arşivden kopyalanır
+                        src = os.path.join(self.source_dir, arcname.rsplit("/", 1)[-1])
+                        if (arcname.startswith(self.archive_prefix + "/") and arcname in self._stale
+                                and os.path.exists(src)):
+                            zipf.write(src, arcname)
+                        else:
+                            info = old_zipf.getinfo(arcname)
+                            zipf.writestr(info, old_zipf.read(info))
+                os.replace(temp_filename, self.zip_filename)
+                self._stale.clear()
+
+                logger.info(f"ZIP arşivi güncellenen dosyalarla yeniden yazıldı: {self.zip_filename}")
+                return self.zip_filename
+
+            except Exception as e:
+                logger.error(f"ZIP yeniden yazma hatası: {e}")
+                return None
+
+
+class MetricsRegistry:
+    """
+    Sayaçlar ve gecikme histogramları için thread-safe metrik kaydı.
+    Anlık görüntü JSON veya Prometheus metin biçiminde dışa aktarılabilir.
+    """
+
+    # Gecikme histogramı kova sınırları (saniye)
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+    def __init__(self, namespace: str = "umai_scraper"):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._exporter = None
+        self._stop_export = threading.Event()
+
+    @staticmethod
+    def _key(name: str, labels: Dict) -> Tuple:
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Sayacı artırır"""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Histograma bir gecikme ölçümü ekler"""
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = {"buckets": [0] * (len(self.LATENCY_BUCKETS) + 1), "count": 0, "sum": 0.0, "max": 0.0}
+                self._histograms[key] = hist
+
+            index = len(self.LATENCY_BUCKETS)
+            for i, bound in enumerate(self.LATENCY_BUCKETS):
+                if seconds <= bound:
+                    index = i
+                    break
+
+            hist["buckets"][index] += 1
+            hist["count"] += 1
+            hist["sum"] += seconds
+            hist["max"] = max(hist["max"], seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """`with metrics.timer(...)` bloğunun süresini histograma yazar"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def _quantile(self, hist: Dict, q: float) -> float:
+        """Kova sayılarından doğrusal ara değerleme ile yüzdelik tahmini yapar"""
+        if hist["count"] == 0:
+            return 0.0
+
+        rank = q * hist["count"]
+        cumulative = 0
+        lower = 0.0
+        for i, count in enumerate(hist["buckets"]):
+            upper = self.LATENCY_BUCKETS[i] if i < len(self.LATENCY_BUCKETS) else hist["max"]
+            if count and cumulative + count >= rank:
+                value = lower + (upper - lower) * (rank - cumulative) / count
+                return min(value, hist["max"])
+            cumulative += count
+            lower = upper
+        return hist["max"]
+
+    def snapshot(self) -> Dict:
+        """Tüm metriklerin JSON'a uygun anlık görüntüsünü döndürür"""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = []
+            for (name, labels), hist in sorted(self._histograms.items()):
+                histograms.append({
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": hist["count"],
+                    "sum": round(hist["sum"], 6),
+                    "p50": round(self._quantile(hist, 0.50), 6),
+                    "p95": round(self._quantile(hist, 0.95), 6),
+                    "p99": round(self._quantile(hist, 0.99), 6),
+                    "max": round(hist["max"], 6)
+                })
+
+        return {
+            "timestamp_utc": datetime.utcnow().isoformat() + "Z",
+            "counters": counters,
+            "histograms": histograms
+        }
+
+    def histogram_summary(self, name: str, **labels) -> Optional[Dict]:
+        """Tek bir histogramın sayı ve yüzdeliklerini döndürür"""
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                return None
+            return {
+                "count": hist["count"],
+                "p50": self._quantile(hist, 0.50),
+                "p95": self._quantile(hist, 0.95),
+                "p99": self._quantile(hist, 0.99)
+            }
+
+    def to_json(self) -> str:
+        """Anlık görüntüyü JSON metni olarak döndürür"""
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _format_labels(labels: Dict) -> str:
+        if not labels:
+            return ""
+        parts = []
+        for key, value in labels.items():
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            parts.append(f'{key}="{value}"')
+        return "{" + ",".join(parts) + "}"
+
+    def to_prometheus(self) -> str:
+        """Metrikleri Prometheus metin biçiminde döndürür"""
+        lines = []
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = f"{self.namespace}_{name}"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                lines.append(f"{metric}{self._format_labels(dict(labels))} {value}")
+
+            for (name, labels), hist in sorted(self._histograms.items()):
+                metric = f"{self.namespace}_{name}"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} histogram")
+                    seen.add(metric)
+
+                cumulative = 0
+                for i, count in enumerate(hist["buckets"]):
+                    cumulative += count
+                    le = str(self.LATENCY_BUCKETS[i]) if i < len(self.LATENCY_BUCKETS) else "+Inf"
+                    bucket_labels = dict(labels, le=le)
+                    lines.append(f"{metric}_bucket{self._format_labels(bucket_labels)} {cumulative}")
+                lines.append(f"{metric}_sum{self._format_labels(dict(labels))} {hist['sum']}")
+                lines.append(f"{metric}_count{self._format_labels(dict(labels))} {hist['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        """Metrikleri dosyalara atomik olarak yazar"""
+        for path, content in ((json_path, self.to_json), (prometheus_path, self.to_prometheus)):
+            if not path:
+                continue
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(content())
+            os.replace(temp_path, path)
+
+    def start_exporter(self, interval: float, json_path: Optional[str] = None,
+                       prometheus_path: Optional[str] = None):
+        """Metrikleri arka planda belirli aralıklarla dosyaya yazmaya başlar"""
+        if self._exporter is not None:
+            return
+
+        def run():
+            while not self._stop_export.wait(interval):
+                try:
+                    self.export(json_path, prometheus_path)
+                except Exception as e:
+                    logger.warning(f"Metrik dışa aktarma hatası: {e}")
+
+        self._stop_export.clear()
+        self._exporter = threading.Thread(target=run, name="MetricsExporter", daemon=True)
+        self._exporter.start()
+
+    def stop_exporter(self, json_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        """Arka plan yazıcısını durdurur ve son durumu bir kez daha yazar"""
+        if self._exporter is not None:
+            self._stop_export.set()
+            self._exporter.join()
+            self._exporter = None
+        self.export(json_path, prometheus_path)
+
+
+class HostRateLimiter:
+    """
+    Host başına token bucket hız sınırlayıcı. Sağlıklı yanıtlarda hızı toplamsal olarak
+    artırır, 429/503/CAPTCHA sinyallerinde çarpımsal olarak düşürür (AIMD) ve
+    Retry-After süresi boyunca host'a istek göndermez. Aynı pencerede (1/hız veya RTT)
+    gelen eşzamanlı engellenme yanıtları hızı yalnızca bir kez düşürür; bağlantı
+    hataları hız sinyali sayılmaz.
+    """
+
+    # Host başına (başlangıç hızı, üst sınır) istek/sn
+    DEFAULT_HOST_RATES = {
+        "pubmed.ncbi.nlm.nih.gov": (0.5, 2.0),
+        "eutils.ncbi.nlm.nih.gov": (1.0, 3.0),
+        "scholar.google.com": (0.2, 0.5),
+        "api.semanticscholar.org": (1.0, 5.0),
+        "export.arxiv.org": (0.5, 1.0)
+    }
+
+    THROTTLE_STATUSES = {429, 503}
+
+    def __init__(self, default_rate: float = 1.0, default_max_rate: float = 10.0,
+                 min_rate: float = 0.02, increase: float = 0.05, decrease_factor: float = 0.5,
+                 burst: float = 1.0):
+        self.default_rate = default_rate
+        self.default_max_rate = default_max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self.stats = {}
+
+        for host, (rate, max_rate) in self.DEFAULT_HOST_RATES.items():
+            self.set_host_rate(host, rate, max_rate)
+
+    def set_host_rate(self, host: str, rate: float, max_rate: Optional[float] = None):
+        """Host'un başlangıç hızını ve üst sınırını ayarlar"""
+        with self._lock:
+            self._hosts[host] = {
+                "rate": rate,
+                "max_rate": max_rate if max_rate is not None else max(rate, self.default_max_rate),
+                "tokens": self.burst,
+                "updated": time.monotonic(),
+                "blocked_until": 0.0,
+                "last_decrease": float("-inf"),
+                "rtt": 0.0
+            }
+            self.stats[host] = {"rate_per_sec": round(rate, 3), "requests": 0, "throttled": 0, "errors": 0}
+
+    def _state(self, host: str) -> Dict:
+        """Host durumunu döndürür, yoksa varsayılanlarla oluşturur (kilit altında çağrılır)"""
+        if host not in self._hosts:
+            self._hosts[host] = {
+                "rate": self.default_rate,
+                "max_rate": self.default_max_rate,
+                "tokens": self.burst,
+                "updated": time.monotonic(),
+                "blocked_until": 0.0,
+                "last_decrease": float("-inf"),
+                "rtt": 0.0
+            }
+            self.stats[host] = {"rate_per_sec": round(self.default_rate, 3), "requests": 0, "throttled": 0, "errors": 0}
+        return self._hosts[host]
+
+    def reserve(self, host: str) -> float:
+        """Host için bir istek hakkı ayırır ve isteğe kadar beklenmesi gereken süreyi döndürür"""
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            self._refill(state, now)
+
+            # Token eksiye düşebilir; bu sıradaki isteklerin bekleme kuyruğu demektir
+            state["tokens"] -= 1
+            wait = -state["tokens"] / state["rate"] if state["tokens"] < 0 else 0.0
+            self.stats[host]["requests"] += 1
+
+            return max(wait, state["blocked_until"] - now)
+
+    def _refill(self, state: Dict, now: float):
+        """Geçen süre kadar token ekler, burst ile sınırlar (kilit altında çağrılır)"""
+        state["tokens"] = min(self.burst, state["tokens"] + (now - state["updated"]) * state["rate"])
+        state["updated"] = now
+
+    def acquire(self, host: str):
+        """İstek hakkı gelene kadar iş parçacığını bekletir"""
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, host: str):
+        """İstek hakkı gelene kadar olay döngüsünü bloklamadan bekler"""
+        wait = self.reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After başlığını (saniye veya HTTP tarihi) saniyeye çevirir"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def feedback(self, host: str, status: Optional[int] = None, retry_after: Optional[float] = None,
+                 challenge: bool = False, error: bool = False, rtt: Optional[float] = None):
+        """
+        Yanıt sonucuna göre host hızını AIMD ile günceller.
+        error: bağlantı/aktarım hatası; sayılır ama hızı değiştirmez.
+        rtt: isteğin süresi (sn); düşürme penceresini belirlemek için izlenir.
+        """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            if rtt is not None:
+                state["rtt"] = rtt if state["rtt"] == 0.0 else 0.8 * state["rtt"] + 0.2 * rtt
+
+            if challenge or status in self.THROTTLE_STATUSES:
+                self._refill(state, now)
+                # Eski hızla gönderilmiş isteklerin yanıtları bir pencere boyunca gelir;
+                # pencere içindeki ek engellenme yanıtları hızı tekrar düşürmez
+                window = max(1.0 / state["rate"], state["rtt"])
+                if now - state["last_decrease"] >= window:
+                    state["rate"] = max(self.min_rate, state["rate"] * self.decrease_factor)
+                    state["last_decrease"] = now
+                # Biriken token'ları iptal et, sonraki istekler yeni hızla sıralanır
+                state["tokens"] = min(state["tokens"], 0.0)
+                if retry_after:
+                    state["blocked_until"] = max(state["blocked_until"], now + retry_after)
+                    # Blokaj bitince kuyruk aynı anda değil 1/hız aralıklarla boşalsın diye
+                    # token borcu blokaj sonuna kadar uzatılır
+                    state["tokens"] = min(state["tokens"], 1.0 - (state["blocked_until"] - now) * state["rate"])
+                self.stats[host]["throttled"] += 1
+            elif error:
+                self.stats[host]["errors"] += 1
+            elif status is not None and status < 500:
+                # Toplamsal artış host'un üst sınırıyla orantılıdır; farklı tavanlı hostlar
+                # düşüşten aynı sayıda sağlıklı yanıtla toparlanır
+                state["rate"] = min(state["max_rate"], state["rate"] + self.increase * state["max_rate"])
+
+            self.stats[host]["rate_per_sec"] = round(state["rate"], 3)
+
+
+class AsyncHTTPEngine:
+    """API tabanlı kaynaklar için tek olay döngüsünde çalışan, bağlantı havuzlu asenkron HTTP motoru"""
+
+    # Yeniden denenecek HTTP durum kodları
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, per_host_limit: int = 4, total_limit: int = 32, timeout: float = 30,
+                 max_retries: int = 3, backoff_base: float = 2.0,
+                 rate_limiter: Optional[HostRateLimiter] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        if aiohttp is None:
+            raise ImportError("AsyncHTTPEngine için aiohttp gerekli: pip install aiohttp")
+
+        self.per_host_limit = per_host_limit
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._host_semaphores = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Olay döngüsünü arka plan iş parçacığında başlatır"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="AsyncHTTPEngine", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def submit(self, coro) -> Future:
+        """Coroutine'i motorun olay döngüsünde çalıştırır, concurrent Future döndürür"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _get_session(self):
+        """Keep-alive bağlantı havuzlu oturumu döndürür (olay döngüsü içinde çağrılır)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.total_limit,
+                limit_per_host=self.per_host_limit,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Host başına eşzamanlı istek sınırını döndürür"""
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def get(self, url: str, params: Optional[Dict] = None,
+                  headers: Optional[Dict] = None) -> Tuple[Optional[int], bytes]:
+        """
+        GET isteği yapar ve (durum kodu, gövde) döndürür. İstekler host hız sınırlayıcısından
+        geçer; 429/5xx ve bağlantı hatalarında iş parçacığını bloklamadan yeniden dener.
+        """
+        session = self._get_session()
+        host = urlsplit(url).netloc
+        semaphore = self._host_semaphore(host)
+        status, body, error = None, b"", None
+
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                wait_start = time.perf_counter()
+                await self.rate_limiter.acquire_async(host)
+                if self.metrics is not None:
+                    self.metrics.observe("stage_latency_seconds", time.perf_counter() - wait_start,
+                                         stage="rate_limit_wait")
+
+            retry_after = None
+            async with semaphore:
+                request_start = time.perf_counter()
+                try:
+                    async with session.get(url, params=params, headers=headers) as response:
+                        status = response.status
+                        body = await response.read()
+                        retry_after = HostRateLimiter.parse_retry_after(response.headers.get("Retry-After"))
+                        error = None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    status, body, error = None, b"", e
+
+            if self.metrics is not None:
+                self.metrics.observe("stage_latency_seconds", time.perf_counter() - request_start,
+                                     stage="http_request")
+                self.metrics.inc("http_requests_total", host=host, status=status or "error")
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.feedback(host, status, retry_after=retry_after, error=error is not None,
+                                           rtt=time.perf_counter() - request_start)
+
+            if status is not None and status not in self.RETRY_STATUSES:
+                return status, body
+
+            # Hız sınırlayıcı yoksa üstel geri çekilme uygulanır
+            if attempt < self.max_retries and self.rate_limiter is None:
+                await asyncio.sleep(self.backoff_base * (2 ** attempt) + random.uniform(0, 1))
+
+        if error is not None:
+            raise error
+        return status, body
+
+    def close(self):
+        """Oturumu ve olay döngüsünü kapatır (sonraki submit çağrısında yeniden açılır)"""
+        with self._lock:
+            loop, thread, session = self._loop, self._thread, self._session
+            self._loop, self._thread, self._session = None, None, None
+            self._host_semaphores = {}
+
+        if loop is None:
+            return
+
+        if session is not None:
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+class SourceScheduler:
+    """Birden çok ICD kodunu aynı anda işleyen, her kaynağa ayrı iş parçacığı bütçesi veren zamanlayıcı"""
+
+    def __init__(self, sources: Dict, source_workers: Dict[str, int], max_codes_in_flight: int = 16,
+                 async_runner=None):
+        self.sources = sources
+        self.source_workers = source_workers
+        self.max_codes_in_flight = max_codes_in_flight
+
+        # Coroutine kaynakları iş parçacığı yerine bu çalıştırıcıya verilir
+        self.async_runner = async_runner
+
+        self._executors = {}
+        # Kod tamamlama işleyicileri (JSON/günlük fsync, ZIP ara kaydı, SQLite yazımları) tek bir
+        # iş parçacığında sırayla çalışır; böylece asyncio döngüsü yalnızca Future'ları çözer
+        self._completion_executor = None
+        self._in_flight = threading.BoundedSemaphore(max_codes_in_flight)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+
+    def _executor(self, source: str) -> ThreadPoolExecutor:
+        """Kaynağın uzun ömürlü iş parçacığı havuzunu döndürür"""
+        with self._lock:
+            if source not in self._executors:
+                self._executors[source] = ThreadPoolExecutor(
+                    max_workers=self.source_workers.get(source, 1),
+                    thread_name_prefix=source.replace(" ", "")
+                )
+            return self._executors[source]
+
+    def _completion(self) -> ThreadPoolExecutor:
+        """Kod tamamlama işleyicilerini çalıştıran tek iş parçacıklı havuzu döndürür"""
+        with self._lock:
+            if self._completion_executor is None:
+                self._completion_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="CodeDone")
+            return self._completion_executor
+
+    def submit(self, icd_code: str, disease_name: str) -> Future:
+        """
+        Kodu tüm kaynakların kuyruğuna ekler. Dönen Future, tüm kaynaklar bittiğinde
+        {kaynak: makaleler} sözlüğü ile tamamlanır. Uçuştaki kod sınırı doluysa bekler.
+        """
+        self._in_flight.acquire()
+        with self._lock:
+            self._outstanding += 1
+
+        code_future = Future()
+        results = {}
+        lock = threading.Lock()
+
+        def on_source_done(source, future):
+            try:
+                articles = future.result()
+            except Exception as e:
+                logger.error(f"{source} scraping hatası: {e}")
+                articles = []
+
+            with lock:
+                results[source] = articles
+                done = len(results) == len(self.sources)
+
+            if done:
+                # Son kaynak asyncio döngüsünde bitmiş olabilir; set_result'a bağlı kayıt işleyicileri
+                # döngüyü bekletmesin diye tamamlama iş parçacığına devredilir
+                self._completion().submit(finish)
+
+        def finish():
+            try:
+                # Sonuçlar kaynak sırasıyla birleştirilir
+                code_future.set_result({name: results[name] for name in self.sources})
+            finally:
+                self._in_flight.release()
+                with self._idle:
+                    self._outstanding -= 1
+                    self._idle.notify_all()
+
+        for source, scrape in self.sources.items():
+            if asyncio.iscoroutinefunction(scrape) and self.async_runner is not None:
+                future = self.async_runner(scrape(icd_code, disease_name))
+            else:
+                future = self._executor(source).submit(scrape, icd_code, disease_name)
+            future.add_done_callback(partial(on_source_done, source))
+
+        return code_future
+
+    def join(self):
+        """Kuyruktaki tüm kodlar tamamlanana kadar bekler"""
+        with self._idle:
+            while self._outstanding > 0:
+                self._idle.wait()
+
+    def shutdown(self):
+        """Kaynak havuzlarını kapatır (sonraki submit çağrısında yeniden açılırlar)"""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors = {}
+            completion, self._completion_executor = self._completion_executor, None
+        for executor in executors:
+            executor.shutdown(wait=True)
+        # Kaynaklar bittikten sonra kuyruktaki tamamlama işleyicileri de boşaltılır
+        if completion is not None:
+            completion.shutdown(wait=True)
+
+
+class ShardedJSONLWriter:
+    """
+    Kod başına bir kaydı dönen sıkıştırılmış JSONL parçalarına (shard) ekler.
+    Her kayıt ayrı bir gzip üyesi olarak yazılır; böylece parça dosyası `gzip.open`
+    ile akış halinde okunabilir, indeks dosyasındaki (parça, ofset, uzunluk) ile de
+    tek bir kayda tarama yapmadan ulaşılabilir.
+    """
+
+    INDEX_FILENAME = "index.jsonl"
+
+    def __init__(self, output_dir: str = "collected_jsonl", max_records_per_shard: int = 1000,
+                 max_bytes_per_shard: int = 64 * 1024 * 1024, on_rotate=None):
+        self.output_dir = output_dir
+        self.max_records_per_shard = max_records_per_shard
+        self.max_bytes_per_shard = max_bytes_per_shard
+        self.on_rotate = on_rotate
+
+        self._lock = threading.Lock()
+        self._index = {}
+        self._file = None
+        self._records = 0
+
+        os.makedirs(output_dir, exist_ok=True)
+        self._load_index()
+        self._recover_partial_shards()
+
+        shard_numbers = [int(name[6:11]) for name in self.shard_files()]
+        self._shard_no = max(shard_numbers) + 1 if shard_numbers else 0
+        self._index_file = open(os.path.join(output_dir, self.INDEX_FILENAME), "a", encoding="utf-8")
+
+    @staticmethod
+    def shard_name(shard_no: int) -> str:
+        return f"shard-{shard_no:05d}.jsonl.gz"
+
+    def shard_files(self) -> List[str]:
+        """Tamamlanmış (döndürülmüş) parça dosyalarını sıralı döndürür"""
+        return sorted(
+            name for name in os.listdir(self.output_dir)
+            if name.startswith("shard-") and name.endswith(".jsonl.gz")
+        )
+
+    def _load_index(self):
+        """İndeksi okur; yarım kalan son satır atlanır, sonraki kayıt aynı kodu ezer"""
+        index_path = os.path.join(self.output_dir, self.INDEX_FILENAME)
+        if not os.path.exists(index_path):
+            return
+
+        valid_size = 0
+        with open(index_path, "rb") as f:
+            for raw in f:
+                try:
+                    if not raw.endswith(b"\n"):
+                        raise ValueError("yarım satır")
+                    entry = json.loads(raw)
+                    self._index[entry["icd_code"]] = (entry["shard"], entry["offset"], entry["length"])
+                except (ValueError, KeyError):
+                    break
+                valid_size += len(raw)
+
+        if valid_size < os.path.getsize(index_path):
+            with open(index_path, "r+b") as f:
+                f.truncate(valid_size)
+
+    def _recover_partial_shards(self):
+        """Yarım kalan .part parçalarını son indekslenen kayda kadar kesip tamamlar"""
+        for name in os.listdir(self.output_dir):
+            if not name.endswith(".jsonl.gz.part"):
+                continue
+
+            final_name = name[:-len(".part")]
+            part_path = os.path.join(self.output_dir, name)
+            valid_end = max(
+                (offset + length for shard, offset, length in self._index.values() if shard == final_name),
+                default=0
+            )
+
+            if valid_end == 0:
+                os.remove(part_path)
+                continue
+
+            with open(part_path, "r+b") as f:
+                f.truncate(valid_end)
+            os.replace(part_path, os.path.join(self.output_dir, final_name))
+            logger.info(f"Yarım kalan JSONL parçası kurtarıldı: {final_name}")
+
+    def _rotate(self):
+        """Etkin parçayı kapatır ve atomik olarak nihai adına taşır (kilit altında çağrılır)"""
+        if self._file is None:
+            return
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+        final_name = self.shard_name(self._shard_no)
+        os.replace(
+            os.path.join(self.output_dir, final_name + ".part"),
+            os.path.join(self.output_dir, final_name)
+        )
+        self._shard_no += 1
+        self._records = 0
+
+        if self.on_rotate is not None:
+            self.on_rotate(final_name)
+
+    def write(self, icd_code: str, data: Dict):
+        """Kodun kaydını etkin parçaya ekler ve indekse işler"""
+        payload = gzip.compress(
+            (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8"), mtime=0
+        )
+
+        with self._lock:
+            if self._file is None:
+                part_path = os.path.join(self.output_dir, self.shard_name(self._shard_no) + ".part")
+                self._file = open(part_path, "ab")
+
+            shard = self.shard_name(self._shard_no)
+            offset = self._file.tell()
+            self._file.write(payload)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            # İndeks satırı veri diske yazıldıktan sonra eklenir
+            entry = {"icd_code": str(icd_code), "shard": shard, "offset": offset, "length": len(payload)}
+            self._index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._index_file.flush()
+            self._index[str(icd_code)] = (shard, offset, len(payload))
+
+            self._records += 1
+            if self._records >= self.max_records_per_shard or offset + len(payload) >= self.max_bytes_per_shard:
+                self._rotate()
+
+    def contains(self, icd_code: str) -> bool:
+        with self._lock:
+            return str(icd_code) in self._index
+
+    def lookup(self, icd_code: str) -> Optional[Dict]:
+        """Kodun kaydını indeks ofsetiyle doğrudan okur"""
+        with self._lock:
+            entry = self._index.get(str(icd_code))
+        if entry is None:
+            return None
+
+        shard, offset, length = entry
+        path = os.path.join(self.output_dir, shard)
+        if not os.path.exists(path):
+            path += ".part"
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return json.loads(gzip.decompress(f.read(length)))
+
+    def flush(self):
+        """Etkin parçayı döndürür ve indeksi diske yazar; yazıcı açık kalır"""
+        with self._lock:
+            self._rotate()
+            self._index_file.flush()
+            os.fsync(self._index_file.fileno())
+
+    def close(self):
+        """Etkin parçayı döndürür ve indeks dosyasını kapatır"""
+        self.flush()
+        with self._lock:
+            self._index_file.close()
+
+
+class ResponseCache:
+    """
+    (kaynak, normalize sorgu, parametreler) özetiyle adreslenen kalıcı yanıt önbelleği.
+    TTL ile süresi dolan, disk bütçesi aşılınca en az yakın zamanda kullanılanı silen
+    SQLite tabanlı depo. Sonuçsuz sorgular daha kısa TTL ile negatif olarak saklanır.
+    """
+
+    def __init__(self, path: str = "response_cache.sqlite", ttl_seconds: float = 30 * 86400,
+                 negative_ttl_seconds: float = 86400, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Önbellek kaybı yalnızca yeniden indirme demek, her yazmada fsync gerekmez
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, source TEXT, value BLOB, size INTEGER, "
+            "created REAL, accessed REAL, negative INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+        self.stats = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "stores": 0,
+            "evictions": 0
+        }
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Sorguyu küçük harfe çevirir ve boşlukları sadeleştirir"""
+        return re.sub(r"\s+", " ", str(query)).strip().lower()
+
+    def make_key(self, source: str, query: str, params: Dict) -> str:
+        """Önbellek anahtarını (içerik özeti) üretir"""
+        payload = json.dumps(
+            [source, self.normalize_query(query), params],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Geçerli kayıt varsa makale listesini döndürür, yoksa None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, size, created, negative FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            value, size, created, negative = row
+            ttl = self.negative_ttl_seconds if negative else self.ttl_seconds
+            if now - created > ttl:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            # LRU için son erişim zamanını güncelle
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.stats["negative_hits" if negative else "hits"] += 1
+
+        return json.loads(zlib.decompress(value))
+
+    def put(self, key: str, source: str, articles: List[Dict]):
+        """Makale listesini önbelleğe yazar; boş liste negatif kayıt olur"""
+        value = zlib.compress(json.dumps(articles, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if old is not None:
+                self._total_bytes -= old[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, source, value, len(value), now, now, 0 if articles else 1)
+            )
+            self._total_bytes += len(value)
+            self.stats["stores"] += 1
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Disk bütçesinin altına inene kadar en eski erişilen kayıtları siler (kilit altında çağrılır)"""
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in rows])
+            self._total_bytes -= sum(size for _, size in rows)
+            self.stats["evictions"] += len(rows)
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self._conn.close()
+
+
+class ProgressJournal:
+    """
+    Tamamlanan, başarısız ve işlenmekte olan kodları anında kaydeden salt-ekleme ilerleme günlüğü.
+    Her satır CRC32 ile korunur; yarım kalan veya bozuk satırlar yüklenirken atlanır.
+    """
+
+    def __init__(self, path: str = "progress_journal.jsonl"):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {}
+
+        self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    @staticmethod
+    def _encode(record: Dict) -> str:
+        """Kaydı 'crc32 json' biçiminde tek satıra çevirir"""
+        payload = json.dumps(record, ensure_ascii=False, sort_keys=True)
+        return f"{zlib.crc32(payload.encode('utf-8')):08x} {payload}\n"
+
+    def _apply(self, record: Dict):
+        """Kaydı bellekteki kod durumuna uygular"""
+        entry = self.state.setdefault(record["code"], {"status": None, "attempts": 0, "error": None})
+        entry["status"] = record["status"]
+        if record["status"] == "failed":
+            entry["attempts"] += 1
+            entry["error"] = record.get("error")
+
+    def _load(self):
+        """Günlüğü okur; sondaki yarım satırı keserek sonraki eklemelerin bozulmasını önler"""
+        if not os.path.exists(self.path):
+            return
+
+        valid_size = 0
+        skipped = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    skipped += 1
+                    break
+
+                try:
+                    crc, payload = raw.rstrip(b"\n").split(b" ", 1)
+                    if int(crc, 16) != zlib.crc32(payload):
+                        raise ValueError("CRC uyuşmazlığı")
+                    self._apply(json.loads(payload))
+                except (ValueError, KeyError):
+                    skipped += 1
+
+                valid_size += len(raw)
+
+        if skipped:
+            logger.warning(f"İlerleme günlüğünde {skipped} bozuk satır atlandı: {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_size)
+
+    def record(self, icd_code: str, status: str, error: Optional[str] = None):
+        """Kod durumunu ('started', 'done', 'failed') diske yazar ve fsync ile kalıcı hale getirir"""
+        record = {"code": str(icd_code), "status": status, "ts": time.time()}
+        if error:
+            record["error"] = error
+
+        with self._lock:
+            self._file.write(self._encode(record))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._apply(record)
+
+    def status(self, icd_code: str) -> Optional[str]:
+        """Kodun son kaydedilen durumunu döndürür"""
+        entry = self.state.get(str(icd_code))
+        return entry["status"] if entry else None
+
+    def codes_with_status(self, status: str) -> List[str]:
+        """Son durumu verilen değer olan kodları döndürür"""
+        return [code for code, entry in self.state.items() if entry["status"] == status]
+
+    def close(self):
+        """Günlük dosyasını kapatır"""
+        with self._lock:
+            self._file.close()
+
+
+class WorkQueue:
+    """
+    Birden çok süreç veya makine arasında paylaşılan, kiralama (lease) tabanlı ICD kodu kuyruğu (SQLite).
+    Çalışanlar kodları süreli kiralar; süresi dolan kiralar (çöken çalışan) başka bir çalışana geçer.
+    Paylaşılan dosya sisteminde (ör. Drive/NFS) çalışabilmesi için WAL yerine varsayılan
+    geri alma günlüğü ve BEGIN IMMEDIATE kilitleri kullanılır.
+    """
+
+    def __init__(self, path: str = "work_queue.sqlite", lease_seconds: float = 600,
+                 max_attempts: int = 4, retry_backoff: float = 30):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "icd_code TEXT PRIMARY KEY, disease_name TEXT, status TEXT, worker_id TEXT, "
+            "available_at REAL, attempts INTEGER, error TEXT, updated REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, available_at)")
+        # Çalışanların ürettiği arşivler; kuyruk bittiğinde merge_queue_archives bunları birleştirir
+        self._conn.execute("CREATE TABLE IF NOT EXISTS archives (worker_id TEXT PRIMARY KEY, path TEXT, updated REAL)")
+
+        self.stats = {
+            "leased": 0,
+            "expired_leases_taken": 0,
+            "expired_leases_failed": 0,
+            "completed": 0,
+            "requeued": 0
+        }
+
+    @contextmanager
+    def _transaction(self):
+        """Yazma kilidini baştan alan işlem (eşzamanlı kiralamalar aynı kodu alamaz)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, codes: List[Tuple[str, str]]) -> int:
+        """Kodları kuyruğa ekler (zaten olanlar atlanır) ve eklenen kod sayısını döndürür"""
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks VALUES (?, ?, 'pending', NULL, 0, 0, NULL, ?)",
+                [(str(code), name or "", now) for code, name in codes]
+            )
+            return conn.total_changes - before
+
+    def lease(self, worker_id: str, limit: int = 1) -> List[Tuple[str, str]]:
+        """
+        Bekleyen veya kirası dolmuş en fazla limit kodu çalışana kiralar. Deneme hakkı bitmiş
+        kodların dolan kirası (çalışanı çökerten kod fail'e hiç ulaşmaz) yenilenmez, 'failed' olur.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'failed', worker_id = NULL, error = ?, updated = ? "
+                "WHERE status = 'leased' AND available_at <= ? AND attempts >= ?",
+                ("kira süresi doldu, deneme hakkı bitti (çalışan çökmüş olabilir)", now, now, self.max_attempts)
+            )
+            self.stats["expired_leases_failed"] += cursor.rowcount
+
+            rows = conn.execute(
+                "SELECT icd_code, disease_name, status FROM tasks "
+                "WHERE status IN ('pending', 'leased') AND available_at <= ? "
+                "ORDER BY available_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = 'leased', worker_id = ?, available_at = ?, "
+                "attempts = attempts + 1, updated = ? WHERE icd_code = ?",
+                [(worker_id, now + self.lease_seconds, now, code) for code, _, _ in rows]
+            )
+            self.stats["leased"] += len(rows)
+            self.stats["expired_leases_taken"] += sum(1 for _, _, status in rows if status == "leased")
+
+        return [(code, name) for code, name, _ in rows]
+
+    def renew(self, worker_id: str) -> int:
+        """Çalışanın elindeki tüm kiraları uzatır (işlenmekte olan kodlar başkasına geçmez)"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET available_at = ?, updated = ? WHERE status = 'leased' AND worker_id = ?",
+                (now + self.lease_seconds, now, worker_id)
+            )
+            return cursor.rowcount
+
+    def complete(self, icd_code: str):
+        """Kodu tamamlandı olarak işaretler"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = 'done', error = NULL, updated = ? WHERE icd_code = ?",
+                (time.time(), str(icd_code))
+            )
+            self.stats["completed"] += 1
+
+    def fail(self, icd_code: str, error: str) -> bool:
+        """
+        Başarısız kodu artan bekleme süresiyle kuyruğa geri koyar; deneme hakkı bittiyse
+        'failed' olarak bırakır ve True döndürür
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT attempts FROM tasks WHERE icd_code = ?", (str(icd_code),)).fetchone()
+            attempts = row[0] if row else self.max_attempts
+            final = attempts >= self.max_attempts
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker_id = NULL, available_at = ?, error = ?, updated = ? "
+                "WHERE icd_code = ?",
+                ("failed" if final else "pending",
+                 now + self.retry_backoff * (2 ** max(attempts - 1, 0)), error, now, str(icd_code))
+            )
+            if not final:
+                self.stats["requeued"] += 1
+
+        return final
+
+    def register_archive(self, worker_id: str, path: str):
+        """Çalışanın ürettiği arşivin yolunu kuyruğa kaydeder"""
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO archives VALUES (?, ?, ?)", (worker_id, path, time.time()))
+
+    def archives(self) -> List[str]:
+        """Kayıtlı çalışan arşivlerinin yollarını döndürür"""
+        with self._lock:
+            rows = self._conn.execute("SELECT path FROM archives ORDER BY worker_id").fetchall()
+        return [path for path, in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Durum başına kod sayısını döndürür"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def remaining(self) -> int:
+        """Henüz bitmemiş (bekleyen veya kiralanmış) kod sayısını döndürür"""
+        counts = self.counts()
+        return counts.get("pending", 0) + counts.get("leased", 0)
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self._conn.close()
+
+
+def merge_worker_archives(archive_paths: List[str], zip_filename: str = "collected_data.zip") -> Optional[str]:
+    """
+    Çalışanların ayrı ayrı ürettiği ZIP arşivlerini tek arşivde birleştirir.
+    Aynı yoldaki üyelerden (aynı kodun iki kez işlenmesi) ilki tutulur; makale deposu
+    dışa aktarımları article_id'ye göre tekilleştirilerek tek dosyada birleştirilir.
+    """
+    seen = set()
+    store_lines = {}
+    store_arcname = None
+
+    # Aynı anda birleştiren çalışanlar birbirinin geçici dosyasını ezmesin
+    temp_filename = f"{zip_filename}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(temp_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for archive_path in archive_paths:
+            if not os.path.exists(archive_path):
+                logger.warning(f"Çalışan arşivi bulunamadı: {archive_path}")
+                continue
+
+            with zipfile.ZipFile(archive_path, 'r') as worker_zipf:
+                for info in worker_zipf.infolist():
+                    if info.filename.endswith(ArticleStore.EXPORT_FILENAME):
+                        store_arcname = store_arcname or info.filename
+                        for line in worker_zipf.read(info).splitlines():
+                            if line.strip():
+                                article_id = json.loads(line)["article_id"]
+                                store_lines.setdefault(article_id, line)
+                        continue
+
+                    if info.filename in seen:
+                        continue
+                    seen.add(info.filename)
+                    zipf.writestr(info, worker_zipf.read(info))
+
+        if store_arcname is not None:
+            zipf.writestr(store_arcname, b"\n".join(store_lines.values()) + b"\n")
+
+    os.replace(temp_filename, zip_filename)
+    logger.info(f"{len(archive_paths)} çalışan arşivi birleştirildi: {zip_filename} ({len(seen)} dosya)")
+    return zip_filename
+
+
+def merge_queue_archives(queue_path: str, zip_filename: str = "collected_data.zip",
+                         force: bool = False) -> Optional[str]:
+    """
+    Kuyruğa kayıtlı tüm çalışan arşivlerini birleştirir. Kuyrukta bitmemiş kod varsa
+    (force=False) birleştirmez. Birleştirme sırasında yeni arşiv kaydedilirse (aynı anda
+    biten çalışanlar) birleştirme tekrarlanır; böylece son yazılan arşiv hepsini içerir.
+    """
+    work_queue = WorkQueue(queue_path)
+    try:
+        if not force and work_queue.remaining() > 0:
+            logger.warning(f"Kuyrukta {work_queue.remaining()} bitmemiş kod var, arşivler birleştirilmedi")
+            return None
+
+        while True:
+            archive_paths = work_queue.archives()
+            if not archive_paths:
+                logger.warning(f"Kuyrukta kayıtlı çalışan arşivi yok: {queue_path}")
+                return None
+            merged = merge_worker_archives(archive_paths, zip_filename)
+            if work_queue.archives() == archive_paths:
+                return merged
+    finally:
+        work_queue.close()
+
+
+class ArticleMerger:
+    """
+    Farklı kaynaklardan gelen aynı makaleyi DOI veya normalize başlık + yıl ile eşleştirip
+    tek kayıtta birleştiren yardımcı. Eksik alanlar diğer kaynaklardan doldurulur.
+    """
+
+    # Yalnızca başlıkla eşleştirme için minimum normalize başlık uzunluğu ("Editorial" gibi
+    # genel başlıkların farklı makaleleri birleştirmesini önler)
+    MIN_TITLE_MATCH_LENGTH = 20
+
+    DOI_PREFIX_PATTERN = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+    YEAR_PATTERN = re.compile(r'\b(1[89]\d{2}|20\d{2})\b')
+
+    @classmethod
+    def normalize_doi(cls, doi: Optional[str]) -> Optional[str]:
+        """DOI'yi karşılaştırılabilir biçime getirir ('https://doi.org/10.1/X' -> '10.1/x')"""
+        if not doi:
+            return None
+        doi = cls.DOI_PREFIX_PATTERN.sub("", str(doi).strip()).strip().rstrip(".").lower()
+        return doi if doi.startswith("10.") else None
+
+    @staticmethod
+    def normalize_title(title: Optional[str]) -> str:
+        """Büyük/küçük harf, noktalama ve boşluk farklarını yok sayan başlık anahtarı"""
+        if not title:
+            return ""
+        title = re.sub(r'[^\w\s]', ' ', str(title).casefold())
+        return re.sub(r'\s+', ' ', title).strip()
+
+    @classmethod
+    def article_year(cls, article: Dict) -> Optional[str]:
+        """Yayın tarihindeki ilk dört haneli yılı döndürür"""
+        match = cls.YEAR_PATTERN.search(str(article.get("publication_date") or ""))
+        return match.group(1) if match else None
+
+    @classmethod
+    def match_keys(cls, article: Dict) -> Tuple[Optional[str], Optional[Tuple[str, Optional[str]]]]:
+        """(DOI anahtarı, (başlık, yıl) anahtarı) döndürür; kısa başlıklar için başlık anahtarı None"""
+        title = cls.normalize_title(article.get("title"))
+        title_key = (title, cls.article_year(article)) if len(title) >= cls.MIN_TITLE_MATCH_LENGTH else None
+        return cls.normalize_doi(article.get("doi")), title_key
+
+    @staticmethod
+    def _fill(target: Dict, article: Dict):
+        """Hedef kayıttaki boş alanları makaleden doldurur"""
+        for field, value in article.items():
+            if field in ("source", "sources"):
+                continue
+            current = target.get(field)
+            if field == "abstract":
+                # Scholar yalnızca kısa özet parçası verir; en uzun özet tutulur
+                if value and len(value) > len(current or ""):
+                    target[field] = value
+            elif field == "authors":
+                # Bazı kaynaklar yazar listesini kısaltır; en uzun liste tutulur
+                if value and len(value) > len(current or []):
+                    target[field] = value
+            elif not current and value:
+                target[field] = value
+
+    @classmethod
+    def merge(cls, articles: List[Dict]) -> List[Dict]:
+        """
+        Makaleleri geliş sırasını koruyarak birleştirir. İlk gelen kaynağın değerleri önceliklidir;
+        'source' ilk kaynak olarak kalır, 'sources' tüm kaynakları listeler.
+        """
+        merged = []
+        group_dois = []
+        doi_index = {}
+        title_index = {}
+        title_only_index = {}
+
+        for article in articles:
+            doi, title_key = cls.match_keys(article)
+
+            group = None
+            if doi is not None and doi in doi_index:
+                group = doi_index[doi]
+            elif title_key is not None:
+                title, year = title_key
+                # Yılı bilinmeyen tarafla yalnızca başlık eşleşmesi yeterli sayılır
+                if year is None:
+                    group = title_only_index.get(title)
+                else:
+                    group = title_index.get(title_key, title_index.get((title, None)))
+                # Farklı DOI'li makaleler (örn. düzeltme yazıları) aynı başlıkla birleştirilmez
+                if group is not None and doi is not None and group_dois[group] not in (None, doi):
+                    group = None
+
+            if group is None:
+                group = len(merged)
+                record = dict(article)
+                record["sources"] = [article.get("source")]
+                merged.append(record)
+                group_dois.append(doi)
+            else:
+                record = merged[group]
+                cls._fill(record, article)
+                if article.get("source") not in record["sources"]:
+                    record["sources"].append(article.get("source"))
+                if group_dois[group] is None and doi is not None:
+                    group_dois[group] = doi
+
+            if doi is not None:
+                doi_index.setdefault(doi, group)
+            if title_key is not None:
+                title_index.setdefault(title_key, group)
+                title_only_index.setdefault(title_key[0], group)
+
+        return merged
+
+
+class ArticleStore:
+    """
+    ICD kodları arasında paylaşılan, tekilleştirilmiş makale deposu (SQLite).
+    Makaleler DOI'den veya başlık + yıl özetinden türetilen kimlikle bir kez saklanır;
+    kod kayıtları yalnızca kimlik ve sıra tutar. DOI, başlık ve URL takma adları
+    aynı makalenin farklı kaynaklardan tekrar gelişini yakalar.
+    """
+
+    EXPORT_FILENAME = "articles_store.jsonl"
+
+    def __init__(self, path: str = "article_store.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "article_id TEXT PRIMARY KEY, data BLOB, code_count INTEGER, updated REAL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS aliases (alias TEXT PRIMARY KEY, article_id TEXT)")
+
+        self.stats = {
+            "new": 0,
+            "reused": 0,
+            "reused_details": 0
+        }
+
+    @staticmethod
+    def _aliases(article: Dict) -> List[str]:
+        """Makaleyi bulmak için kullanılacak anahtarlar (öncelik sırasıyla)"""
+        doi, title_key = ArticleMerger.match_keys(article)
+        aliases = []
+        if doi:
+            aliases.append(f"doi:{doi}")
+        if title_key is not None:
+            title, year = title_key
+            aliases.append("title:" + hashlib.sha1(f"{title}|{year or ''}".encode("utf-8")).hexdigest())
+        if article.get("url"):
+            aliases.append(f"url:{article['url']}")
+        return aliases
+
+    @staticmethod
+    def make_id(aliases: List[str]) -> str:
+        """Makale kimliği: ilk (en güçlü) takma adın kısa özeti"""
+        return hashlib.sha1(aliases[0].encode("utf-8")).hexdigest()[:20]
+
+    def _find(self, aliases: List[str]) -> Optional[str]:
+        for alias in aliases:
+            row = self._conn.execute("SELECT article_id FROM aliases WHERE alias = ?", (alias,)).fetchone()
+            if row is not None:
+                return row[0]
+        return None
+
+    def _load(self, article_id: str) -> Optional[Dict]:
+        row = self._conn.execute("SELECT data FROM articles WHERE article_id = ?", (article_id,)).fetchone()
+        return json.loads(zlib.decompress(row[0])) if row is not None else None
+
+    def add_many(self, articles: List[Dict]) -> List[Optional[str]]:
+        """
+        Makaleleri depoya ekler veya mevcut kayıtla birleştirir; her makalenin kimliğini döndürür.
+        Hiç anahtarı olmayan (başlıksız, URL'siz) makaleler için None döner.
+        """
+        article_ids = []
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for article in articles:
+                    aliases = self._aliases(article)
+                    if not aliases:
+                        article_ids.append(None)
+                        continue
+
+                    article_id = self._find(aliases)
+                    if article_id is None:
+                        article_id = self.make_id(aliases)
+                        record = dict(article)
+                        record.setdefault("sources", [article.get("source")])
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO articles VALUES (?, ?, 1, ?)",
+                            (article_id, zlib.compress(json.dumps(record, ensure_ascii=False).encode("utf-8")), now)
+                        )
+                        self.stats["new"] += 1
+                    else:
+                        # Yeni kaynaktan gelen eksik alanları mevcut kayda işle
+                        record = self._load(article_id)
+                        before = json.dumps(record, sort_keys=True, ensure_ascii=False)
+                        ArticleMerger._fill(record, article)
+                        for source in article.get("sources") or [article.get("source")]:
+                            if source not in record.setdefault("sources", []):
+                                record["sources"].append(source)
+                        if json.dumps(record, sort_keys=True, ensure_ascii=False) != before:
+                            self._conn.execute(
+                                "UPDATE articles SET data = ?, updated = ? WHERE article_id = ?",
+                                (zlib.compress(json.dumps(record, ensure_ascii=False).encode("utf-8")), now, article_id)
+                            )
+                        self._conn.execute(
+                            "UPDATE articles SET code_count = code_count + 1 WHERE article_id = ?", (article_id,)
+                        )
+                        self.stats["reused"] += 1
+
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO aliases VALUES (?, ?)", [(alias, article_id) for alias in aliases]
+                    )
+                    article_ids.append(article_id)
+
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return article_ids
+
+    def get(self, article_id: str) -> Optional[Dict]:
+        """Kimliği verilen makaleyi döndürür"""
+        with self._lock:
+            return self._load(article_id)
+
+    def lookup_urls(self, urls: List[str]) -> Dict[str, Dict]:
+        """URL'si depoda olan makaleleri {url: makale} olarak döndürür"""
+        found = {}
+        with self._lock:
+            for url in urls:
+                article_id = self._find([f"url:{url}"])
+                if article_id is not None:
+                    found[url] = self._load(article_id)
+        return found
+
+    def resolve(self, record: Dict) -> List[Dict]:
+        """Kod kaydındaki article_refs listesini sıralı makale listesine çevirir"""
+        articles = []
+        for ref in sorted(record.get("article_refs", []), key=lambda ref: ref["rank"]):
+            article = self.get(ref["article_id"])
+            if article is not None:
+                articles.append(article)
+        return articles
+
+    def export_jsonl(self, path: str) -> int:
+        """Tüm makaleleri {"article_id", ...} satırları olarak JSONL dosyasına yazar"""
+        count = 0
+        temp_path = path + ".tmp"
+        with self._lock, open(temp_path, "w", encoding="utf-8") as f:
+            for article_id, data in self._conn.execute("SELECT article_id, data FROM articles ORDER BY article_id"):
+                record = {"article_id": article_id, **json.loads(zlib.decompress(data))}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return count
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self._lock:
+            self._conn.close()
+
+
+class _HTMLNode:
+    """lxml yokken html.parser ile kurulan hafif DOM düğümü (lxml öğesinin kullanılan alt kümesi)"""
+
+    __slots__ = ("tag", "attrib", "children")
+
+    def __init__(self, tag: str, attrib: Dict):
+        self.tag = tag
+        self.attrib = attrib
+        self.children = []
+
+    def get(self, name: str, default=None):
+        return self.attrib.get(name, default)
+
+    def iterdescendants(self):
+        """Alt düğümleri belge sırasıyla dolaşır"""
+        stack = [child for child in reversed(self.children) if isinstance(child, _HTMLNode)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(child for child in reversed(node.children) if isinstance(child, _HTMLNode))
+
+    def text_content(self) -> str:
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return "".join(parts)
+
+
+class _HTMLTreeBuilder(HTMLParser):
+    """HTML metninden _HTMLNode ağacı kurar; kapanmayan etiketleri tarayıcılar gibi tolere eder"""
+
+    VOID_TAGS = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input",
+                           "link", "meta", "param", "source", "track", "wbr"))
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _HTMLNode("#document", {})
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = _HTMLNode(tag, {name: value or "" for name, value in attrs})
+        self._stack[-1].children.append(node)
+        if tag not in self.VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self._stack[-1].children.append(_HTMLNode(tag, {name: value or "" for name, value in attrs}))
+
+    def handle_endtag(self, tag):
+        # Eşleşen açık etiket yoksa kapanış yok sayılır
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                del self._stack[i:]
+                break
+
+    def handle_data(self, data):
+        self._stack[-1].children.append(data)
+
+
+class StaticHTMLElement:
+    """
+    Sunucuda oluşturulmuş HTML üzerinde Selenium WebElement arayüzünün kullanılan kısmı
+    (find_element(s), text, get_attribute). Böylece _extract_*_article_data metotları
+    tarayıcı ve tarayıcısız sayfalarda aynı kodla çalışır.
+    """
+
+    def __init__(self, node, base_url: str):
+        self.node = node
+        self.base_url = base_url
+
+    @classmethod
+    def parse(cls, content: bytes, base_url: str) -> "StaticHTMLElement":
+        """HTML'i lxml (varsa) veya html.parser ile ayrıştırır"""
+        if lxml_html is not None:
+            return cls(lxml_html.document_fromstring(content), base_url)
+
+        builder = _HTMLTreeBuilder()
+        builder.feed(content.decode("utf-8", errors="replace") if isinstance(content, bytes) else content)
+        builder.close()
+        return cls(builder.root, base_url)
+
+    @staticmethod
+    def _matcher(by: str, value: str):
+        if by == By.CLASS_NAME:
+            return lambda node: value in (node.get("class") or "").split()
+        if by == By.TAG_NAME:
+            tag = value.lower()
+            return lambda node: node.tag == tag
+        if by == By.ID:
+            return lambda node: node.get("id") == value
+        if by == By.CSS_SELECTOR:
+            # Yalnızca [öznitelik='değer'] biçimi desteklenir
+            match = re.fullmatch(r"\[([\w-]+)=['\"]?([^'\"\]]*)['\"]?\]", value.strip())
+            if match:
+                name, expected = match.groups()
+                return lambda node: node.get(name) == expected
+        raise ValueError(f"Desteklenmeyen seçici: {by}={value}")
+
+    def _iter_matches(self, by: str, value: str):
+        match = self._matcher(by, value)
+        for node in self.node.iterdescendants():
+            # lxml yorum düğümlerinin tag'i metin değildir
+            if isinstance(node.tag, str) and match(node):
+                yield StaticHTMLElement(node, self.base_url)
+
+    def find_elements(self, by: str, value: str) -> List["StaticHTMLElement"]:
+        return list(self._iter_matches(by, value))
+
+    def find_element(self, by: str, value: str) -> "StaticHTMLElement":
+        element = next(self._iter_matches(by, value), None)
+        if element is None:
+            raise NoSuchElementException(f"Öğe bulunamadı: {by}={value}")
+        return element
+
+    @property
+    def text(self) -> str:
+        """Boşlukları tek boşluğa indirgenmiş metin (Selenium'un görünür metnine yakın)"""
+        return " ".join(self.node.text_content().split())
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        value = self.node.get(name)
+        # Selenium href/src değerlerini mutlak URL olarak döndürür
+        if value is not None and name in ("href", "src"):
+            return urljoin(self.base_url, value)
+        return value
+
+
 class ICDArticleScraper:
     """ICD-10 kodları için akademik makale toplama sınıfı"""
 
-    def __init__(self):
+    # Kaynak başına varsayılan eşzamanlı iş parçacığı sayısı
+    DEFAULT_SOURCE_WORKERS = {
+        "PubMed": 2,
+        "Google Scholar": 1,
+        "Semantic Scholar": 4,
+        "ArXiv": 2
+    }
+
+    PUBMED_SEARCH_URL = "https://pubmed.ncbi.nlm.nih.gov/"
+    GOOGLE_SCHOLAR_SEARCH_URL = "https://scholar.google.com/scholar"
+    SEMANTIC_SCHOLAR_API_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+    ARXIV_API_URL = "http://export.arxiv.org/api/query"
+    PUBMED_EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+
+    # Bot doğrulama sayfası işaretleri ve yanıt kodları
+    CHALLENGE_MARKERS = ("gs_captcha", "recaptcha", "unusual traffic")
+    CHALLENGE_STATUSES = (403, 429)
+
+    # Sunucuda oluşturulan sonuçsuz arama sayfası işaretleri (tarayıcıya düşülmez)
+    PUBMED_NO_RESULTS_MARKERS = ("No results were found", "no-results-amount")
+    GOOGLE_SCHOLAR_NO_RESULTS_MARKERS = ("did not match any articles",)
+
+    def __init__(self, driver_pool_size: Optional[int] = None, max_pages_per_driver: int = 50,
+                 source_workers: Optional[Dict[str, int]] = None, max_codes_in_flight: int = 16,
+                 use_async_api: bool = True, api_per_host_limit: int = 4,
+                 cache_path: Optional[str] = "response_cache.sqlite", cache_ttl_days: float = 30,
+                 cache_max_mb: int = 512, journal_path: str = "progress_journal.jsonl",
+                 max_retries: int = 3, retry_backoff: float = 30,
+                 pubmed_batch_details: bool = True, ncbi_api_key: Optional[str] = None,
+                 metrics_interval: float = 60, metrics_path: Optional[str] = "scraper_metrics",
+                 output_format: str = "json", max_records_per_shard: int = 1000,
+                 article_store_path: Optional[str] = None, static_fetch: bool = True,
+                 worker_id: Optional[str] = None):
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -45,13 +1908,36 @@ class ICDArticleScraper:
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:89.0) Gecko/20100101 Firefox/89.0"
         ]
 
+        if output_format not in ("json", "jsonl"):
+            raise ValueError(f"Geçersiz çıktı biçimi: {output_format} (json veya jsonl)")
+
         self.output_dir = "collected_json"
+        self.output_format = output_format
+        self.jsonl_dir = "collected_jsonl"
+        zip_filename = "collected_data.zip"
+
+        # Kuyruk modunda aynı klasörü paylaşan çalışanların yerel dosyaları çakışmasın diye
+        # günlük, önbellek, depo, çıktı klasörü ve arşiv adlarına çalışan kimliği eklenir
+        self.worker_id = worker_id
+        if worker_id:
+            self.output_dir, self.jsonl_dir, zip_filename, journal_path = (
+                self._worker_path(path) for path in (self.output_dir, self.jsonl_dir, zip_filename, journal_path)
+            )
+            cache_path = self._worker_path(cache_path) if cache_path else None
+            metrics_path = self._worker_path(metrics_path) if metrics_path else None
+            article_store_path = self._worker_path(article_store_path) if article_store_path else None
         self.failed_codes = []
+        self.journal_path = journal_path
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
         self.stats = {
             "total_codes": 0,
             "processed_codes": 0,
+            "skipped_codes": 0,
+            "retried_codes": 0,
             "failed_codes": 0,
             "total_articles": 0,
+            "merged_articles": 0,
             "articles_by_source": {
                 "PubMed": 0,
                 "Google Scholar": 0,
@@ -60,14 +1946,149 @@ class ICDArticleScraper:
             }
         }
 
+        self._stats_lock = threading.Lock()
+
+        # İstek, hata, zaman aşımı, makale sayaçları ve gecikme histogramları
+        self.metrics = MetricsRegistry()
+        self.metrics_interval = metrics_interval
+        self.metrics_json_path = f"{metrics_path}.json" if metrics_path else None
+        self.metrics_prometheus_path = f"{metrics_path}.prom" if metrics_path else None
+
+        self.source_workers = dict(self.DEFAULT_SOURCE_WORKERS)
+        if source_workers:
+            self.source_workers.update(source_workers)
+
+        # Tarayıcı kullanan kaynakların iş parçacığı sayısı kadar sürücü
+        if driver_pool_size is None:
+            driver_pool_size = self.source_workers["PubMed"] + self.source_workers["Google Scholar"]
+
+        # PubMed ve Google Scholar için paylaşılan tarayıcı havuzu
+        self.driver_pool = ChromeDriverPool(
+            self.create_driver,
+            self.user_agents,
+            max_size=driver_pool_size,
+            max_pages_per_driver=max_pages_per_driver
+        )
+        self.stats["driver_pool"] = self.driver_pool.stats
+
+        # Ara kayıtlarda yalnızca yeni dosyaları ekleyen arşiv
+        self.shard_writer = None
+        if self.output_format == "jsonl":
+            # Parçalar zaten gzip'li olduğu için ZIP'e sıkıştırmadan eklenir
+            # Çalışanların parça adları aynı olduğundan arşivde çalışan alt klasörüne konur
+            archive_prefix = "collected_data/content/collected_jsonl"
+            if worker_id:
+                archive_prefix = f"{archive_prefix}/{worker_id}"
+            self.archive = CheckpointArchive(
+                self.jsonl_dir,
+                zip_filename=zip_filename,
+                archive_prefix=archive_prefix,
+                compression=zipfile.ZIP_STORED
+            )
+            self.shard_writer = ShardedJSONLWriter(
+                self.jsonl_dir,
+                max_records_per_shard=max_records_per_shard,
+                on_rotate=self.archive.add
+            )
+            for shard in self.shard_writer.shard_files():
+                if not self.archive.contains(shard):
+                    self.archive.add(shard)
+        else:
+            self.archive = CheckpointArchive(self.output_dir, zip_filename=zip_filename)
+
+        # Tüm kaynakların önünde duran kalıcı yanıt önbelleği (cache_path=None ile kapatılır)
+        self.response_cache = None
+        if cache_path:
+            self.response_cache = ResponseCache(
+                cache_path,
+                ttl_seconds=cache_ttl_days * 86400,
+                max_bytes=cache_max_mb * 1024 * 1024
+            )
+            self.stats["cache"] = self.response_cache.stats
+
+        # Kodlar arası ortak makale deposu: kod kayıtları yalnızca makale kimliği ve sırası tutar
+        self.article_store = None
+        if article_store_path:
+            self.article_store = ArticleStore(article_store_path)
+            self.stats["article_store"] = self.article_store.stats
+
+        # Sabit rastgele beklemelerin yerine host başına uyarlanabilir hız sınırlayıcı
+        self.rate_limiter = HostRateLimiter()
+        self.stats["rate_limits"] = self.rate_limiter.stats
+
+        # PubMed özet/DOI bilgileri kod başına tek efetch isteğiyle alınır
+        self.pubmed_batch_details = pubmed_batch_details
+        self.ncbi_api_key = ncbi_api_key
+
+        # PubMed ve Google Scholar sonuç listeleri önce tarayıcısız okunur,
+        # Selenium yalnızca JavaScript gerektiren veya doğrulama isteyen sayfalarda açılır
+        self.static_fetch = static_fetch
+        self.stats["static_fetch"] = {"pages": 0, "browser_fallbacks": 0}
+
+        # API kaynakları için bağlantı havuzlu HTTP oturumu
+        self.http_session = requests.Session()
+        pool_maxsize = self.source_workers["Semantic Scholar"] + self.source_workers["ArXiv"]
+        if static_fetch:
+            pool_maxsize += self.source_workers["PubMed"] + self.source_workers["Google Scholar"]
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=pool_maxsize
+        )
+        self.http_session.mount("http://", adapter)
+        self.http_session.mount("https://", adapter)
+
+        # aiohttp varsa API kaynakları tek olay döngüsünde asenkron çalışır
+        self.async_engine = None
+        if use_async_api and aiohttp is not None:
+            self.async_engine = AsyncHTTPEngine(
+                per_host_limit=api_per_host_limit,
+                rate_limiter=self.rate_limiter,
+                metrics=self.metrics
+            )
+        elif use_async_api:
+            logger.warning("aiohttp bulunamadı, API kaynakları senkron oturumla çalışacak")
+
+        if self.async_engine is not None:
+            api_sources = {
+                "Semantic Scholar": self.scrape_semantic_scholar_async,
+                "ArXiv": self.scrape_arxiv_async
+            }
+        else:
+            api_sources = {
+                "Semantic Scholar": self.scrape_semantic_scholar,
+                "ArXiv": self.scrape_arxiv
+            }
+
+        # Kodlar arası boru hattı zamanlayıcısı
+        self.scheduler = SourceScheduler(
+            {
+                "PubMed": self.scrape_pubmed,
+                "Google Scholar": self.scrape_google_scholar,
+                **api_sources
+            },
+            self.source_workers,
+            max_codes_in_flight=max_codes_in_flight,
+            async_runner=self.async_engine.submit if self.async_engine is not None else None
+        )
+
         # Geçici klasörleri oluştur
         os.makedirs(self.output_dir, exist_ok=True)
 
+    def _worker_path(self, path: str) -> str:
+        """Dosya veya klasör adına çalışan kimliğini ekler (progress_journal.jsonl -> progress_journal_w1.jsonl)"""
+        root, ext = os.path.splitext(path)
+        return f"{root}_{self.worker_id}{ext}"
+
+    @staticmethod
+    def default_worker_id() -> str:
+        """Makine ve süreç bazında benzersiz çalışan kimliği"""
+        return f"{socket.gethostname()}-{os.getpid()}"
+
     def get_random_user_agent(self) -> str:
         """Rastgele bir User-Agent döndürür"""
         return random.choice(self.user_agents)
 
-    def create_driver(self) -> webdriver.Chrome:
+    def create_driver(self, user_agent: Optional[str] = None) -> webdriver.Chrome:
         """Headless Chrome WebDriver oluşturur"""
         chrome_options = Options()
         chrome_options.add_argument("--headless")
@@ -75,63 +2096,431 @@ class ICDArticleScraper:
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument(f"--user-agent={self.get_random_user_agent()}")
+        chrome_options.add_argument(f"--user-agent={user_agent or self.get_random_user_agent()}")
 
         return webdriver.Chrome(options=chrome_options)
 
-    def wait_random(self, min_seconds: float = 2, max_seconds: float = 5):
-        """Rastgele bekleme süresi"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+    def _rate_limited_get(self, url: str, check_challenge: bool = False, **kwargs) -> requests.Response:
+        """
+        Host hız sınırlayıcısından geçerek GET isteği yapar ve yanıtı sınırlayıcıya bildirir.
+        check_challenge: doğrulama sayfası (403, /sorry/ yönlendirmesi, CAPTCHA) sağlıklı yanıt
+        sayılmaz, sınırlayıcıya engellenme olarak bildirilir.
+        """
+        host = urlsplit(url).netloc
+        with self.metrics.timer("stage_latency_seconds", stage="rate_limit_wait"):
+            self.rate_limiter.acquire(host)
+
+        try:
+            with self.metrics.timer("stage_latency_seconds", stage="http_request"):
+                response = self.http_session.get(url, **kwargs)
+        except requests.RequestException:
+            self.metrics.inc("http_requests_total", host=host, status="error")
+            self.rate_limiter.feedback(host, error=True)
+            raise
+
+        self.metrics.inc("http_requests_total", host=host, status=response.status_code)
+
+        self.rate_limiter.feedback(
+            host,
+            response.status_code,
+            retry_after=HostRateLimiter.parse_retry_after(response.headers.get("Retry-After")),
+            challenge=check_challenge and self._is_challenge_response(response),
+            rtt=response.elapsed.total_seconds()
+        )
+        return response
+
+    def _is_challenge_response(self, response: requests.Response) -> bool:
+        """HTTP yanıtının bot doğrulama / engelleme sayfası olup olmadığını kontrol eder"""
+        if response.status_code in self.CHALLENGE_STATUSES or "/sorry/" in response.url:
+            return True
+        return response.ok and any(marker in response.text for marker in self.CHALLENGE_MARKERS)
+
+    def _count_timeout(self, source: str, error: Optional[Exception] = None):
+        """Zaman aşımı hatalarını kaynak bazında sayar"""
+        if error is None or isinstance(error, (TimeoutException, requests.Timeout, asyncio.TimeoutError)):
+            self.metrics.inc("timeouts_total", source=source)
+
+    def _is_challenge_page(self, driver) -> bool:
+        """Sayfanın CAPTCHA / bot doğrulama sayfası olup olmadığını kontrol eder"""
+        try:
+            if "/sorry/" in driver.current_url:
+                return True
+            page = driver.page_source
+        except Exception:
+            return False
+        return any(marker in page for marker in self.CHALLENGE_MARKERS)
+
+    def _load_page(self, driver, url: str):
+        """Sayfayı host hız sınırlayıcısından geçerek tarayıcıda açar"""
+        host = urlsplit(url).netloc
+        with self.metrics.timer("stage_latency_seconds", stage="rate_limit_wait"):
+            self.rate_limiter.acquire(host)
+        try:
+            with self.metrics.timer("stage_latency_seconds", stage="page_load"):
+                driver.get(url)
+        except WebDriverException:
+            self.rate_limiter.feedback(host, error=True)
+            raise
+
+    def _fetch_static_page(self, source: str, url: str, params: Dict, ready: Tuple[str, str],
+                           no_results_markers: Tuple[str, ...] = (),
+                           article_redirect: bool = False) -> Optional[StaticHTMLElement]:
+        """
+        Sayfayı bağlantı havuzlu HTTP ile alıp ayrıştırır. Doğrulama sayfası döndüyse veya
+        beklenen sonuç öğesi (ready) HTML'de yoksa None döner ve çağıran Selenium'a geçer.
+        Sonuçsuz arama sayfası (no_results_markers) ve article_redirect=True iken tek sonuçlu
+        aramanın makale sayfasına yönlendirmesi de sunucuda oluşturulur; bunlarda sayfa
+        tarayıcı açılmadan döndürülür ve çıkarıcılar boş sonuç üretir.
+        Ağ ve sunucu hataları tarayıcıya düşmeden istisna olarak yükseltilir.
+        """
+        headers = {
+            "User-Agent": self.get_random_user_agent(),
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9"
+        }
+
+        with self.metrics.timer("stage_latency_seconds", stage="static_fetch"):
+            response = self._rate_limited_get(url, check_challenge=True, params=params, headers=headers, timeout=15)
+
+        # Doğrulama sayfası sınırlayıcıya _rate_limited_get içinde bildirildi
+        reason = None
+        if self._is_challenge_response(response):
+            reason = "challenge"
+        else:
+            response.raise_for_status()
+
+        page = None
+        if reason is None:
+            with self.metrics.timer("stage_latency_seconds", stage="html_parse"):
+                page = StaticHTMLElement.parse(response.content, response.url)
+            if not page.find_elements(*ready):
+                reason = "needs_js"
+                redirect_path = urlsplit(response.url).path
+                search_path = urlsplit(url).path
+                if any(marker in response.text for marker in no_results_markers):
+                    reason = "no_results"
+                elif (article_redirect and redirect_path.startswith(search_path)
+                      and re.fullmatch(r"\d+/?", redirect_path[len(search_path):])):
+                    reason = "article_redirect"
+
+        if reason in ("no_results", "article_redirect"):
+            self.metrics.inc("static_fetch_total", source=source, outcome=reason)
+            with self._stats_lock:
+                self.stats["static_fetch"]["pages"] += 1
+            logger.info(f"{source} sonuç listesi içermeyen sayfa döndürdü ({reason}), boş sonuç kaydedildi")
+            return page
+
+        if reason is not None:
+            self.metrics.inc("static_fetch_total", source=source, outcome=reason)
+            with self._stats_lock:
+                self.stats["static_fetch"]["browser_fallbacks"] += 1
+            logger.info(f"{source} sayfası tarayıcısız okunamadı ({reason}), Selenium'a geçiliyor")
+            return None
+
+        self.metrics.inc("static_fetch_total", source=source, outcome="ok")
+        with self._stats_lock:
+            self.stats["static_fetch"]["pages"] += 1
+        return page
+
+    def _cached_scrape(self, source: str, query: str, params: Dict, fetch) -> List[Dict]:
+        """Önbellekte geçerli kayıt varsa onu döndürür, yoksa kaynağa gidip sonucu önbelleğe yazar"""
+        if self.response_cache is not None:
+            key = self.response_cache.make_key(source, query, params)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self.metrics.inc("cache_hits_total", source=source)
+                return cached
+
+        # None hata demektir, önbelleğe yazılmaz
+        self.metrics.inc("requests_total", source=source)
+        with self.metrics.timer("source_latency_seconds", source=source):
+            articles = fetch()
+
+        if articles is None:
+            self.metrics.inc("errors_total", source=source)
+            return []
+
+        self.metrics.inc("articles_total", len(articles), source=source)
+        if self.response_cache is not None:
+            self.response_cache.put(key, source, articles)
+        return articles
+
+    async def _cached_scrape_async(self, source: str, query: str, params: Dict, fetch) -> List[Dict]:
+        """_cached_scrape'in coroutine kaynaklar için karşılığı"""
+        if self.response_cache is not None:
+            key = self.response_cache.make_key(source, query, params)
+            cached = self.response_cache.get(key)
+            if cached is not None:
+                self.metrics.inc("cache_hits_total", source=source)
+                return cached
+
+        self.metrics.inc("requests_total", source=source)
+        start = time.perf_counter()
+        articles = await fetch()
+        self.metrics.observe("source_latency_seconds", time.perf_counter() - start, source=source)
+
+        if articles is None:
+            self.metrics.inc("errors_total", source=source)
+            return []
+
+        self.metrics.inc("articles_total", len(articles), source=source)
+        if self.response_cache is not None:
+            self.response_cache.put(key, source, articles)
+        return articles
 
     def scrape_pubmed(self, icd_code: str, disease_name: str) -> List[Dict]:
         """PubMed'den makale toplar"""
+        return self._cached_scrape(
+            "PubMed",
+            self._search_query(icd_code, disease_name),
+            {"max_results": 10},
+            partial(self._fetch_pubmed, icd_code, disease_name)
+        )
+
+    def _extract_pubmed_articles(self, page, driver) -> List[Dict]:
+        """Sonuç sayfasındaki ilk 10 PubMed makalesini çıkarır (page: sürücü veya StaticHTMLElement)"""
         articles = []
-        driver = None
+        article_elements = page.find_elements(By.CLASS_NAME, "docsum-content")
 
-        try:
-            driver = self.create_driver()
-
-            # PubMed arama URL'si
-            search_query = f"{icd_code} {disease_name}" if disease_name else icd_code
-            url = f"https://pubmed.ncbi.nlm.nih.gov/?term={search_query}"
+        for element in article_elements[:10]:  # İlk 10 makaleyi al
+            try:
+                article_data = self._extract_pubmed_article_data(
+                    element, driver, fetch_details=not self.pubmed_batch_details
+                )
+                if article_data:
+                    articles.append(article_data)
+            except Exception as e:
+                logger.warning(f"PubMed makale çıkarma hatası: {e}")
+                continue
 
-            driver.get(url)
-            self.wait_random(2, 4)
+        return articles
 
-            # Makale elementlerini bekle
-            wait = WebDriverWait(driver, 10)
+    def _fetch_pubmed(self, icd_code: str, disease_name: str) -> Optional[List[Dict]]:
+        """PubMed arama sayfasını okur; sonuçsuz sorguda boş liste, hata veya doğrulama sayfasında None döndürür"""
+        articles = None
+        search_query = f"{icd_code} {disease_name}" if disease_name else icd_code
 
-            try:
-                # Makale listesini bekle
-                articles_container = wait.until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "search-results-chunk"))
+        try:
+            # Sunucuda oluşturulan sonuç listesi tarayıcısız okunur
+            if self.static_fetch:
+                page = self._fetch_static_page(
+                    "PubMed", self.PUBMED_SEARCH_URL, {"term": search_query},
+                    (By.CLASS_NAME, "search-results-chunk"),
+                    no_results_markers=self.PUBMED_NO_RESULTS_MARKERS,
+                    article_redirect=True
                 )
+                if page is not None:
+                    articles = self._extract_pubmed_articles(page, None)
 
-                # Makale elementlerini bul
-                article_elements = driver.find_elements(By.CLASS_NAME, "docsum-content")
+            if articles is None:
+                # Havuzdan sürücü ödünç al
+                with self.driver_pool.driver() as driver:
+                    # PubMed arama URL'si
+                    url = f"{self.PUBMED_SEARCH_URL}?term={search_query}"
+                    host = urlsplit(url).netloc
 
-                for element in article_elements[:10]:  # İlk 10 makaleyi al
-                    try:
-                        article_data = self._extract_pubmed_article_data(element, driver)
-                        if article_data:
-                            articles.append(article_data)
-                    except Exception as e:
-                        logger.warning(f"PubMed makale çıkarma hatası: {e}")
-                        continue
+                    self._load_page(driver, url)
 
-            except TimeoutException:
-                logger.warning(f"PubMed için {icd_code} arama sonuçları bulunamadı")
+                    # Makale elementlerini bekle
+                    wait = WebDriverWait(driver, 10)
+
+                    try:
+                        # Makale listesini bekle
+                        articles_container = wait.until(
+                            EC.presence_of_element_located((By.CLASS_NAME, "search-results-chunk"))
+                        )
+                        self.rate_limiter.feedback(host, 200)
+
+                        articles = self._extract_pubmed_articles(driver, driver)
+
+                    except TimeoutException:
+                        # Sayfa yüklendi ama liste yok: doğrulama sayfası değilse sonuçsuz sorgudur ve
+                        # boş liste olarak (negatif) önbelleğe yazılır; doğrulama sayfası hata sayılır
+                        challenge = self._is_challenge_page(driver)
+                        self.rate_limiter.feedback(host, None if challenge else 200, challenge=challenge)
+                        self._count_timeout("PubMed")
+                        if challenge:
+                            logger.warning(f"PubMed {icd_code} için doğrulama sayfası döndürdü, hız düşürüldü")
+                            return None
+                        logger.warning(f"PubMed için {icd_code} arama sonuçları bulunamadı")
+                        articles = []
+
+            # Özet ve DOI'leri sürücü havuza döndükten sonra tek istekle tamamla
+            if self.pubmed_batch_details and articles:
+                self._fill_pubmed_details(icd_code, articles)
 
         except Exception as e:
+            self._count_timeout("PubMed", e)
             logger.error(f"PubMed scraping hatası {icd_code}: {e}")
-        finally:
-            if driver:
-                driver.quit()
+            return None
 
         return articles
 
-    def _extract_pubmed_article_data(self, element, driver) -> Optional[Dict]:
-        """PubMed makale verilerini çıkarır"""
+    def _pubmed_id(self, url: Optional[str]) -> Optional[str]:
+        """PubMed makale URL'sinden PMID'yi çıkarır"""
+        match = re.search(r'/(\d+)/?(?:[?#].*)?$', url or "")
+        return match.group(1) if match else None
+
+    def _parse_pubmed_efetch(self, content: bytes) -> Dict[str, Dict]:
+        """E-utilities efetch XML yanıtından PMID başına özet ve DOI çıkarır"""
+        details = {}
+        root = ET.fromstring(content)
+
+        for article in root.iter("PubmedArticle"):
+            pmid = article.findtext("MedlineCitation/PMID")
+            if not pmid:
+                continue
+
+            # Bölümlü özetler etiketleriyle birleştirilir
+            sections = []
+            for text_elem in article.iterfind("MedlineCitation/Article/Abstract/AbstractText"):
+                text = "".join(text_elem.itertext()).strip()
+                label = text_elem.get("Label")
+                if text:
+                    sections.append(f"{label}: {text}" if label else text)
+
+            doi = None
+            for id_elem in article.iterfind("PubmedData/ArticleIdList/ArticleId"):
+                if id_elem.get("IdType") == "doi" and id_elem.text:
+                    doi = id_elem.text.strip()
+                    break
+            if doi is None:
+                for loc_elem in article.iterfind("MedlineCitation/Article/ELocationID"):
+                    if loc_elem.get("EIdType") == "doi" and loc_elem.text:
+                        doi = loc_elem.text.strip()
+                        break
+
+            details[pmid.strip()] = {
+                "abstract": "\n".join(sections) or None,
+                "doi": doi
+            }
+
+        return details
+
+    def _fetch_pubmed_details(self, pmids: List[str]) -> Dict[str, Dict]:
+        """Verilen PMID'lerin özet ve DOI bilgilerini tek efetch isteğiyle getirir"""
+        params = {
+            "db": "pubmed",
+            "id": ",".join(pmids),
+            "retmode": "xml"
+        }
+        if self.ncbi_api_key:
+            params["api_key"] = self.ncbi_api_key
+
+        headers = {
+            "User-Agent": self.get_random_user_agent()
+        }
+
+        with self.metrics.timer("stage_latency_seconds", stage="pubmed_efetch"):
+            response = self._rate_limited_get(self.PUBMED_EFETCH_URL, params=params, headers=headers, timeout=30)
+            response.raise_for_status()
+            return self._parse_pubmed_efetch(response.content)
+
+    def _fill_pubmed_details(self, icd_code: str, articles: List[Dict]):
+        """Makalelerin özet ve DOI alanlarını toplu istekle doldurur; istek başarısızsa detay sayfalarına döner"""
+        # Depoda özeti bulunan makaleler için detay isteği atlanır
+        if self.article_store is not None:
+            known = self.article_store.lookup_urls([article["url"] for article in articles])
+            for article in articles:
+                stored = known.get(article["url"])
+                if stored and stored.get("abstract"):
+                    article["abstract"] = stored["abstract"]
+                    article["doi"] = stored.get("doi")
+            articles = [article for article in articles if article["url"] not in known
+                        or not known[article["url"]].get("abstract")]
+            reused = len(known) - sum(1 for article in articles if article["url"] in known)
+            if reused:
+                with self._stats_lock:
+                    self.article_store.stats["reused_details"] += reused
+            if not articles:
+                return
+
+        by_pmid = {}
+        for article in articles:
+            pmid = self._pubmed_id(article["url"])
+            if pmid:
+                by_pmid[pmid] = article
+
+        try:
+            details = self._fetch_pubmed_details(list(by_pmid)) if by_pmid else {}
+        except Exception as e:
+            logger.warning(f"PubMed toplu özet isteği başarısız {icd_code}: {e}, detay sayfalarına dönülüyor")
+            if self.static_fetch:
+                for article in articles:
+                    article["abstract"], article["doi"] = self._fetch_pubmed_detail_page_static(article["url"])
+                return
+            with self.driver_pool.driver() as driver:
+                for article in articles:
+                    article["abstract"], article["doi"] = self._fetch_pubmed_detail_page(driver, article["url"])
+            return
+
+        for pmid, article in by_pmid.items():
+            detail = details.get(pmid)
+            if detail:
+                article["abstract"] = detail["abstract"]
+                article["doi"] = detail["doi"]
+
+    def _fetch_pubmed_detail_page(self, driver, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Makalenin detay sayfasını yeni sekmede açıp (özet, DOI) döndürür"""
+        abstract = None
+        doi = None
+        try:
+            # Detay sayfasına git
+            self.rate_limiter.acquire(urlsplit(url).netloc)
+            driver.execute_script(f"window.open('{url}', '_blank');")
+            driver.switch_to.window(driver.window_handles[1])
+
+            # Abstract'ı bekle
+            abstract_elem = WebDriverWait(driver, 5).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "abstract-content"))
+            )
+            abstract = abstract_elem.text.strip()
+
+            # DOI'yi bul
+            try:
+                doi_elem = driver.find_element(By.CSS_SELECTOR, "[data-ga-action='DOI']")
+                doi = doi_elem.text.strip()
+            except NoSuchElementException:
+                pass
+
+            # Pencereyi kapat
+            driver.close()
+            driver.switch_to.window(driver.window_handles[0])
+
+        except Exception:
+            if len(driver.window_handles) > 1:
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+
+        return abstract, doi
+
+    def _fetch_pubmed_detail_page_static(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Makalenin detay sayfasını tarayıcısız okuyup (özet, DOI) döndürür"""
+        abstract = None
+        doi = None
+        try:
+            headers = {
+                "User-Agent": self.get_random_user_agent()
+            }
+            response = self._rate_limited_get(url, check_challenge=True, headers=headers, timeout=15)
+            response.raise_for_status()
+            page = StaticHTMLElement.parse(response.content, response.url)
+
+            abstract = page.find_element(By.CLASS_NAME, "abstract-content").text.strip()
+
+            # DOI'yi bul
+            try:
+                doi = page.find_element(By.CSS_SELECTOR, "[data-ga-action='DOI']").text.strip()
+            except NoSuchElementException:
+                pass
+
+        except Exception:
+            pass
+
+        return abstract, doi
+
+    def _extract_pubmed_article_data(self, element, driver, fetch_details: bool = True) -> Optional[Dict]:
+        """PubMed makale verilerini çıkarır (fetch_details=False ise detay sayfası açılmaz, driver=None ise tarayıcısız okunur)"""
         try:
             # Başlık
             title_elem = element.find_element(By.CLASS_NAME, "docsum-title")
@@ -172,32 +2561,17 @@ class ICDArticleScraper:
             # Abstract (detay sayfasından)
             abstract = None
             doi = None
-            try:
-                # Detay sayfasına git
-                driver.execute_script(f"window.open('{url}', '_blank');")
-                driver.switch_to.window(driver.window_handles[1])
-
-                # Abstract'ı bekle
-                abstract_elem = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "abstract-content"))
-                )
-                abstract = abstract_elem.text.strip()
-
-                # DOI'yi bul
-                try:
-                    doi_elem = driver.find_element(By.CSS_SELECTOR, "[data-ga-action='DOI']")
-                    doi = doi_elem.text.strip()
-                except NoSuchElementException:
-                    pass
-
-                # Pencereyi kapat
-                driver.close()
-                driver.switch_to.window(driver.window_handles[0])
-
-            except Exception:
-                if len(driver.window_handles) > 1:
-                    driver.close()
-                    driver.switch_to.window(driver.window_handles[0])
+            if fetch_details:
+                # Başka bir kod için daha önce alınmış özet varsa detay sayfası açılmaz
+                stored = self.article_store.lookup_urls([url]).get(url) if self.article_store is not None else None
+                if stored and stored.get("abstract"):
+                    abstract, doi = stored["abstract"], stored.get("doi")
+                    with self._stats_lock:
+                        self.article_store.stats["reused_details"] += 1
+                elif driver is None:
+                    abstract, doi = self._fetch_pubmed_detail_page_static(url)
+                else:
+                    abstract, doi = self._fetch_pubmed_detail_page(driver, url)
 
             return {
                 "title": title,
@@ -216,48 +2590,81 @@ class ICDArticleScraper:
 
     def scrape_google_scholar(self, icd_code: str, disease_name: str) -> List[Dict]:
         """Google Scholar'dan makale toplar"""
+        return self._cached_scrape(
+            "Google Scholar",
+            self._search_query(icd_code, disease_name),
+            {"max_results": 10},
+            partial(self._fetch_google_scholar, icd_code, disease_name)
+        )
+
+    def _extract_google_scholar_articles(self, page) -> List[Dict]:
+        """Sonuç sayfasındaki ilk 10 Google Scholar makalesini çıkarır (page: sürücü veya StaticHTMLElement)"""
         articles = []
-        driver = None
-
-        try:
-            driver = self.create_driver()
+        article_elements = page.find_elements(By.CLASS_NAME, "gs_r")
 
-            # Google Scholar arama URL'si
-            search_query = f"{icd_code} {disease_name}" if disease_name else icd_code
-            url = f"https://scholar.google.com/scholar?q={search_query}"
+        for element in article_elements[:10]:  # İlk 10 makaleyi al
+            try:
+                article_data = self._extract_google_scholar_article_data(element)
+                if article_data:
+                    articles.append(article_data)
+            except Exception as e:
+                logger.warning(f"Google Scholar makale çıkarma hatası: {e}")
+                continue
 
-            driver.get(url)
-            self.wait_random(3, 6)
+        return articles
 
-            # Makale elementlerini bekle
-            wait = WebDriverWait(driver, 10)
+    def _fetch_google_scholar(self, icd_code: str, disease_name: str) -> Optional[List[Dict]]:
+        """Google Scholar arama sayfasını okur; sonuçsuz sorguda boş liste, hata veya doğrulama sayfasında None döndürür"""
+        articles = None
+        search_query = f"{icd_code} {disease_name}" if disease_name else icd_code
 
-            try:
-                # Sonuçları bekle
-                results_container = wait.until(
-                    EC.presence_of_element_located((By.ID, "gs_res_ccl_mid"))
+        try:
+            # Sunucuda oluşturulan sonuç listesi tarayıcısız okunur
+            if self.static_fetch:
+                page = self._fetch_static_page(
+                    "Google Scholar", self.GOOGLE_SCHOLAR_SEARCH_URL, {"q": search_query},
+                    (By.ID, "gs_res_ccl_mid"),
+                    no_results_markers=self.GOOGLE_SCHOLAR_NO_RESULTS_MARKERS
                 )
+                if page is not None:
+                    articles = self._extract_google_scholar_articles(page)
 
-                # Makale elementlerini bul
-                article_elements = driver.find_elements(By.CLASS_NAME, "gs_r")
+            if articles is None:
+                # Havuzdan sürücü ödünç al
+                with self.driver_pool.driver() as driver:
+                    # Google Scholar arama URL'si
+                    url = f"{self.GOOGLE_SCHOLAR_SEARCH_URL}?q={search_query}"
+                    host = urlsplit(url).netloc
 
-                for element in article_elements[:10]:  # İlk 10 makaleyi al
-                    try:
-                        article_data = self._extract_google_scholar_article_data(element)
-                        if article_data:
-                            articles.append(article_data)
-                    except Exception as e:
-                        logger.warning(f"Google Scholar makale çıkarma hatası: {e}")
-                        continue
+                    self._load_page(driver, url)
 
-            except TimeoutException:
-                logger.warning(f"Google Scholar için {icd_code} arama sonuçları bulunamadı")
+                    # Makale elementlerini bekle
+                    wait = WebDriverWait(driver, 10)
+
+                    try:
+                        # Sonuçları bekle
+                        results_container = wait.until(
+                            EC.presence_of_element_located((By.ID, "gs_res_ccl_mid"))
+                        )
+                        self.rate_limiter.feedback(host, 200)
+
+                        articles = self._extract_google_scholar_articles(driver)
+
+                    except TimeoutException:
+                        # Doğrulama sayfası değilse sonuçsuz sorgu: boş liste negatif önbelleğe yazılır
+                        challenge = self._is_challenge_page(driver)
+                        self.rate_limiter.feedback(host, None if challenge else 200, challenge=challenge)
+                        self._count_timeout("Google Scholar")
+                        if challenge:
+                            logger.warning(f"Google Scholar {icd_code} için CAPTCHA döndürdü, hız düşürüldü")
+                            return None
+                        logger.warning(f"Google Scholar için {icd_code} arama sonuçları bulunamadı")
+                        articles = []
 
         except Exception as e:
+            self._count_timeout("Google Scholar", e)
             logger.error(f"Google Scholar scraping hatası {icd_code}: {e}")
-        finally:
-            if driver:
-                driver.quit()
+            return None
 
         return articles
 
@@ -320,187 +2727,341 @@ class ICDArticleScraper:
             logger.warning(f"Google Scholar makale veri çıkarma hatası: {e}")
             return None
 
-    def scrape_semantic_scholar(self, icd_code: str, disease_name: str) -> List[Dict]:
-        """Semantic Scholar'dan makale toplar"""
+    def _search_query(self, icd_code: str, disease_name: str) -> str:
+        """Arama sorgusunu oluşturur"""
+        return f"{icd_code} {disease_name}" if disease_name else icd_code
+
+    def _semantic_scholar_params(self, icd_code: str, disease_name: str) -> Dict:
+        """Semantic Scholar API parametrelerini döndürür"""
+        return {
+            "query": self._search_query(icd_code, disease_name),
+            "limit": 10,
+            "fields": "title,authors,year,venue,abstract,url,externalIds"
+        }
+
+    def _parse_semantic_scholar_papers(self, data: Dict) -> List[Dict]:
+        """Semantic Scholar API yanıtını makale listesine çevirir"""
         articles = []
 
-        try:
-            # Semantic Scholar API kullan
-            search_query = f"{icd_code} {disease_name}" if disease_name else icd_code
-            url = f"https://api.semanticscholar.org/graph/v1/paper/search"
+        for paper in data.get("data", []):
+            try:
+                authors = [author.get("name", "") for author in paper.get("authors", [])]
 
-            params = {
-                "query": search_query,
-                "limit": 10,
-                "fields": "title,authors,year,venue,abstract,url,externalIds"
-            }
+                # DOI'yi bul
+                doi = None
+                external_ids = paper.get("externalIds", {})
+                if external_ids and "DOI" in external_ids:
+                    doi = external_ids["DOI"]
+
+                article_data = {
+                    "title": paper.get("title", ""),
+                    "authors": authors,
+                    "publication_date": str(paper.get("year", "")) if paper.get("year") else None,
+                    "journal_or_conference": paper.get("venue", ""),
+                    "source": "Semantic Scholar",
+                    "url": paper.get("url", ""),
+                    "abstract": paper.get("abstract", ""),
+                    "doi": doi
+                }
+
+                articles.append(article_data)
+
+            except Exception as e:
+                logger.warning(f"Semantic Scholar makale işleme hatası: {e}")
+                continue
+
+        return articles
 
+    def scrape_semantic_scholar(self, icd_code: str, disease_name: str) -> List[Dict]:
+        """Semantic Scholar'dan makale toplar"""
+        params = self._semantic_scholar_params(icd_code, disease_name)
+        return self._cached_scrape(
+            "Semantic Scholar",
+            params["query"],
+            params,
+            partial(self._fetch_semantic_scholar, icd_code, params)
+        )
+
+    def _fetch_semantic_scholar(self, icd_code: str, params: Dict) -> Optional[List[Dict]]:
+        """Semantic Scholar API'sini çağırır; hata durumunda None döndürür"""
+        try:
+            # Semantic Scholar API kullan
             headers = {
                 "User-Agent": self.get_random_user_agent()
             }
 
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            self.wait_random(1, 3)
+            response = self._rate_limited_get(
+                self.SEMANTIC_SCHOLAR_API_URL,
+                params=params,
+                headers=headers,
+                timeout=30
+            )
 
             if response.status_code == 200:
-                data = response.json()
+                return self._parse_semantic_scholar_papers(response.json())
 
-                for paper in data.get("data", []):
-                    try:
-                        authors = [author.get("name", "") for author in paper.get("authors", [])]
-
-                        # DOI'yi bul
-                        doi = None
-                        external_ids = paper.get("externalIds", {})
-                        if external_ids and "DOI" in external_ids:
-                            doi = external_ids["DOI"]
-
-                        article_data = {
-                            "title": paper.get("title", ""),
-                            "authors": authors,
-                            "publication_date": str(paper.get("year", "")) if paper.get("year") else None,
-                            "journal_or_conference": paper.get("venue", ""),
-                            "source": "Semantic Scholar",
-                            "url": paper.get("url", ""),
-                            "abstract": paper.get("abstract", ""),
-                            "doi": doi
-                        }
-
-                        articles.append(article_data)
+            logger.warning(f"Semantic Scholar {icd_code} için HTTP {response.status_code} döndürdü")
 
-                    except Exception as e:
-                        logger.warning(f"Semantic Scholar makale işleme hatası: {e}")
-                        continue
+        except Exception as e:
+            self._count_timeout("Semantic Scholar", e)
+            logger.error(f"Semantic Scholar scraping hatası {icd_code}: {e}")
+
+        return None
+
+    async def scrape_semantic_scholar_async(self, icd_code: str, disease_name: str) -> List[Dict]:
+        """Semantic Scholar'dan asenkron HTTP motoru ile makale toplar"""
+        params = self._semantic_scholar_params(icd_code, disease_name)
+        return await self._cached_scrape_async(
+            "Semantic Scholar",
+            params["query"],
+            params,
+            partial(self._fetch_semantic_scholar_async, icd_code, params)
+        )
+
+    async def _fetch_semantic_scholar_async(self, icd_code: str, params: Dict) -> Optional[List[Dict]]:
+        """Semantic Scholar API'sini asenkron çağırır; hata durumunda None döndürür"""
+        try:
+            headers = {
+                "User-Agent": self.get_random_user_agent()
+            }
+
+            status, body = await self.async_engine.get(
+                self.SEMANTIC_SCHOLAR_API_URL,
+                params=params,
+                headers=headers
+            )
+
+            if status == 200:
+                return self._parse_semantic_scholar_papers(json.loads(body))
+
+            logger.warning(f"Semantic Scholar {icd_code} için HTTP {status} döndürdü")
 
         except Exception as e:
+            self._count_timeout("Semantic Scholar", e)
             logger.error(f"Semantic Scholar scraping hatası {icd_code}: {e}")
 
+        return None
+
+    def _arxiv_params(self, icd_code: str, disease_name: str) -> Dict:
+        """ArXiv API parametrelerini döndürür"""
+        return {
+            "search_query": f"all:{self._search_query(icd_code, disease_name)}",
+            "start": 0,
+            "max_results": 10
+        }
+
+    def _parse_arxiv_feed(self, content: bytes) -> List[Dict]:
+        """ArXiv Atom XML yanıtını makale listesine çevirir"""
+        articles = []
+        root = ET.fromstring(content)
+
+        # Namespace tanımla
+        ns = {"atom": "http://www.w3.org/2005/Atom"}
+
+        entries = root.findall(".//atom:entry", ns)
+
+        for entry in entries:
+            try:
+                title = entry.find("atom:title", ns).text.strip()
+
+                # Yazarları topla
+                authors = []
+                for author in entry.findall("atom:author", ns):
+                    name = author.find("atom:name", ns)
+                    if name is not None:
+                        authors.append(name.text.strip())
+
+                # Tarih
+                published = entry.find("atom:published", ns)
+                pub_date = published.text[:4] if published is not None else None
+
+                # URL
+                url = entry.find("atom:id", ns).text.strip()
+
+                # Abstract
+                abstract_elem = entry.find("atom:summary", ns)
+                abstract = abstract_elem.text.strip() if abstract_elem is not None else None
+
+                article_data = {
+                    "title": title,
+                    "authors": authors,
+                    "publication_date": pub_date,
+                    "journal_or_conference": "ArXiv",
+                    "source": "ArXiv",
+                    "url": url,
+                    "abstract": abstract,
+                    "doi": None
+                }
+
+                articles.append(article_data)
+
+            except Exception as e:
+                logger.warning(f"ArXiv makale işleme hatası: {e}")
+                continue
+
         return articles
 
     def scrape_arxiv(self, icd_code: str, disease_name: str) -> List[Dict]:
         """ArXiv'den makale toplar"""
-        articles = []
-
+        params = self._arxiv_params(icd_code, disease_name)
+        return self._cached_scrape(
+            "ArXiv",
+            params["search_query"],
+            params,
+            partial(self._fetch_arxiv, icd_code, params)
+        )
+
+    def _fetch_arxiv(self, icd_code: str, params: Dict) -> Optional[List[Dict]]:
+        """ArXiv API'sini çağırır; hata durumunda None döndürür"""
         try:
             # ArXiv API kullan
-            search_query = f"{icd_code} {disease_name}" if disease_name else icd_code
-            url = f"http://export.arxiv.org/api/query"
-
-            params = {
-                "search_query": f"all:{search_query}",
-                "start": 0,
-                "max_results": 10
-            }
-
             headers = {
                 "User-Agent": self.get_random_user_agent()
             }
 
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            self.wait_random(1, 3)
+            response = self._rate_limited_get(
+                self.ARXIV_API_URL,
+                params=params,
+                headers=headers,
+                timeout=30
+            )
 
             if response.status_code == 200:
                 # XML yanıtını işle
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.content)
+                return self._parse_arxiv_feed(response.content)
 
-                # Namespace tanımla
-                ns = {"atom": "http://www.w3.org/2005/Atom"}
+            logger.warning(f"ArXiv {icd_code} için HTTP {response.status_code} döndürdü")
 
-                entries = root.findall(".//atom:entry", ns)
+        except Exception as e:
+            self._count_timeout("ArXiv", e)
+            logger.error(f"ArXiv scraping hatası {icd_code}: {e}")
 
-                for entry in entries:
-                    try:
-                        title = entry.find("atom:title", ns).text.strip()
-
-                        # Yazarları topla
-                        authors = []
-                        for author in entry.findall("atom:author", ns):
-                            name = author.find("atom:name", ns)
-                            if name is not None:
-                                authors.append(name.text.strip())
-
-                        # Tarih
-                        published = entry.find("atom:published", ns)
-                        pub_date = published.text[:4] if published is not None else None
-
-                        # URL
-                        url = entry.find("atom:id", ns).text.strip()
-
-                        # Abstract
-                        abstract_elem = entry.find("atom:summary", ns)
-                        abstract = abstract_elem.text.strip() if abstract_elem is not None else None
-
-                        article_data = {
-                            "title": title,
-                            "authors": authors,
-                            "publication_date": pub_date,
-                            "journal_or_conference": "ArXiv",
-                            "source": "ArXiv",
-                            "url": url,
-                            "abstract": abstract,
-                            "doi": None
-                        }
-
-                        articles.append(article_data)
+        return None
 
-                    except Exception as e:
-                        logger.warning(f"ArXiv makale işleme hatası: {e}")
-                        continue
+    async def scrape_arxiv_async(self, icd_code: str, disease_name: str) -> List[Dict]:
+        """ArXiv'den asenkron HTTP motoru ile makale toplar"""
+        params = self._arxiv_params(icd_code, disease_name)
+        return await self._cached_scrape_async(
+            "ArXiv",
+            params["search_query"],
+            params,
+            partial(self._fetch_arxiv_async, icd_code, params)
+        )
+
+    async def _fetch_arxiv_async(self, icd_code: str, params: Dict) -> Optional[List[Dict]]:
+        """ArXiv API'sini asenkron çağırır; hata durumunda None döndürür"""
+        try:
+            headers = {
+                "User-Agent": self.get_random_user_agent()
+            }
+
+            status, body = await self.async_engine.get(
+                self.ARXIV_API_URL,
+                params=params,
+                headers=headers
+            )
+
+            if status == 200:
+                return self._parse_arxiv_feed(body)
+
+            logger.warning(f"ArXiv {icd_code} için HTTP {status} döndürdü")
 
         except Exception as e:
+            self._count_timeout("ArXiv", e)
             logger.error(f"ArXiv scraping hatası {icd_code}: {e}")
 
-        return articles
+        return None
 
     def scrape_all_sources(self, icd_code: str, disease_name: str) -> List[Dict]:
         """Tüm kaynaklardan paralel olarak makale toplar"""
+        results = self.scheduler.submit(icd_code, disease_name).result()
+        return self._merge_source_results(results)
+
+    def _merge_source_results(self, results: Dict[str, List[Dict]]) -> List[Dict]:
+        """
+        Kaynak sonuçlarını birleştirir: aynı makale (DOI veya başlık + yıl) tek kayda indirilir,
+        eksik alanlar diğer kaynaklardan doldurulur. Kaynak istatistiklerini günceller.
+        """
         all_articles = []
 
-        # Paralel scraping
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {
-                executor.submit(self.scrape_pubmed, icd_code, disease_name): "PubMed",
-                executor.submit(self.scrape_google_scholar, icd_code, disease_name): "Google Scholar",
-                executor.submit(self.scrape_semantic_scholar, icd_code, disease_name): "Semantic Scholar",
-                executor.submit(self.scrape_arxiv, icd_code, disease_name): "ArXiv"
-            }
+        for source, articles in results.items():
+            all_articles.extend(articles)
+            with self._stats_lock:
+                self.stats["articles_by_source"][source] += len(articles)
+            logger.info(f"{source} - {len(articles)} makale bulundu")
 
-            for future in as_completed(futures):
-                source = futures[future]
-                try:
-                    articles = future.result()
-                    all_articles.extend(articles)
-                    self.stats["articles_by_source"][source] += len(articles)
-                    logger.info(f"{source} - {len(articles)} makale bulundu")
-                except Exception as e:
-                    logger.error(f"{source} scraping hatası: {e}")
+        merged_articles = ArticleMerger.merge(all_articles)
+        merged_count = len(all_articles) - len(merged_articles)
+        if merged_count:
+            with self._stats_lock:
+                self.stats["merged_articles"] += merged_count
+            self.metrics.inc("merged_articles_total", merged_count)
+            logger.info(f"Kaynaklar arası {merged_count} tekrar makale birleştirildi")
 
-        return all_articles
+        return merged_articles
 
-    def save_articles_to_json(self, icd_code: str, disease_name: str, articles: List[Dict]):
-        """Makaleleri JSON dosyasına kaydet"""
+    def save_articles_to_json(self, icd_code: str, disease_name: str, articles: List[Dict]) -> bool:
+        """Makaleleri JSON dosyasına kaydet (yarım dosya kalmaması için geçici dosya üzerinden)"""
         try:
             data = {
                 "icd_code": icd_code,
                 "disease_name": disease_name,
-                "search_timestamp_utc": datetime.utcnow().isoformat() + "Z",
-                "articles": articles
+                "search_timestamp_utc": datetime.utcnow().isoformat() + "Z"
             }
 
+            # Depo modunda makale gövdeleri depoda, kod kaydında yalnızca referanslar tutulur
+            if self.article_store is not None:
+                article_ids = self.article_store.add_many(articles)
+                data["article_refs"] = [
+                    {"article_id": article_id, "rank": rank, "source": article.get("source")}
+                    for rank, (article_id, article) in enumerate(zip(article_ids, articles), 1)
+                    if article_id is not None
+                ]
+            else:
+                data["articles"] = articles
+
+            # JSONL modunda kayıt dönen parçalara eklenir
+            if self.shard_writer is not None:
+                self.shard_writer.write(icd_code, data)
+                logger.info(f"JSONL kaydı eklendi: {icd_code}")
+                return True
+
             filename = f"{icd_code}.json"
             filepath = os.path.join(self.output_dir, filename)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
+            temp_path = filepath + ".tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, filepath)
+
+            self.archive.add(filename)
 
             logger.info(f"JSON dosyası kaydedildi: {filepath}")
+            return True
 
         except Exception as e:
             logger.error(f"JSON kaydetme hatası {icd_code}: {e}")
+            return False
+
+    def has_valid_output(self, icd_code: str) -> bool:
+        """Kod için okunabilir ve beklenen yapıda bir JSON dosyası olup olmadığını kontrol eder"""
+        if self.shard_writer is not None:
+            return self.shard_writer.contains(icd_code)
+
+        filepath = os.path.join(self.output_dir, f"{icd_code}.json")
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return str(data.get("icd_code")) == str(icd_code) and (
+                isinstance(data.get("articles"), list) or isinstance(data.get("article_refs"), list)
+            )
+        except (OSError, ValueError):
+            return False
 
     def create_zip_archive(self):
-        """Toplanan verileri ZIP arşivine koy"""
+        """Toplanan verileri ZIP arşivine koy (tüm arşivi baştan oluşturur)"""
         try:
             # Geçici klasör yapısı oluştur
             temp_dir = "temp_archive"
@@ -541,48 +3102,278 @@ class ICDArticleScraper:
                     f.write(f"{code}\n")
             logger.info(f"Başarısız kodlar kaydedildi: failed_codes.txt")
 
-    def process_icd_codes(self, df: pd.DataFrame):
-        """Ana işlem fonksiyonu"""
-        self.stats["total_codes"] = len(df)
+    def _record_failure(self, icd_code: str, error: str):
+        """Başarısız kodu istatistiklere ve ilerleme günlüğüne işler"""
+        with self._stats_lock:
+            self.failed_codes.append(icd_code)
+            self.stats["failed_codes"] += 1
+        self.metrics.inc("codes_total", status="failed")
+        self.journal.record(icd_code, "failed", error)
+
+    def _on_code_done(self, icd_code: str, disease_name: str, pbar, submitted: float, future: Future) -> bool:
+        """Bir kodun tüm kaynakları bittiğinde sonuçları kaydeder; başarılıysa True döndürür"""
+        ok = False
+        try:
+            articles = self._merge_source_results(future.result())
 
-        # İlerleme çubuğu
-        pbar = tqdm(total=len(df), desc="ICD kodları işleniyor")
+            # JSON'a kaydet
+            with self.metrics.timer("stage_latency_seconds", stage="save_json"):
+                saved = self.save_articles_to_json(icd_code, disease_name, articles)
+            if not saved:
+                raise IOError("JSON dosyası yazılamadı")
+            self.journal.record(icd_code, "done")
+
+            # İstatistikleri güncelle
+            with self._stats_lock:
+                self.stats["processed_codes"] += 1
+                self.stats["total_articles"] += len(articles)
+                processed = self.stats["processed_codes"]
+
+            self.metrics.inc("codes_total", status="done")
+            self.metrics.observe("stage_latency_seconds", time.monotonic() - submitted, stage="code_total")
+            logger.info(f"İşlenen Kod: {icd_code} - {len(articles)} makale bulundu. ({processed}/{self.stats['total_codes']})")
+
+            # Her 10 kodda bir ZIP'e yeni dosyaları ekle
+            if processed % 10 == 0:
+                with self.metrics.timer("stage_latency_seconds", stage="archive_checkpoint"):
+                    self.archive.checkpoint()
+                logger.info(f"Ara kayıt: {processed} kod işlendi")
+            ok = True
+
+        except Exception as e:
+            logger.error(f"Kod işleme hatası {icd_code}: {e}")
+            self._record_failure(icd_code, str(e))
+
+        pbar.update(1)
+        return ok
+
+    def _on_queue_code_done(self, work_queue: WorkQueue, icd_code: str, disease_name: str,
+                            pbar, submitted: float, future: Future):
+        """Kuyruk modunda sonucu kaydeder ve kodu kuyrukta tamamlar veya yeniden denemeye bırakır"""
+        if self._on_code_done(icd_code, disease_name, pbar, submitted, future):
+            work_queue.complete(icd_code)
+            return
+
+        error = self.journal.state.get(str(icd_code), {}).get("error") or "bilinmeyen hata"
+        self._requeue_failure(work_queue, icd_code, error)
+
+    def _requeue_failure(self, work_queue: WorkQueue, icd_code: str, error: str):
+        """Başarısız kodu kuyruğa bildirir; deneme hakkı kalan kod başarısız sayılmaz, kuyruk onu yeniden dağıtır"""
+        if not work_queue.fail(icd_code, error):
+            with self._stats_lock:
+                self.failed_codes.remove(icd_code)
+                self.stats["failed_codes"] -= 1
+                self.stats["retried_codes"] += 1
+
+    def _pending_codes(self, df: pd.DataFrame) -> List[Tuple[str, str]]:
+        """Geçerli JSON çıktısı olan kodları atlayarak işlenecek kodları döndürür"""
+        pending = []
 
         for index, row in df.iterrows():
             icd_code = row['icd_code']
             disease_name = row.get('disease_name', '')
 
+            # Günlükte tamamlanmış görünse bile dosya doğrulanır
+            if self.has_valid_output(icd_code):
+                filename = f"{icd_code}.json"
+                if self.shard_writer is None and not self.archive.contains(filename):
+                    self.archive.add(filename)
+                continue
+
+            if self.journal.status(icd_code) == "failed":
+                logger.info(f"Önceki çalışmada başarısız olan kod yeniden denenecek: {icd_code}")
+
+            pending.append((icd_code, disease_name))
+
+        return pending
+
+    def _run_codes(self, codes: List[Tuple[str, str]], pbar):
+        """Kodları zamanlayıcıya verir ve hepsi bitene kadar bekler"""
+        # Kodlar zamanlayıcıya sırayla verilir, aynı anda birden çok kod işlenir
+        for icd_code, disease_name in codes:
             try:
                 logger.info(f"İşlenen Kod: {icd_code} - {disease_name}")
+                self.journal.record(icd_code, "started")
+                submitted = time.monotonic()
+                future = self.scheduler.submit(icd_code, disease_name)
+                future.add_done_callback(partial(self._on_code_done, icd_code, disease_name, pbar, submitted))
 
-                # Tüm kaynaklardan makale topla
-                articles = self.scrape_all_sources(icd_code, disease_name)
+            except Exception as e:
+                logger.error(f"Kod işleme hatası {icd_code}: {e}")
+                self._record_failure(icd_code, str(e))
+                pbar.update(1)
 
-                # JSON'a kaydet
-                self.save_articles_to_json(icd_code, disease_name, articles)
+        # Uçuştaki tüm kodların bitmesini bekle
+        self.scheduler.join()
 
-                # İstatistikleri güncelle
-                self.stats["processed_codes"] += 1
-                self.stats["total_articles"] += len(articles)
+    def process_icd_codes(self, df: pd.DataFrame):
+        """Ana işlem fonksiyonu"""
+        self.stats["total_codes"] = len(df)
+
+        # Önceki çalışmanın ilerleme günlüğünü aç
+        self.journal = ProgressJournal(self.journal_path)
+        pending = self._pending_codes(df)
+        self.stats["skipped_codes"] = len(df) - len(pending)
+        if self.stats["skipped_codes"]:
+            logger.info(f"Daha önce tamamlanan {self.stats['skipped_codes']} kod atlanıyor")
 
-                logger.info(f"İşlenen Kod: {icd_code} - {len(articles)} makale bulundu. ({self.stats['processed_codes']}/{self.stats['total_codes']})")
+        # İlerleme çubuğu
+        pbar = tqdm(total=len(df), initial=self.stats["skipped_codes"], desc="ICD kodları işleniyor")
+
+        # Uzun çalışmalarda metrikler belirli aralıklarla dosyaya yazılır
+        if self.metrics_json_path:
+            self.metrics.start_exporter(
+                self.metrics_interval, self.metrics_json_path, self.metrics_prometheus_path
+            )
+
+        self._run_codes(pending, pbar)
+
+        # Başarısız kodları artan bekleme süreleriyle yeniden dene
+        for attempt in range(1, self.max_retries + 1):
+            failed = set(self.failed_codes)
+            retry = [(code, name) for code, name in pending if code in failed]
+            if not retry:
+                break
+
+            delay = self.retry_backoff * (2 ** (attempt - 1))
+            logger.info(f"{len(retry)} başarısız kod {delay:.0f} sn sonra yeniden denenecek ({attempt}/{self.max_retries})")
+            time.sleep(delay)
+
+            with self._stats_lock:
+                self.failed_codes = [code for code in self.failed_codes if code not in failed]
+                self.stats["failed_codes"] -= len(retry)
+                self.stats["retried_codes"] += len(retry)
+
+            pbar.total += len(retry)
+            pbar.refresh()
+            self._run_codes(retry, pbar)
+
+        return self._finish_run(pbar)
+
+    def process_work_queue(self, queue_path: str, df: Optional[pd.DataFrame] = None,
+                           lease_seconds: float = 600, lease_batch_size: int = 4, idle_wait: float = 5):
+        """
+        Kuyruk modu: kodları paylaşılan WorkQueue'dan kiralayarak işler. Aynı kuyruğa bağlanan
+        süreç/makine sayısı arttıkça toplama hızı artar. df verilirse kodları kuyruğa ekler
+        (zaten olanlar atlanır), böylece her çalışan aynı CSV ile başlatılabilir.
+        Kuyrukta bitmemiş kod kalmayınca çalışanın arşivini kuyruğa kaydedip döndürür;
+        kayıtlı arşivler merge_queue_archives ile birleştirilir.
+        """
+        if self.worker_id is None:
+            raise ValueError("Kuyruk modu için worker_id gerekli (ICDArticleScraper.default_worker_id())")
+
+        work_queue = WorkQueue(
+            queue_path,
+            lease_seconds=lease_seconds,
+            max_attempts=self.max_retries + 1,
+            retry_backoff=self.retry_backoff
+        )
+        self.stats["work_queue"] = work_queue.stats
+        if df is not None:
+            added = work_queue.enqueue(
+                [(row['icd_code'], row.get('disease_name', '')) for _, row in df.iterrows()]
+            )
+            logger.info(f"Kuyruğa {added} yeni kod eklendi ({work_queue.path})")
+
+        self.journal = ProgressJournal(self.journal_path)
+        pbar = tqdm(desc=f"ICD kodları işleniyor ({self.worker_id})")
+
+        if self.metrics_json_path:
+            self.metrics.start_exporter(
+                self.metrics_interval, self.metrics_json_path, self.metrics_prometheus_path
+            )
+
+        # Uzun süren kodların kirası işlenirken düzenli olarak yenilenir
+        stop_renewal = threading.Event()
+
+        def renew_leases():
+            while not stop_renewal.wait(lease_seconds / 3):
+                try:
+                    work_queue.renew(self.worker_id)
+                except sqlite3.Error as e:
+                    logger.warning(f"Kira yenileme hatası: {e}")
 
-                # Her 10 kodda bir ZIP oluştur
-                if self.stats["processed_codes"] % 10 == 0:
-                    self.create_zip_archive()
-                    logger.info(f"Ara kayıt: {self.stats['processed_codes']} kod işlendi")
+        renewal = threading.Thread(target=renew_leases, name="LeaseRenewal", daemon=True)
+        renewal.start()
 
-            except Exception as e:
-                logger.error(f"Kod işleme hatası {icd_code}: {e}")
-                self.failed_codes.append(icd_code)
-                self.stats["failed_codes"] += 1
+        try:
+            while True:
+                leased = work_queue.lease(self.worker_id, lease_batch_size)
+                if not leased:
+                    # Başka çalışanların kirasındaki kodlar bitene veya kiraları dolana kadar bekle
+                    self.scheduler.join()
+                    if work_queue.remaining() == 0:
+                        break
+                    time.sleep(idle_wait)
+                    continue
+
+                for icd_code, disease_name in leased:
+                    with self._stats_lock:
+                        self.stats["total_codes"] += 1
+                    pbar.total = self.stats["total_codes"]
+
+                    # Aynı çalışanın önceki çalışmasından kalan geçerli çıktı yeniden toplanmaz
+                    if self.has_valid_output(icd_code):
+                        with self._stats_lock:
+                            self.stats["skipped_codes"] += 1
+                        work_queue.complete(icd_code)
+                        pbar.update(1)
+                        continue
+
+                    try:
+                        logger.info(f"İşlenen Kod: {icd_code} - {disease_name}")
+                        self.journal.record(icd_code, "started")
+                        submitted = time.monotonic()
+                        future = self.scheduler.submit(icd_code, disease_name)
+                        future.add_done_callback(partial(
+                            self._on_queue_code_done, work_queue, icd_code, disease_name, pbar, submitted
+                        ))
+                    except Exception as e:
+                        logger.error(f"Kod işleme hatası {icd_code}: {e}")
+                        self._record_failure(icd_code, str(e))
+                        self._requeue_failure(work_queue, icd_code, str(e))
+                        pbar.update(1)
+        finally:
+            stop_renewal.set()
+            self.scheduler.join()
+
+        try:
+            zip_file = self._finish_run(pbar)
+            if zip_file:
+                work_queue.register_archive(self.worker_id, os.path.abspath(zip_file))
+        finally:
+            work_queue.close()
+
+        return zip_file
 
-            pbar.update(1)
+    def _finish_run(self, pbar) -> Optional[str]:
+        """
+        Kaynak havuzlarını durdurur, depoyu dışa aktarır, arşivi tamamlar ve raporu yazdırır.
+        Tarayıcı havuzu, JSONL yazıcısı ve depolar açık kalır (sonraki çalışma için); close() kapatır.
+        """
+        self.scheduler.shutdown()
+        if self.async_engine is not None:
+            self.async_engine.close()
 
         pbar.close()
+        self.journal.close()
+        if self.metrics_json_path:
+            self.metrics.stop_exporter(self.metrics_json_path, self.metrics_prometheus_path)
+
+        # JSONL modunda etkin parçayı döndür ve indeksi arşive ekle
+        if self.shard_writer is not None:
+            self.shard_writer.flush()
+            self.archive.add(ShardedJSONLWriter.INDEX_FILENAME)
+
+        # Makale deposunu kod kayıtlarının yanına JSONL olarak çıkar
+        if self.article_store is not None:
+            store_dir = self.jsonl_dir if self.shard_writer is not None else self.output_dir
+            exported = self.article_store.export_jsonl(os.path.join(store_dir, ArticleStore.EXPORT_FILENAME))
+            self.archive.add(ArticleStore.EXPORT_FILENAME)
+            logger.info(f"Makale deposu dışa aktarıldı: {exported} tekil makale")
 
         # Nihai ZIP oluştur
-        zip_file = self.create_zip_archive()
+        zip_file = self.archive.finalize()
 
         # Başarısız kodları kaydet
         self.save_failed_codes()
@@ -592,6 +3383,26 @@ class ICDArticleScraper:
 
         return zip_file
 
+    def close(self):
+        """Tarayıcıları, JSONL yazıcısını, depoları ve HTTP oturumlarını kapatır"""
+        self.scheduler.shutdown()
+        if self.async_engine is not None:
+            self.async_engine.close()
+        self.driver_pool.close()
+        if self.shard_writer is not None:
+            self.shard_writer.close()
+        if self.article_store is not None:
+            self.article_store.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+        self.http_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def print_final_report(self):
         """Nihai raporu yazdır"""
         print("\n" + "="*50)
@@ -599,21 +3410,73 @@ class ICDArticleScraper:
         print("="*50)
         print(f"Toplam işlenen ICD kodu sayısı: {self.stats['total_codes']}")
         print(f"Başarıyla işlenen kod sayısı: {self.stats['processed_codes']}")
+        print(f"Önceki çalışmadan atlanan kod sayısı: {self.stats['skipped_codes']}")
+        print(f"Yeniden denenen kod sayısı: {self.stats['retried_codes']}")
         print(f"Başarısız olan kod sayısı: {self.stats['failed_codes']}")
         if self.stats['failed_codes'] > 0:
             print("(failed_codes.txt dosyasına bakınız)")
         print(f"Toplam toplanan makale sayısı: {self.stats['total_articles']}")
+        print(f"Kaynaklar arası birleştirilen tekrar makale: {self.stats['merged_articles']}")
         print("\nKaynak başına toplanan makale sayısı:")
         for source, count in self.stats['articles_by_source'].items():
             print(f"  {source}: {count}")
+        pool_stats = self.stats['driver_pool']
+        print("\nTarayıcı havuzu:")
+        print(f"  Başlatılan sürücü: {pool_stats['created']}")
+        print(f"  Geri dönüştürülen sürücü: {pool_stats['recycled']}")
+        print(f"  Toplam bekleme süresi: {pool_stats['wait_seconds']:.1f} sn")
+        if self.static_fetch:
+            static_stats = self.stats["static_fetch"]
+            print("\nTarayıcısız sayfa okuma:")
+            print(f"  Okunan sonuç sayfası: {static_stats['pages']}")
+            print(f"  Selenium'a düşülen sayfa: {static_stats['browser_fallbacks']}")
+        print("\nKaynak gecikmeleri (p50 / p95 / p99 sn):")
+        for source in self.stats['articles_by_source']:
+            summary = self.metrics.histogram_summary("source_latency_seconds", source=source)
+            if summary:
+                print(f"  {source}: {summary['p50']:.2f} / {summary['p95']:.2f} / {summary['p99']:.2f} "
+                      f"({summary['count']} istek)")
+        if self.stats["rate_limits"]:
+            print("\nHost hız sınırları (istek/sn):")
+            for host, host_stats in self.stats["rate_limits"].items():
+                if host_stats["requests"]:
+                    print(f"  {host}: {host_stats['rate_per_sec']} "
+                          f"({host_stats['requests']} istek, {host_stats['throttled']} kısıtlama)")
+        if "article_store" in self.stats:
+            store_stats = self.stats["article_store"]
+            print("\nMakale deposu:")
+            print(f"  Yeni makale: {store_stats['new']}")
+            print(f"  Başka kodlardan yeniden kullanılan: {store_stats['reused']}")
+            print(f"  Detay isteği atlanan: {store_stats['reused_details']}")
+        if "work_queue" in self.stats:
+            queue_stats = self.stats["work_queue"]
+            print(f"\nİş kuyruğu ({self.worker_id}):")
+            print(f"  Kiralanan kod: {queue_stats['leased']} (süresi dolmuş kiradan: {queue_stats['expired_leases_taken']})")
+            print(f"  Deneme hakkı biten dolmuş kira (başarısız): {queue_stats['expired_leases_failed']}")
+            print(f"  Tamamlanan kod: {queue_stats['completed']}")
+            print(f"  Yeniden kuyruğa bırakılan: {queue_stats['requeued']}")
+        if "cache" in self.stats:
+            cache_stats = self.stats["cache"]
+            print("\nYanıt önbelleği:")
+            print(f"  İsabet: {cache_stats['hits']} (negatif: {cache_stats['negative_hits']})")
+            print(f"  Iskalama: {cache_stats['misses']} (süresi dolan: {cache_stats['expired']})")
+            print(f"  Silinen kayıt: {cache_stats['evictions']}")
         print("="*50)
 
 
 def main():
     """Ana fonksiyon"""
+    # Yalnızca birleştirme modu: toplama yapılmaz, kuyruğa kayıtlı çalışan arşivleri birleştirilir
+    # (ör. UMAI_WORK_QUEUE=/content/drive/.../work_queue.sqlite UMAI_WORK_QUEUE_MODE=merge)
+    if os.environ.get("UMAI_WORK_QUEUE_MODE") == "merge":
+        merged = merge_queue_archives(os.environ["UMAI_WORK_QUEUE"], force=True)
+        if merged:
+            files.download(merged)
+        return
+
     # Kurulum
     print("Gerekli kütüphaneler kuruluyor...")
-    os.system("pip install selenium pandas requests tqdm")
+    os.system("pip install selenium pandas requests tqdm aiohttp")
 
     # ChromeDriver kur
     os.system("apt-get update")
@@ -645,14 +3508,27 @@ def main():
         print(f"CSV okuma hatası: {e}")
         return
 
+    # Birden çok süreç/makine için paylaşılan kuyruk dosyası (ör. bağlı Google Drive'da);
+    # tanımlı değilse tek süreçli çalışılır. Kuyruk bittiğinde çalışan arşivleri birleştirilir.
+    work_queue_path = os.environ.get("UMAI_WORK_QUEUE")
+
     # Scraper'ı başlat
-    scraper = ICDArticleScraper()
+    if work_queue_path:
+        scraper = ICDArticleScraper(worker_id=os.environ.get("UMAI_WORKER_ID") or ICDArticleScraper.default_worker_id())
+    else:
+        scraper = ICDArticleScraper()
 
     print(f"\n{len(df)} ICD kodu için makale toplama işlemi başlatılıyor...")
     print("Bu işlem uzun sürebilir. Lütfen bekleyiniz...\n")
 
-    # İşlemi başlat
-    zip_file = scraper.process_icd_codes(df)
+    # İşlemi başlat (tarayıcılar ve depolar iş bitince kapatılır)
+    with scraper:
+        if work_queue_path:
+            zip_file = scraper.process_work_queue(work_queue_path, df)
+            # Kuyruk bitti: kayıtlı tüm çalışan arşivleri tek arşivde birleştirilir
+            zip_file = merge_queue_archives(work_queue_path) or zip_file
+        else:
+            zip_file = scraper.process_icd_codes(df)
 
     # İndirme linki sağla
     if zip_file and os.path.exists(zip_file):
@@ -0,0 +1,659 @@
+# ICD-10 Academic Article Scraper - çevrimdışı benchmark'lar
+# Faz1,3 toplayıcısını yerel sahte sunucuya (MockAPIServer) karşı ölçer. Faz1,3 betiği bu
+# dosyayla aynı klasörde olmalıdır; betiğin main() bloğu içe aktarılırken çalışmaz.
+
+import os
+import sys
+import time
+import json
+import random
+import zipfile
+import threading
+import hashlib
+import sqlite3
+import shutil
+import logging
+import importlib.util
+from urllib.parse import urlsplit
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+import re
+
+# Tarayıcı süreçleri dahil bellek ölçümü için isteğe bağlı bağımlılık
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+FAZ1_3_FILENAME = 'KOD-MED_Beta_V1,5_Faz1,3.py'
+
+
+def _load_faz1_3():
+    """Faz1,3 betiğini modül olarak yükler; dosya bu betiğin yanında veya çalışma klasöründe aranır"""
+    search_dirs = [os.getcwd()]
+    if '__file__' in globals():
+        search_dirs.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    for directory in search_dirs:
+        path = os.path.join(directory, FAZ1_3_FILENAME)
+        if os.path.exists(path):
+            spec = importlib.util.spec_from_file_location('kodmed_faz1_3', path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            spec.loader.exec_module(module)
+            return module
+
+    raise ImportError(f"{FAZ1_3_FILENAME} bulunamadı; benchmark betiğiyle aynı klasöre koyun")
+
+
+_faz1_3 = _load_faz1_3()
+ICDArticleScraper = _faz1_3.ICDArticleScraper
+CheckpointArchive = _faz1_3.CheckpointArchive
+WorkQueue = _faz1_3.WorkQueue
+merge_queue_archives = _faz1_3.merge_queue_archives
+aiohttp = _faz1_3.aiohttp
+logger = _faz1_3.logger
+
+
+def benchmark_checkpoint_archive(n_codes: int = 10000, checkpoint_every: int = 10,
+                                 sample_points: Tuple[int, ...] = (1000, 5000, 10000)):
+    """
+    Artımlı ara kayıt ile her seferinde arşivi baştan oluşturan create_zip_archive'ı
+    sentetik JSON dosyaları üzerinde karşılaştırır.
+    """
+    import tempfile
+
+    workdir = tempfile.mkdtemp(prefix="umai_archive_bench_")
+    original_cwd = os.getcwd()
+    original_level = logger.level
+    results = []
+
+    try:
+        os.chdir(workdir)
+        logger.setLevel(logging.WARNING)
+        scraper = ICDArticleScraper(cache_path=None)
+
+        # Gerçekçi boyutta sentetik makale listesi
+        articles = [{
+            "title": f"Synthetic article {i}",
+            "authors": ["Author A", "Author B"],
+            "publication_date": "2024",
+            "journal_or_conference": "Journal",
+            "source": "PubMed",
+            "url": f"https://example.org/{i}",
+            "abstract": "Lorem ipsum dolor sit amet. " * 20,
+            "doi": None
+        } for i in range(10)]
+
+        incremental_total = 0.0
+        for i in range(1, n_codes + 1):
+            icd_code = f"S{i:06d}"
+            scraper.save_articles_to_json(icd_code, "Synthetic disease", articles)
+
+            if i % checkpoint_every == 0:
+                start = time.perf_counter()
+                scraper.archive.checkpoint()
+                elapsed = time.perf_counter() - start
+                incremental_total += elapsed
+
+                if i in sample_points:
+                    # Aynı noktada tam yeniden oluşturmanın maliyeti
+                    start = time.perf_counter()
+                    scraper.create_zip_archive()
+                    full_elapsed = time.perf_counter() - start
+
+                    # create_zip_archive arşivin üzerine yazdığı için artımlı arşivi yeniden kur
+                    scraper.archive = CheckpointArchive(scraper.output_dir)
+
+                    results.append({
+                        "archived_files": i,
+                        "incremental_checkpoint_ms": elapsed * 1000,
+                        "full_rebuild_ms": full_elapsed * 1000
+                    })
+
+        scraper.close()
+
+        # Tam yeniden oluşturmanın toplam maliyeti kayıt sayısının karesiyle büyür
+        full_total_estimate = 0.0
+        if results:
+            per_file = sum(r["full_rebuild_ms"] / r["archived_files"] for r in results) / len(results)
+            files_rewritten = sum(
+                k * checkpoint_every for k in range(1, n_codes // checkpoint_every + 1)
+            )
+            full_total_estimate = per_file * files_rewritten / 1000
+
+        print("\n" + "="*50)
+        print("ARŞİV ARA KAYIT BENCHMARK")
+        print("="*50)
+        for r in results:
+            print(f"{r['archived_files']:>6} dosya: artımlı {r['incremental_checkpoint_ms']:8.1f} ms | "
+                  f"tam {r['full_rebuild_ms']:8.1f} ms")
+        print(f"Toplam artımlı ara kayıt süresi: {incremental_total:.1f} sn")
+        print(f"Tahmini toplam tam yeniden oluşturma süresi: {full_total_estimate:.1f} sn")
+        print("="*50)
+
+        return results
+
+    finally:
+        logger.setLevel(original_level)
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+class MockAPIServer:
+    """
+    PubMed ve Google Scholar arama/detay sayfalarını, Semantic Scholar, ArXiv ve PubMed efetch
+    API'lerini taklit eden yerel HTTP sunucusu. Gecikme ve hata oranı ayarlanabilir.
+    Çevrimdışı throughput ölçümü için kullanılır (with bloğu ile başlatılır).
+    Her kaynak ayrı portta dinler; böylece gerçek sitelerdeki gibi hız sınırlayıcıda ayrı
+    host sayılır ve bir kaynağın 429/503 yanıtları diğerlerini yavaşlatmaz.
+    """
+
+    SOURCES = ("PubMed", "PubMed efetch", "Google Scholar", "Semantic Scholar", "ArXiv")
+
+    def __init__(self, latency: float = 0.05, articles_per_query: int = 10,
+                 error_rate: float = 0.0, error_status: int = 500, seed: int = 42):
+        self.latency = latency
+        self.articles_per_query = articles_per_query
+        # 500 geçici hata, 429/503 ise hız sınırlayıcıyı da tetikleyen kısıtlama yanıtıdır
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.request_count = 0
+        self.error_count = 0
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._servers = {}
+        self._threads = []
+
+    @staticmethod
+    def _pmids(query: str, count: int) -> List[int]:
+        """Sorgudan türetilen kararlı PMID listesi (aynı sorgu hep aynı makaleleri döndürür)"""
+        base = int(hashlib.md5(query.encode("utf-8")).hexdigest()[:6], 16) * 100
+        return [base + i for i in range(count)]
+
+    def _pubmed_search_body(self, query: str) -> bytes:
+        from xml.sax.saxutils import escape
+
+        items = "".join(
+            f'<article class="full-docsum"><div class="docsum-content">'
+            f'<div class="docsum-title"><a href="{self.base_urls["PubMed"]}/pubmed/{pmid}/">{escape(query)} clinical study {i}</a></div>'
+            f'<span class="docsum-authors">Author A, Author B, Author C</span>'
+            f'<span class="docsum-journal-citation">Mock J Med. {2018 + i % 6} Jan;{i}(2):1-10.</span>'
+            f'</div></article>'
+            for i, pmid in enumerate(self._pmids(query, self.articles_per_query))
+        )
+        return (f'<html><body><div class="search-results"><div class="search-results-chunk">{items}'
+                f'</div></div></body></html>').encode("utf-8")
+
+    def _pubmed_detail_body(self, pmid: str) -> bytes:
+        return (f'<html><body><div class="abstract-content"><p>Background of {pmid}. Results of {pmid}.</p></div>'
+                f'<span class="identifier doi"><a data-ga-action="DOI" href="#">10.0000/pubmed.{pmid}</a></span>'
+                f'</body></html>').encode("utf-8")
+
+    def _google_scholar_body(self, query: str) -> bytes:
+        from xml.sax.saxutils import escape
+
+        # Çift sıradaki sonuçlar PubMed başlıklarıyla aynıdır (kaynaklar arası birleştirme için)
+        items = "".join(
+            f'<div class="gs_r gs_or gs_scl"><div class="gs_ri">'
+            f'<h3 class="gs_rt"><a href="https://example.org/gs/{i}">'
+            f'{escape(query)} {"clinical study" if i % 2 == 0 else "scholar review"} {i}</a></h3>'
+            f'<div class="gs_a">A Author, B Author - Mock J Med, {2018 + i % 6} - example.org</div>'
+            f'<div class="gs_rs">Snippet for {escape(query)} {i}…</div>'
+            f'</div></div>'
+            for i in range(self.articles_per_query)
+        )
+        return f'<html><body><div id="gs_res_ccl_mid">{items}</div></body></html>'.encode("utf-8")
+
+    @property
+    def base_urls(self) -> Dict[str, str]:
+        """Kaynak adı -> o kaynağın dinlediği adres"""
+        return {
+            source: "http://{}:{}".format(*server.server_address[:2])
+            for source, server in self._servers.items()
+        }
+
+    def _semantic_scholar_body(self, query: str) -> bytes:
+        papers = [{
+            "title": f"{query} study {i}",
+            "authors": [{"name": "Author A"}, {"name": "Author B"}],
+            "year": 2020 + i % 5,
+            "venue": "Mock Journal",
+            "abstract": f"Abstract for {query} {i}",
+            "url": f"https://example.org/s2/{i}",
+            "externalIds": {"DOI": f"10.0000/mock.{i}"}
+        } for i in range(self.articles_per_query)]
+        return json.dumps({"data": papers}).encode("utf-8")
+
+    def _arxiv_body(self, query: str) -> bytes:
+        entries = "".join(
+            f"<entry><id>http://arxiv.org/abs/mock.{i}</id><title>{query} preprint {i}</title>"
+            f"<published>2023-01-01T00:00:00Z</published><summary>Summary {i}</summary>"
+            f"<author><name>Author A</name></author></entry>"
+            for i in range(self.articles_per_query)
+        )
+        return f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>'.encode("utf-8")
+
+    def _pubmed_efetch_body(self, pmids: List[str]) -> bytes:
+        articles = "".join(
+            f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article><Abstract>"
+            f"<AbstractText Label=\"BACKGROUND\">Background of {pmid}.</AbstractText>"
+            f"<AbstractText Label=\"RESULTS\">Results of {pmid}.</AbstractText>"
+            f"</Abstract></Article></MedlineCitation><PubmedData><ArticleIdList>"
+            f"<ArticleId IdType=\"pubmed\">{pmid}</ArticleId>"
+            f"<ArticleId IdType=\"doi\">10.0000/pubmed.{pmid}</ArticleId>"
+            f"</ArticleIdList></PubmedData></PubmedArticle>"
+            for pmid in pmids if pmid.isdigit()
+        )
+        return f"<PubmedArticleSet>{articles}</PubmedArticleSet>".encode("utf-8")
+
+    def _make_handler(self):
+        from http.server import BaseHTTPRequestHandler
+        from urllib.parse import parse_qs
+        from xml.sax.saxutils import escape
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Başlık ve gövde ayrı yazıldığı için Nagle gecikmesini kapat
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.request_count += 1
+                time.sleep(server.latency)
+
+                with server._random_lock:
+                    failed = server._random.random() < server.error_rate
+                if failed:
+                    server.error_count += 1
+                    self.send_response(server.error_status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                parts = urlsplit(self.path)
+                query = parse_qs(parts.query)
+                pubmed_detail = re.match(r"^/pubmed/(\d+)/?$", parts.path)
+                if pubmed_detail:
+                    body = server._pubmed_detail_body(pubmed_detail.group(1))
+                    content_type = "text/html; charset=utf-8"
+                elif parts.path.startswith("/pubmed"):
+                    body = server._pubmed_search_body(query.get("term", [""])[0])
+                    content_type = "text/html; charset=utf-8"
+                elif parts.path.startswith("/scholar"):
+                    body = server._google_scholar_body(query.get("q", [""])[0])
+                    content_type = "text/html; charset=utf-8"
+                elif parts.path.endswith("/paper/search"):
+                    body = server._semantic_scholar_body(query.get("query", [""])[0])
+                    content_type = "application/json"
+                elif parts.path.endswith("/api/query"):
+                    search = query.get("search_query", [""])[0].replace("all:", "", 1)
+                    body = server._arxiv_body(escape(search))
+                    content_type = "application/atom+xml"
+                elif parts.path.endswith("/efetch.fcgi"):
+                    body = server._pubmed_efetch_body(query.get("id", [""])[0].split(","))
+                    content_type = "text/xml"
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        from http.server import ThreadingHTTPServer
+
+        handler = self._make_handler()
+        for source in self.SOURCES:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._servers[source] = server
+            self._threads.append(thread)
+        return self
+
+    def __exit__(self, *exc):
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+
+def benchmark_api_throughput(n_codes: int = 200, latency: float = 0.05,
+                             rate_limit: float = 1000.0,
+                             per_host_limit: int = 16, max_codes_in_flight: int = 64):
+    """
+    Semantic Scholar ve ArXiv kaynaklarını yerel sahte sunucuya karşı senkron
+    oturum ve asenkron motor ile çalıştırıp saniyedeki kod sayısını karşılaştırır.
+    """
+    import tempfile
+
+    workdir = tempfile.mkdtemp(prefix="umai_api_bench_")
+    original_cwd = os.getcwd()
+    original_level = logger.level
+    codes = [(f"M{i:05d}", "Mock disease") for i in range(n_codes)]
+    results = {}
+
+    try:
+        os.chdir(workdir)
+        logger.setLevel(logging.WARNING)
+
+        with MockAPIServer(latency=latency) as server:
+            for mode in ("sync", "async"):
+                if mode == "async" and aiohttp is None:
+                    print("aiohttp kurulu değil, asenkron ölçüm atlandı")
+                    continue
+
+                scraper = ICDArticleScraper(
+                    use_async_api=(mode == "async"),
+                    cache_path=None,
+                    api_per_host_limit=per_host_limit,
+                    max_codes_in_flight=max_codes_in_flight
+                )
+                # Yalnızca API kaynakları ölçülür
+                _use_mock_server(scraper, server.base_urls, rate_limit, ("Semantic Scholar", "ArXiv"))
+
+                start = time.perf_counter()
+                futures = [scraper.scheduler.submit(code, name) for code, name in codes]
+                articles = sum(len(a) for f in futures for a in f.result().values())
+                elapsed = time.perf_counter() - start
+
+                scraper.close()
+
+                results[mode] = {
+                    "codes_per_sec": n_codes / elapsed,
+                    "seconds": elapsed,
+                    "articles": articles
+                }
+
+        print("\n" + "="*50)
+        print("API THROUGHPUT BENCHMARK")
+        print("="*50)
+        for mode, r in results.items():
+            print(f"{mode:>5}: {r['codes_per_sec']:8.1f} kod/sn | {r['seconds']:6.2f} sn | {r['articles']} makale")
+        print("="*50)
+
+        return results
+
+    finally:
+        logger.setLevel(original_level)
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+class _PeakRSSSampler:
+    """Süreç ve alt süreçlerinin (tarayıcılar dahil) toplam RSS tepe değerini örnekler"""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self) -> int:
+        if psutil is None:
+            import resource
+            # psutil yoksa yalnızca bu süreç ve beklenen alt süreçlerin tepe değeri (Linux'ta KB)
+            usage = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                     + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+            return usage * 1024
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_bytes = max(self.peak_bytes, self._sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name="RSSSampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, self._sample())
+
+
+def _use_mock_server(scraper: ICDArticleScraper, base_urls: Dict[str, str], rate_limit: float,
+                     sources: Optional[Tuple[str, ...]] = None):
+    """Scraper'ın tüm kaynak URL'lerini sahte sunucunun kaynak başına adreslerine yönlendirir"""
+    scraper.PUBMED_SEARCH_URL = f"{base_urls['PubMed']}/pubmed/"
+    scraper.GOOGLE_SCHOLAR_SEARCH_URL = f"{base_urls['Google Scholar']}/scholar"
+    scraper.SEMANTIC_SCHOLAR_API_URL = f"{base_urls['Semantic Scholar']}/graph/v1/paper/search"
+    scraper.ARXIV_API_URL = f"{base_urls['ArXiv']}/api/query"
+    scraper.PUBMED_EFETCH_URL = f"{base_urls['PubMed efetch']}/efetch.fcgi"
+    # Sahte sunucu için hız sınırı benchmark parametresinden gelir (her kaynak ayrı host)
+    for base_url in base_urls.values():
+        scraper.rate_limiter.set_host_rate(urlsplit(base_url).netloc, rate_limit, rate_limit)
+
+    if sources:
+        scraper.scheduler.sources = {
+            name: scrape for name, scrape in scraper.scheduler.sources.items() if name in sources
+        }
+
+
+def benchmark_end_to_end(n_codes: int = 100, latency: float = 0.05, error_rate: float = 0.0,
+                         error_status: int = 500, sources: Optional[Tuple[str, ...]] = None, driver_pool_size: Optional[int] = None,
+                         max_codes_in_flight: int = 16, rate_limit: float = 1000.0,
+                         scraper_options: Optional[Dict] = None) -> Dict:
+    """
+    process_icd_codes'u sentetik kod listesiyle yerel sahte sunucuya karşı uçtan uca çalıştırır.
+    Kod/dk, kod başına p95 gecikme, tepe RSS ve açılan tarayıcı sayısını raporlar.
+    sources verilirse yalnızca o kaynaklar çalıştırılır. Tarayıcı yolunu ölçmek için
+    scraper_options={"static_fetch": False} verilebilir.
+    """
+    import tempfile
+    import contextlib
+
+    workdir = tempfile.mkdtemp(prefix="umai_e2e_bench_")
+    original_cwd = os.getcwd()
+    original_level = logger.level
+    df = pd.DataFrame({
+        "icd_code": [f"M{i:05d}" for i in range(n_codes)],
+        "disease_name": [f"Mock disease {i % 50}" for i in range(n_codes)]
+    })
+
+    try:
+        os.chdir(workdir)
+        logger.setLevel(logging.WARNING)
+
+        with MockAPIServer(latency=latency, error_rate=error_rate, error_status=error_status) as server:
+            options = dict(
+                cache_path=None,
+                metrics_path=None,
+                driver_pool_size=driver_pool_size,
+                max_codes_in_flight=max_codes_in_flight,
+                retry_backoff=0.5,
+                max_retries=1
+            )
+            options.update(scraper_options or {})
+            scraper = ICDArticleScraper(**options)
+            _use_mock_server(scraper, server.base_urls, rate_limit, sources)
+
+            with _PeakRSSSampler() as sampler:
+                start = time.perf_counter()
+                # Nihai rapor benchmark çıktısını bozmasın
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    scraper.process_icd_codes(df)
+                elapsed = time.perf_counter() - start
+
+            code_latency = scraper.metrics.histogram_summary("stage_latency_seconds", stage="code_total") or {}
+
+            result = {
+                "codes": n_codes,
+                "processed": scraper.stats["processed_codes"],
+                "failed": scraper.stats["failed_codes"],
+                "seconds": elapsed,
+                "codes_per_min": scraper.stats["processed_codes"] / elapsed * 60,
+                "p95_code_seconds": code_latency.get("p95"),
+                "peak_rss_mb": sampler.peak_bytes / (1024 * 1024),
+                "browsers_started": scraper.driver_pool.stats["created"],
+                "articles": scraper.stats["total_articles"],
+                "requests": server.request_count,
+                "injected_errors": server.error_count
+            }
+            scraper.close()
+
+        print("\n" + "="*50)
+        print("UÇTAN UCA BENCHMARK")
+        print("="*50)
+        print(f"Kaynaklar: {', '.join(sources) if sources else 'tümü'}")
+        print(f"İşlenen / başarısız kod: {result['processed']} / {result['failed']} (toplam {n_codes})")
+        print(f"Throughput: {result['codes_per_min']:.1f} kod/dk ({result['seconds']:.1f} sn)")
+        if result["p95_code_seconds"] is not None:
+            print(f"Kod başına p95 gecikme: {result['p95_code_seconds']:.2f} sn")
+        print(f"Tepe RSS: {result['peak_rss_mb']:.0f} MB" + ("" if psutil else " (psutil yok, tarayıcılar hariç olabilir)"))
+        print(f"Başlatılan tarayıcı: {result['browsers_started']}")
+        print(f"Sunucu isteği: {result['requests']} ({result['injected_errors']} enjekte hata)")
+        print("="*50)
+
+        return result
+
+    finally:
+        logger.setLevel(original_level)
+        os.chdir(original_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _run_queue_worker(queue_path: str, worker_id: str, base_urls: Dict[str, str], rate_limit: float,
+                      options: Dict):
+    """benchmark_work_queue çalışan süreci: kuyruk bitene kadar kod kiralar"""
+    import contextlib
+
+    logger.setLevel(logging.WARNING)
+    with ICDArticleScraper(worker_id=worker_id, **options) as scraper:
+        _use_mock_server(scraper, base_urls, rate_limit)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+                contextlib.redirect_stderr(devnull):
+            scraper.process_work_queue(queue_path, idle_wait=0.2)
+
+
+def benchmark_work_queue(n_codes: int = 200, worker_counts: Tuple[int, ...] = (1, 2, 4),
+                         latency: float = 0.05, max_codes_in_flight: int = 2,
+                         crashed_leases: int = 5, poisoned_codes: int = 2, rate_limit: float = 1000.0):
+    """
+    Aynı WorkQueue'ya bağlanan 1, 2, 4... çalışan süreciyle sahte sunucuya karşı toplama hızını ölçer.
+    Her turda crashed_leases kod kısa süreli kirayla "çökmüş" bir çalışana verilir; bu kodların
+    kiraları dolunca diğer çalışanlarca devralınması ve arşivlerin tek arşivde birleşmesi doğrulanır.
+    poisoned_codes kod ise deneme hakkı kadar çalışan çökertmiş gibi kaydedilir; bunlar yeniden
+    kiralanmadan 'failed' olmalıdır.
+    """
+    import tempfile
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("fork")
+    codes = [(f"Q{i:05d}", f"Mock disease {i % 50}") for i in range(n_codes)]
+    options = dict(
+        cache_path=None,
+        metrics_path=None,
+        max_codes_in_flight=max_codes_in_flight,
+        retry_backoff=0.5,
+        max_retries=1
+    )
+
+    original_cwd = os.getcwd()
+    results = []
+
+    with MockAPIServer(latency=latency) as server:
+        for workers in worker_counts:
+            workdir = tempfile.mkdtemp(prefix="umai_queue_bench_")
+            try:
+                os.chdir(workdir)
+                queue_path = os.path.join(workdir, "work_queue.sqlite")
+
+                work_queue = WorkQueue(queue_path)
+                work_queue.enqueue(codes)
+                work_queue.close()
+
+                # Çöken çalışanı taklit et: kodlar kiralanır ama hiç tamamlanmaz
+                crashed = WorkQueue(queue_path, lease_seconds=1)
+                crashed.lease("crashed-worker", crashed_leases)
+                crashed.close()
+
+                # Her kiralandığında çalışanı çökerten kodlar: deneme hakkı bitmiş, kirası dolmuş
+                with sqlite3.connect(queue_path) as conn:
+                    conn.executemany(
+                        "UPDATE tasks SET status = 'leased', worker_id = 'poisoned-worker', available_at = 0, "
+                        "attempts = ? WHERE icd_code = ?",
+                        [(options["max_retries"] + 1, code) for code, _ in codes[len(codes) - poisoned_codes:]]
+                    )
+                conn.close()
+
+                start = time.perf_counter()
+                processes = [
+                    ctx.Process(target=_run_queue_worker,
+                                args=(queue_path, f"w{i}", server.base_urls, rate_limit, options))
+                    for i in range(workers)
+                ]
+                for process in processes:
+                    process.start()
+                for process in processes:
+                    process.join()
+                elapsed = time.perf_counter() - start
+
+                merged = merge_queue_archives(queue_path, "collected_data.zip")
+                with zipfile.ZipFile(merged, 'r') as zipf:
+                    archived = sum(1 for name in zipf.namelist() if name.endswith(".json"))
+
+                work_queue = WorkQueue(queue_path)
+                counts = work_queue.counts()
+                work_queue.close()
+
+                results.append({
+                    "workers": workers,
+                    "seconds": elapsed,
+                    "codes_per_min": counts.get("done", 0) / elapsed * 60,
+                    "done": counts.get("done", 0),
+                    "failed": counts.get("failed", 0),
+                    "archived": archived
+                })
+            finally:
+                os.chdir(original_cwd)
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    print("\n" + "="*50)
+    print("İŞ KUYRUĞU ÖLÇEKLEME BENCHMARK")
+    print("="*50)
+    print(f"{n_codes} kod, kod başına {latency * 1000:.0f} ms gecikme, çalışan başına {max_codes_in_flight} eşzamanlı kod")
+    base = results[0]["codes_per_min"] if results else 0
+    for result in results:
+        speedup = result["codes_per_min"] / base if base else 0
+        print(f"  {result['workers']} çalışan: {result['codes_per_min']:.0f} kod/dk ({result['seconds']:.1f} sn, "
+              f"x{speedup:.2f}) - tamamlanan {result['done']}, başarısız {result['failed']}, "
+              f"arşivde {result['archived']} kod")
+    print("="*50)
+
+    return results
+
+
+def main():
+    """Tüm benchmark'ları varsayılan ayarlarla çalıştırır"""
+    benchmark_checkpoint_archive()
+    benchmark_api_throughput()
+    benchmark_end_to_end()
+    # Kısıtlama yanıtları altında hız sınırlayıcının toparlanması
+    benchmark_end_to_end(n_codes=30, latency=0.01, error_rate=0.2, error_status=503)
+    benchmark_work_queue()
+
+
+if __name__ == "__main__":
+    main()
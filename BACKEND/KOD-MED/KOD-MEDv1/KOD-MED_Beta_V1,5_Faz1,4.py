@@ -1,16 +1,520 @@
 
 # Islenen Json ve ZIP dosyasini  inceleyen kod
+# (Faz1,5'in umai_labeled_dataset.csv ciktisi da ayni taramada uretilir)
 
 import pandas as pd
+import numpy as np
 import json
+import gzip
+import re
 import os
 import zipfile
 from google.colab import files
 import time
+import multiprocessing
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Bu sayının altındaki arşivler tek süreçte işlenir (havuz kurulum maliyeti kazançtan büyük)
+PARALLEL_MIN_FILES = 500
+
+# CSV'ye ek olarak yazılacak sütunlu formatlar ('parquet', 'arrow')
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+# Parquet satır grubu / Arrow kayıt yığını boyutu
+COLUMNAR_ROW_GROUP_SIZE = 64 * 1024
+
+# Yakın kopya başlık eşiği (tahmini Jaccard); None ise aşama atlanır
+NEAR_DUPLICATE_THRESHOLD = 0.8
+NEAR_DUPLICATE_NUM_PERM = 64
+NEAR_DUPLICATE_SHINGLE_SIZE = 5
+# LSH kovasında her satırın karşılaştırıldığı komşu sayısı (bu boyuta kadar kovalarda tüm çiftler)
+NEAR_DUPLICATE_BUCKET_WINDOW = 16
+
+def json_loads(raw):
+    """Varsa orjson, yoksa standart json ile bayt dizisini çözümler."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # BOM, NaN gibi orjson'un kabul etmediği girdiler için standart json'a düş
+            pass
+    return json.loads(raw)
+
+# Çıktı dosyalarının adları
+ARTICLES_CSV_FILENAME = 'articles_dataset.csv'
+LABELED_CSV_FILENAME = 'umai_labeled_dataset.csv'
+DISEASE_NAMES_CSV_FILENAME = 'disease_names_dataset.csv'
+
+# Faz1,3 makale deposu modunun dışa aktarım dosyası (kod kayıtları yalnızca article_refs tutar)
+ARTICLE_STORE_FILENAME = 'articles_store.jsonl'
+
+# article_id -> makale; ingest_zip_members tarafından havuz kurulmadan önce doldurulur (fork ile işçilere geçer)
+_ARTICLE_STORE = {}
+
+def load_article_store(zip_filename):
+    """Arşivdeki makale deposunu (varsa) belleğe yükler ve makale sayısını döndürür."""
+    global _ARTICLE_STORE
+    _ARTICLE_STORE = {}
+
+    with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
+        for member in zip_ref.namelist():
+            if member.endswith(ARTICLE_STORE_FILENAME):
+                with zip_ref.open(member) as f:
+                    for line in f:
+                        if line.strip():
+                            record = json_loads(line)
+                            _ARTICLE_STORE[record.pop('article_id')] = record
+
+    return len(_ARTICLE_STORE)
+
+# Faz1,3 JSONL modunun parçaları (her kayıt ayrı gzip üyesi, satır başına bir kod) ve indeksi
+JSONL_SHARD_SUFFIX = '.jsonl.gz'
+JSONL_INDEX_FILENAME = 'index.jsonl'
+
+# parça üye adı -> [(ofset, uzunluk)]; her kodun yalnızca son yazılan kaydı (yeniden denemeler eskisini ezer)
+_SHARD_INDEX = {}
+
+def archive_members(file_list):
+    """Arşivdeki kod kayıtlarını taşıyan üyeleri döndürür: tekil JSON dosyaları ve JSONL parçaları."""
+    return [f for f in file_list if f.endswith('.json') or f.endswith(JSONL_SHARD_SUFFIX)]
+
+def load_shard_index(zip_filename):
+    """JSONL parçalarının indeks dosyalarını (varsa) okur ve indekslenen kayıt sayısını döndürür."""
+    global _SHARD_INDEX
+    _SHARD_INDEX = {}
+
+    with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
+        for member in zip_ref.namelist():
+            if member.rsplit('/', 1)[-1] != JSONL_INDEX_FILENAME:
+                continue
+
+            prefix = member[:-len(JSONL_INDEX_FILENAME)]
+            latest = {}
+            with zip_ref.open(member) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json_loads(line)
+                        latest[entry['icd_code']] = (prefix + entry['shard'], entry['offset'], entry['length'])
+
+            for shard, offset, length in latest.values():
+                _SHARD_INDEX.setdefault(shard, []).append((offset, length))
+
+    for entries in _SHARD_INDEX.values():
+        entries.sort()
+    return sum(len(entries) for entries in _SHARD_INDEX.values())
+
+def read_member_records(zip_ref, member):
+    """
+    Üyedeki kod kayıtlarını çözümlenmemiş (ad, bayt) çiftleri olarak döndürür. JSON dosyası tek
+    kayıttır; JSONL parçasında indeks varsa yalnızca indekslenen kayıtlar ofsetinden, yoksa tüm satırlar okunur.
+    """
+    raw = zip_ref.read(member)
+    if not member.endswith(JSONL_SHARD_SUFFIX):
+        return [(member, raw)]
+
+    entries = _SHARD_INDEX.get(member)
+    if entries:
+        lines = [gzip.decompress(raw[offset:offset + length]) for offset, length in entries]
+    else:
+        lines = gzip.decompress(raw).splitlines()
+
+    return [(f"{member}#{line_no}", line) for line_no, line in enumerate(line for line in lines if line.strip())]
+
+def resolve_articles(data):
+    """Kod kaydının makale listesini döndürür; depo modundaki article_refs referanslarını çözer."""
+    if 'articles' in data or 'article_refs' not in data:
+        return data.get('articles', [])
+    refs = sorted(data['article_refs'], key=lambda ref: ref['rank'])
+    return [_ARTICLE_STORE[ref['article_id']] for ref in refs if ref['article_id'] in _ARTICLE_STORE]
+
+def _extract_article_records(icd_code, articles, texts, codes):
+    """Faz1,4 kuralları: title/name/headline alanları veya doğrudan string makaleler."""
+    if icd_code and articles:
+        for article in articles:
+            # Makale yapısını kontrol et
+            if isinstance(article, dict):
+                # Başlık alanlarını kontrol et
+                title = article.get('title') or article.get('name') or article.get('headline')
+                if title and title.strip():
+                    texts.append(title.strip())
+                    codes.append(icd_code)
+            elif isinstance(article, str):
+                # Doğrudan string ise
+                if article.strip():
+                    texts.append(article.strip())
+                    codes.append(icd_code)
+
+def _extract_labeled_records(icd_code, articles, texts, codes):
+    """Faz1,5 kuralları: yalnızca 'title' alanı (umai_labeled_dataset.csv)."""
+    if icd_code and articles:
+        for article in articles:
+            title = article.get('title', '').strip()
+            if title:  # Boş olmayan başlıklar
+                texts.append(title)
+                codes.append(icd_code)
+
+def _ingest_zip_chunk(zip_filename, members):
+    """
+    Bir grup ZIP üyesini açıp çözümler (işçi süreçte çalışır).
+    Her üye bir kez okunup bir kez çözümlenir; makale, etiketli veri ve hastalık ismi
+    kayıtları ile dosya istatistikleri aynı geçişte çıkarılır.
+    """
+    result = {
+        'texts': [],
+        'codes': [],
+        'labeled_texts': [],
+        'labeled_codes': [],
+        'disease_texts': [],
+        'disease_codes': [],
+        'filled_files': [],
+        'empty_articles_count': 0,
+        'processed': 0,
+        'errors': [],
+        'labeled_errors': []
+    }
+
+    with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
+        for member in members:
+            try:
+                records = read_member_records(zip_ref, member)
+            except Exception as e:
+                result['errors'].append((member, str(e)))
+                continue
+
+            for json_file, raw in records:
+                _ingest_record(result, json_file, raw)
+
+    return result
+
+def _ingest_record(result, json_file, raw):
+    """Tek bir kod kaydını (JSON dosyası veya JSONL satırı) çözümleyip işçi sonucuna ekler."""
+    try:
+        data = json_loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError(f"beklenmeyen JSON yapısı: {type(data).__name__}")
+    except Exception as e:
+        result['errors'].append((json_file, str(e)))
+        return
+
+    # Hastalık ismi kaydı (makale bulunamazsa kullanılacak yedek veri seti)
+    try:
+        icd_code = data.get('icd_code')
+        disease_name = data.get('disease_name')
+        if icd_code and disease_name:
+            result['disease_texts'].append(disease_name.strip())
+            result['disease_codes'].append(icd_code)
+    except Exception:
+        pass
+
+    # Etiketli veri seti; hata yalnızca bu dosyanın kalan makalelerini etkiler
+    try:
+        _extract_labeled_records(data.get('icd_code'), resolve_articles(data),
+                                 result['labeled_texts'], result['labeled_codes'])
+    except Exception as e:
+        result['labeled_errors'].append((json_file, str(e)))
+
+    try:
+        # ICD kodu ve makaleler varsa işle
+        icd_code = data.get('icd_code')
+        disease_name = data.get('disease_name')
+        articles = resolve_articles(data)
+
+        if len(articles) > 0:  # Dolu makale listesi varsa
+            result['filled_files'].append((json_file, icd_code, disease_name, len(articles)))
+            _extract_article_records(icd_code, articles, result['texts'], result['codes'])
+        else:
+            result['empty_articles_count'] += 1
+
+        result['processed'] += 1
+
+    except Exception as e:
+        result['errors'].append((json_file, str(e)))
+
+def ingest_zip_members(zip_filename, json_files, workers=None, chunk_size=None):
+    """
+    JSON dosyası ve JSONL parçası üyelerini süreç havuzunda paralel açıp çözümler ve
+    işçi sonuçlarını arşiv sırasını koruyarak birleştirir.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    # Depo modunda üretilmiş arşivlerde makale gövdeleri ayrı dosyadadır
+    store_size = load_article_store(zip_filename)
+    if store_size:
+        print(f"Makale deposu yüklendi: {store_size} tekil makale")
+
+    # JSONL modunda aynı kodun eski kayıtları indeksle elenir
+    indexed_count = load_shard_index(zip_filename)
+    if indexed_count:
+        print(f"JSONL parça indeksi yüklendi: {indexed_count} kod kaydı")
+
+    summary = {
+        'texts': [],
+        'codes': [],
+        'labeled_texts': [],
+        'labeled_codes': [],
+        'disease_texts': [],
+        'disease_codes': [],
+        'filled_files': [],
+        'empty_articles_count': 0,
+        'processed_count': 0
+    }
+
+    # JSONL parçaları yüzlerce kayıt taşır; her biri tek başına bir iş parçasıdır
+    shard_files = [f for f in json_files if f.endswith(JSONL_SHARD_SUFFIX)]
+    single_files = [f for f in json_files if not f.endswith(JSONL_SHARD_SUFFIX)]
+
+    if workers == 1 or (len(single_files) < PARALLEL_MIN_FILES and len(shard_files) < 2):
+        chunks = [json_files]
+    else:
+        # Her işçiye birden fazla parça düşsün ki yavaş parçalar yükü dengesizleştirmesin
+        chunk_size = chunk_size or max(50, -(-len(single_files) // (workers * 4)))
+        chunks = [single_files[i:i + chunk_size] for i in range(0, len(single_files), chunk_size)]
+        chunks += [[shard_file] for shard_file in shard_files]
+    done_members = 0
+
+    def merge(results):
+        nonlocal done_members
+        for chunk, result in zip(chunks, results):
+            done_members += len(chunk)
+            for key in ('texts', 'codes', 'labeled_texts', 'labeled_codes', 'disease_texts', 'disease_codes'):
+                summary[key].extend(result[key])
+            summary['filled_files'].extend(
+                {'file': json_file, 'icd_code': icd_code, 'disease_name': disease_name, 'article_count': count}
+                for json_file, icd_code, disease_name, count in result['filled_files']
+            )
+            summary['empty_articles_count'] += result['empty_articles_count']
+            summary['processed_count'] += result['processed']
+            for json_file, error in result['errors']:
+                print(f"✗ {json_file} işlenirken hata: {error}")
+            for json_file, error in result['labeled_errors']:
+                print(f"✗ {json_file} etiketli veri setine eklenirken hata: {error}")
+            print(f"İşlenen kayıt sayısı: {summary['processed_count']} ({done_members}/{len(json_files)} arşiv üyesi)")
+
+    if len(chunks) == 1:
+        merge(map(_ingest_zip_chunk, [zip_filename], chunks))
+    else:
+        # Colab/Jupyter'da tanımlı fonksiyonlar spawn ile aktarılamaz; fork tercih edilir
+        mp_context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            merge(executor.map(_ingest_zip_chunk, repeat(zip_filename), chunks))
+
+    return summary
+
+def _to_arrow_table(df):
+    """
+    (text, icd_code) DataFrame'ini Arrow tablosuna çevirir.
+    Satırlar icd_code'a göre (kararlı) sıralanır; böylece her satır grubu dar bir kod aralığı
+    kapsar ve kod filtreleri istatistiklerle grup atlayabilir. icd_code sözlük kodludur.
+    """
+    df = df.sort_values('icd_code', kind='stable')
+    return pa.table({
+        'text': pa.array(df['text'].to_numpy(), type=pa.string()),
+        'icd_code': pa.array(df['icd_code'].to_numpy(), type=pa.string()).dictionary_encode()
+    })
+
+def save_columnar_dataset(df, csv_filename, formats=COLUMNAR_FORMATS):
+    """
+    Veri setini Parquet (sıkıştırılmış, satır grubu istatistikli) ve/veya Arrow IPC
+    (sıkıştırmasız, bellek eşlemeli sıfır kopya okuma) olarak yazar. Yazılan dosya adlarını döndürür.
+    """
+    if pa is None:
+        print("⚠️ pyarrow yüklü değil, sütunlu çıktı atlandı (pip install pyarrow)")
+        return []
+
+    table = _to_arrow_table(df)
+    base_name = os.path.splitext(csv_filename)[0]
+    written = []
+
+    for output_format in formats:
+        if output_format == 'parquet':
+            output_filename = base_name + '.parquet'
+            pq.write_table(table, output_filename, row_group_size=COLUMNAR_ROW_GROUP_SIZE,
+                           use_dictionary=True, write_statistics=True, compression='zstd')
+        elif output_format == 'arrow':
+            output_filename = base_name + '.arrow'
+            with pa.OSFile(output_filename, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table, max_chunksize=COLUMNAR_ROW_GROUP_SIZE)
+        else:
+            raise ValueError(f"Desteklenmeyen format: {output_format}")
+
+        print(f"✓ {output_format} dosyası oluşturuldu: {output_filename} "
+              f"({os.path.getsize(output_filename)} bytes)")
+        written.append(output_filename)
+
+    return written
+
+def normalize_title(title):
+    """Büyük/küçük harf, noktalama ve boşluk farklarını yok sayan karşılaştırma metni."""
+    title = re.sub(r'[^\w\s]', ' ', str(title).casefold())
+    return re.sub(r'\s+', ' ', title).strip()
+
+def _lsh_bands(threshold, num_perm):
+    """
+    num_perm'i bölen (band, satır) çiftlerinden S eğrisinin eşiği (1/b)^(1/r) hedef eşiğin
+    altında kalan en yakın olanı seçer; kaçan çiftler yerine fazla aday tercih edilir
+    (adaylar imza benzerliğiyle ayrıca doğrulanır).
+    """
+    pairs = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    below = [pair for pair in pairs if (1 / pair[0]) ** (1 / pair[1]) <= threshold]
+    return max(below or pairs, key=lambda pair: (1 / pair[0]) ** (1 / pair[1]))
+
+def minhash_signatures(texts, num_perm=NEAR_DUPLICATE_NUM_PERM, shingle_size=NEAR_DUPLICATE_SHINGLE_SIZE,
+                       seed=42, batch_size=5000):
+    """
+    Metinlerin karakter k-gram (UTF-8 bayt) kümeleri için MinHash imzalarını hesaplar.
+    Shingle hash'leri ve permütasyonlar numpy ile toplu hesaplanır; süre toplam metin uzunluğuyla doğrusal.
+    """
+    rng = np.random.default_rng(seed)
+    # Çarp-kaydır hash ailesi: ((a * x + b) mod 2^64) >> 32, a tek sayı
+    a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    powers = np.array([pow(1099511628211, j, 2 ** 64) for j in range(shingle_size)], dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    perm_chunk = 16
+
+    for batch_start in range(0, len(texts), batch_size):
+        # k'dan kısa metinler tek bir shingle olacak şekilde boşlukla doldurulur
+        encoded = [text.encode('utf-8').ljust(shingle_size) for text in texts[batch_start:batch_start + batch_size]]
+        lengths = np.array([len(item) for item in encoded], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        buffer = np.frombuffer(b''.join(encoded) + b'\0' * shingle_size, dtype=np.uint8).astype(np.uint64)
+
+        # Her bayt pozisyonundan başlayan k-gram'ın polinom hash'i
+        total = int(lengths.sum())
+        shingle_hashes = np.zeros(total, dtype=np.uint64)
+        for j in range(shingle_size):
+            shingle_hashes += buffer[j:j + total] * powers[j]
+
+        # Metin sınırını aşan k-gram'ları at
+        text_ids = np.repeat(np.arange(len(encoded)), lengths)
+        valid = (np.arange(total) - offsets[text_ids]) <= (lengths[text_ids] - shingle_size)
+        shingle_hashes = shingle_hashes[valid]
+        group_starts = np.concatenate(([0], np.cumsum(lengths - shingle_size + 1)[:-1]))
+
+        for perm_start in range(0, num_perm, perm_chunk):
+            perm_end = min(perm_start + perm_chunk, num_perm)
+            values = ((shingle_hashes[:, None] * a[perm_start:perm_end] + b[perm_start:perm_end])
+                      >> np.uint64(32)).astype(np.uint32)
+            signatures[batch_start:batch_start + len(encoded), perm_start:perm_end] = \
+                np.minimum.reduceat(values, group_starts, axis=0)
+
+    return signatures
+
+def find_near_duplicate_clusters(texts, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=NEAR_DUPLICATE_NUM_PERM,
+                                 shingle_size=NEAR_DUPLICATE_SHINGLE_SIZE):
+    """
+    MinHash + LSH bantlama ile yakın kopya kümelerini bulur.
+    Her satır için küme temsilcisinin (kümedeki ilk satır) indeksini döndürür.
+    """
+    n = len(texts)
+    labels = np.arange(n)
+    if n < 2:
+        return labels
+
+    signatures = minhash_signatures([normalize_title(text) for text in texts], num_perm, shingle_size)
+    bands, rows = _lsh_bands(threshold, num_perm)
+    multipliers = np.random.default_rng(7).integers(1, 2 ** 63, rows, dtype=np.uint64) | np.uint64(1)
+
+    # Aynı bant kovasındaki satırlar, sıralı kovada NEAR_DUPLICATE_BUCKET_WINDOW kadar uzaktaki
+    # üyelerle aday çift oluşturur; küçük kovalarda tüm çiftler karşılaştırılır, böylece ilk
+    # satırla eşleşmeyen iki varyant da birbiriyle doğrulanır
+    sources = []
+    targets = []
+    for band in range(bands):
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * multipliers).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        for offset in range(1, min(NEAR_DUPLICATE_BUCKET_WINDOW, n - 1) + 1):
+            same_bucket = sorted_keys[offset:] == sorted_keys[:-offset]
+            if not same_bucket.any():
+                break
+            sources.append(order[:-offset][same_bucket])
+            targets.append(order[offset:][same_bucket])
+
+    if not sources:
+        return labels
+
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    pairs = np.unique(np.sort(np.stack([sources, targets], axis=1), axis=1), axis=0)
+
+    # Adayları tahmini Jaccard benzerliğiyle doğrula
+    keep = np.zeros(len(pairs), dtype=bool)
+    for start in range(0, len(pairs), 100000):
+        chunk = pairs[start:start + 100000]
+        similarity = (signatures[chunk[:, 0]] == signatures[chunk[:, 1]]).mean(axis=1)
+        keep[start:start + 100000] = similarity >= threshold
+    sources, targets = pairs[keep, 0], pairs[keep, 1]
+
+    # Bağlı bileşenler: etiketleri en küçük indekse yay ve işaretçi atlamasıyla sıkıştır
+    while True:
+        previous = labels.copy()
+        smallest = np.minimum(labels[sources], labels[targets])
+        np.minimum.at(labels, sources, smallest)
+        np.minimum.at(labels, targets, smallest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+def remove_near_duplicates(df, column='text', threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Yakın kopya başlıkları kaldırır (her kümeden ilk satır kalır).
+    (temiz DataFrame, kaldırılan küme sayısı, kaldırılan satır sayısı) döndürür.
+    """
+    if threshold is None or len(df) < 2:
+        return df, 0, 0
+
+    labels = find_near_duplicate_clusters(df[column].tolist(), threshold)
+    is_representative = labels == np.arange(len(df))
+    cluster_count = len(np.unique(labels[~is_representative]))
+    removed_count = int((~is_representative).sum())
+
+    return df[is_representative], cluster_count, removed_count
+
+def save_and_download(df, output_filename):
+    """DataFrame'i CSV olarak kaydeder, özetini gösterir ve indirir."""
+    try:
+        df.to_csv(output_filename, index=False, encoding='utf-8')
+        print(f"✅ CSV dosyası oluşturuldu: {output_filename}")
+
+        if os.path.exists(output_filename):
+            file_size = os.path.getsize(output_filename)
+            print(f"📁 Dosya boyutu: {file_size} bytes")
+
+            print(f"\n📈 ICD kod dağılımı:")
+            print(df['icd_code'].value_counts().head(10))
+
+            print(f"\n📄 Örnek veriler:")
+            print(df.head())
+
+            files.download(output_filename)
+            print(f"✅ {output_filename} dosyası başarıyla indirildi!")
+
+            # Sütunlu (Parquet/Arrow) kopyaları oluştur ve indir
+            for columnar_filename in save_columnar_dataset(df, output_filename):
+                files.download(columnar_filename)
+
+    except Exception as e:
+        print(f"❌ CSV oluşturma/indirme hatası: {e}")
 
 def find_and_process_filled_articles():
     """
-    Dolu makale listesi olan JSON dosyalarını bul ve işle
+    Dolu makale listesi olan JSON dosyalarını bul ve işle.
+    Arşiv tek geçişte taranır; istatistikler, articles_dataset.csv,
+    umai_labeled_dataset.csv ve gerekirse disease_names_dataset.csv birlikte üretilir.
     """
     print("ZIP dosyasını seçin:")
     uploaded = files.upload()
@@ -28,70 +532,21 @@ def find_and_process_filled_articles():
         print("ZIP içeriği:")
         file_list = zip_ref.namelist()
 
-        # JSON dosyalarını bul
-        json_files = [f for f in file_list if f.endswith('.json')]
-        print(f"Bulunan JSON dosyaları: {len(json_files)} adet")
+    # JSON dosyalarını ve JSONL parçalarını bul
+    json_files = archive_members(file_list)
+    print(f"Bulunan JSON dosyaları / JSONL parçaları: {len(json_files)} adet")
 
-        if not json_files:
-            print("ZIP dosyasında JSON dosyası bulunamadı!")
-            return
+    if not json_files:
+        print("ZIP dosyasında JSON dosyası veya JSONL parçası bulunamadı!")
+        return
 
-        # Verileri işle
-        all_records = []
-        empty_articles_count = 0
-        filled_articles_count = 0
-        processed_count = 0
-        filled_files = []
-
-        for json_file in json_files:
-            try:
-                # JSON dosyasını oku
-                with zip_ref.open(json_file) as f:
-                    data = json.load(f)
-
-                # ICD kodu ve makaleler varsa işle
-                icd_code = data.get('icd_code')
-                disease_name = data.get('disease_name')
-                articles = data.get('articles', [])
-
-                if len(articles) > 0:  # Dolu makale listesi varsa
-                    filled_articles_count += 1
-                    filled_files.append({
-                        'file': json_file,
-                        'icd_code': icd_code,
-                        'disease_name': disease_name,
-                        'article_count': len(articles)
-                    })
-
-                    # Makaleleri işle
-                    if icd_code and articles:
-                        for article in articles:
-                            # Makale yapısını kontrol et
-                            if isinstance(article, dict):
-                                # Başlık alanlarını kontrol et
-                                title = article.get('title') or article.get('name') or article.get('headline')
-                                if title and title.strip():
-                                    all_records.append({
-                                        'text': title.strip(),
-                                        'icd_code': icd_code
-                                    })
-                            elif isinstance(article, str):
-                                # Doğrudan string ise
-                                if article.strip():
-                                    all_records.append({
-                                        'text': article.strip(),
-                                        'icd_code': icd_code
-                                    })
-                else:
-                    empty_articles_count += 1
-
-                processed_count += 1
-                if processed_count % 100 == 0:
-                    print(f"İşlenen dosya sayısı: {processed_count}/{len(json_files)}")
-
-            except Exception as e:
-                print(f"✗ {json_file} işlenirken hata: {e}")
-                continue
+    # Verileri süreç havuzunda paralel ve tek geçişte işle
+    summary = ingest_zip_members(zip_filename, json_files)
+    all_records = summary['texts']
+    empty_articles_count = summary['empty_articles_count']
+    filled_files = summary['filled_files']
+    filled_articles_count = len(filled_files)
+    processed_count = summary['processed_count']
 
     # Sonuçları kontrol et
     print(f"\n📊 İşlem Sonuçları:")
@@ -106,77 +561,55 @@ def find_and_process_filled_articles():
         for file_info in filled_files[:10]:  # İlk 10 dosya
             print(f"  • {file_info['file']}: {file_info['article_count']} makale")
 
+    # Eğitim veri seti (Faz1,5 çıktısı) aynı taramadan oluşturulur
+    labeled_df = pd.DataFrame({'text': summary['labeled_texts'], 'icd_code': summary['labeled_codes']})
+    if not labeled_df.empty:
+        initial_count = len(labeled_df)
+        labeled_df = labeled_df.drop_duplicates(subset=['text'])  # Tekrarları kaldır
+        labeled_df = labeled_df[labeled_df['text'].str.len() > 5]  # Çok kısa metinleri kaldır
+        labeled_df, cluster_count, removed_count = remove_near_duplicates(labeled_df)
+        print(f"Etiketli veri seti yakın kopya: {cluster_count} küme, {removed_count} kayıt kaldırıldı")
+        print(f"\nEtiketli veri seti: {len(labeled_df)} kayıt ({initial_count - len(labeled_df)} kayıt temizlendi)")
+        save_and_download(labeled_df, LABELED_CSV_FILENAME)
+
     if not all_records:
         print("❌ Hiç makale verisi bulunamadı!")
 
-        # Sadece hastalık isimlerini kullan
+        # Sadece hastalık isimlerini kullan (aynı taramada toplandı, arşiv tekrar okunmaz)
         print("\n🔄 Hastalık isimlerini kullanarak veri seti oluşturuluyor...")
-        disease_records = []
 
-        for json_file in json_files:
-            try:
-                with zip_ref.open(json_file) as f:
-                    data = json.load(f)
-
-                icd_code = data.get('icd_code')
-                disease_name = data.get('disease_name')
-
-                if icd_code and disease_name:
-                    disease_records.append({
-                        'text': disease_name.strip(),
-                        'icd_code': icd_code
-                    })
-            except:
-                continue
-
-        if disease_records:
-            df = pd.DataFrame(disease_records)
+        if summary['disease_texts']:
+            df = pd.DataFrame({'text': summary['disease_texts'], 'icd_code': summary['disease_codes']})
             df = df.drop_duplicates(subset=['text'])
 
-            output_filename = 'disease_names_dataset.csv'
-            df.to_csv(output_filename, index=False, encoding='utf-8')
+            df.to_csv(DISEASE_NAMES_CSV_FILENAME, index=False, encoding='utf-8')
 
             print(f"✅ Hastalık isimleri veri seti oluşturuldu: {len(df)} kayıt")
             print(df.head())
 
-            files.download(output_filename)
-            print(f"✅ {output_filename} dosyası indirildi!")
+            files.download(DISEASE_NAMES_CSV_FILENAME)
+            print(f"✅ {DISEASE_NAMES_CSV_FILENAME} dosyası indirildi!")
 
         return
 
     # DataFrame oluştur
-    df = pd.DataFrame(all_records)
+    df = pd.DataFrame({'text': summary['texts'], 'icd_code': summary['codes']})
 
     # Temizlik işlemleri
     initial_count = len(df)
     df = df.drop_duplicates(subset=['text'])
     df = df[df['text'].str.len() > 5]
+
+    # Noktalama/harf/kısaltma farkıyla tekrarlanan başlıkları kaldır
+    df, cluster_count, removed_count = remove_near_duplicates(df)
+    print(f"🔁 Yakın kopya: {cluster_count} küme, {removed_count} kayıt kaldırıldı")
     final_count = len(df)
 
     print(f"\nTemizlik sonrası: {final_count} kayıt ({initial_count - final_count} kayıt temizlendi)")
 
     # CSV olarak kaydet
-    output_filename = 'articles_dataset.csv'
-
-    try:
-        df.to_csv(output_filename, index=False, encoding='utf-8')
-        print(f"✅ CSV dosyası oluşturuldu: {output_filename}")
-
-        if os.path.exists(output_filename):
-            file_size = os.path.getsize(output_filename)
-            print(f"📁 Dosya boyutu: {file_size} bytes")
-
-            print(f"\n📈 ICD kod dağılımı:")
-            print(df['icd_code'].value_counts().head(10))
-
-            print(f"\n📄 Örnek veriler:")
-            print(df.head())
-
-            files.download(output_filename)
-            print(f"✅ {output_filename} dosyası başarıyla indirildi!")
-
-    except Exception as e:
-        print(f"❌ CSV oluşturma/indirme hatası: {e}")
+    save_and_download(df, ARTICLES_CSV_FILENAME)
 
-# Fonksiyonu çalıştır
-find_and_process_filled_articles()
\ No newline at end of file
+# Fonksiyonu çalıştır (Faz1,5 bu dosyayı yardımcı modül olarak yüklediğinde çalışmaz)
+if __name__ == "__main__":
+    find_and_process_filled_articles()
\ No newline at end of file
@@ -2,11 +2,559 @@
 # Traning icin gerekli makale ve icd kodlarinin oldugu son CSV dosyasinin olusturulmasini saglayan kod
 
 import pandas as pd
+import numpy as np
 import json
+import gzip
+import re
 import os
 import zipfile
 from google.colab import files
 import time
+import tempfile
+import contextlib
+import multiprocessing
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# Bu sayının altındaki arşivler tek süreçte işlenir (havuz kurulum maliyeti kazançtan büyük)
+PARALLEL_MIN_FILES = 500
+
+# CSV'ye ek olarak yazılacak sütunlu formatlar ('parquet', 'arrow')
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+# Parquet satır grubu / Arrow kayıt yığını boyutu
+COLUMNAR_ROW_GROUP_SIZE = 64 * 1024
+
+# Yakın kopya başlık eşiği (tahmini Jaccard); None ise aşama atlanır
+NEAR_DUPLICATE_THRESHOLD = 0.8
+NEAR_DUPLICATE_NUM_PERM = 64
+NEAR_DUPLICATE_SHINGLE_SIZE = 5
+# LSH kovasında her satırın karşılaştırıldığı komşu sayısı (bu boyuta kadar kovalarda tüm çiftler)
+NEAR_DUPLICATE_BUCKET_WINDOW = 16
+
+def json_loads(raw):
+    """Varsa orjson, yoksa standart json ile bayt dizisini çözümler."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # BOM, NaN gibi orjson'un kabul etmediği girdiler için standart json'a düş
+            pass
+    return json.loads(raw)
+
+# Faz1,3 makale deposu modunun dışa aktarım dosyası (kod kayıtları yalnızca article_refs tutar)
+ARTICLE_STORE_FILENAME = 'articles_store.jsonl'
+
+# article_id -> makale; ingest_zip_members tarafından havuz kurulmadan önce doldurulur (fork ile işçilere geçer)
+_ARTICLE_STORE = {}
+
+def load_article_store(zip_filename):
+    """Arşivdeki makale deposunu (varsa) belleğe yükler ve makale sayısını döndürür."""
+    global _ARTICLE_STORE
+    _ARTICLE_STORE = {}
+
+    with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
+        for member in zip_ref.namelist():
+            if member.endswith(ARTICLE_STORE_FILENAME):
+                with zip_ref.open(member) as f:
+                    for line in f:
+                        if line.strip():
+                            record = json_loads(line)
+                            _ARTICLE_STORE[record.pop('article_id')] = record
+
+    return len(_ARTICLE_STORE)
+
+# Faz1,3 JSONL modunun parçaları (her kayıt ayrı gzip üyesi, satır başına bir kod) ve indeksi
+JSONL_SHARD_SUFFIX = '.jsonl.gz'
+JSONL_INDEX_FILENAME = 'index.jsonl'
+
+# parça üye adı -> [(ofset, uzunluk)]; her kodun yalnızca son yazılan kaydı (yeniden denemeler eskisini ezer)
+_SHARD_INDEX = {}
+
+def archive_members(file_list):
+    """Arşivdeki kod kayıtlarını taşıyan üyeleri döndürür: tekil JSON dosyaları ve JSONL parçaları."""
+    return [f for f in file_list if f.endswith('.json') or f.endswith(JSONL_SHARD_SUFFIX)]
+
+def load_shard_index(zip_filename):
+    """JSONL parçalarının indeks dosyalarını (varsa) okur ve indekslenen kayıt sayısını döndürür."""
+    global _SHARD_INDEX
+    _SHARD_INDEX = {}
+
+    with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
+        for member in zip_ref.namelist():
+            if member.rsplit('/', 1)[-1] != JSONL_INDEX_FILENAME:
+                continue
+
+            prefix = member[:-len(JSONL_INDEX_FILENAME)]
+            latest = {}
+            with zip_ref.open(member) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json_loads(line)
+                        latest[entry['icd_code']] = (prefix + entry['shard'], entry['offset'], entry['length'])
+
+            for shard, offset, length in latest.values():
+                _SHARD_INDEX.setdefault(shard, []).append((offset, length))
+
+    for entries in _SHARD_INDEX.values():
+        entries.sort()
+    return sum(len(entries) for entries in _SHARD_INDEX.values())
+
+def read_member_records(zip_ref, member):
+    """
+    Üyedeki kod kayıtlarını çözümlenmemiş (ad, bayt) çiftleri olarak döndürür. JSON dosyası tek
+    kayıttır; JSONL parçasında indeks varsa yalnızca indekslenen kayıtlar ofsetinden, yoksa tüm satırlar okunur.
+    """
+    raw = zip_ref.read(member)
+    if not member.endswith(JSONL_SHARD_SUFFIX):
+        return [(member, raw)]
+
+    entries = _SHARD_INDEX.get(member)
+    if entries:
+        lines = [gzip.decompress(raw[offset:offset + length]) for offset, length in entries]
+    else:
+        lines = gzip.decompress(raw).splitlines()
+
+    return [(f"{member}#{line_no}", line) for line_no, line in enumerate(line for line in lines if line.strip())]
+
+def resolve_articles(data):
+    """Kod kaydının makale listesini döndürür; depo modundaki article_refs referanslarını çözer."""
+    if 'articles' in data or 'article_refs' not in data:
+        return data.get('articles', [])
+    refs = sorted(data['article_refs'], key=lambda ref: ref['rank'])
+    return [_ARTICLE_STORE[ref['article_id']] for ref in refs if ref['article_id'] in _ARTICLE_STORE]
+
+def _ingest_zip_chunk(zip_filename, members):
+    """
+    Bir grup ZIP üyesini açıp çözümler (işçi süreçte çalışır).
+    Sonuçlar sütun listeleri olarak döner; böylece süreçler arası aktarım ucuz kalır.
+    """
+    texts = []
+    codes = []
+    errors = []
+    processed = 0
+
+    with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
+        for member in members:
+            try:
+                records = read_member_records(zip_ref, member)
+            except Exception as e:
+                errors.append((member, str(e)))
+                continue
+
+            for json_file, raw in records:
+                try:
+                    data = json_loads(raw)
+
+                    # ICD kodu ve makaleler varsa işle
+                    icd_code = data.get('icd_code')
+                    articles = resolve_articles(data)
+
+                    if icd_code and articles:
+                        for article in articles:
+                            title = article.get('title', '').strip()
+                            if title:  # Boş olmayan başlıklar
+                                texts.append(title)
+                                codes.append(icd_code)
+
+                    processed += 1
+
+                except Exception as e:
+                    errors.append((json_file, str(e)))
+
+    return texts, codes, processed, errors
+
+def ingest_zip_members(zip_filename, json_files, workers=None, chunk_size=None):
+    """
+    JSON dosyası ve JSONL parçası üyelerini süreç havuzunda paralel açıp çözümler ve sonuçları
+    arşiv sırasını koruyarak tek bir (text, icd_code) DataFrame'inde birleştirir.
+    (DataFrame, işlenen kayıt sayısı) döner.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    # Depo modunda üretilmiş arşivlerde makale gövdeleri ayrı dosyadadır
+    store_size = load_article_store(zip_filename)
+    if store_size:
+        print(f"Makale deposu yüklendi: {store_size} tekil makale")
+
+    # JSONL modunda aynı kodun eski kayıtları indeksle elenir
+    indexed_count = load_shard_index(zip_filename)
+    if indexed_count:
+        print(f"JSONL parça indeksi yüklendi: {indexed_count} kod kaydı")
+    texts = []
+    codes = []
+    processed_count = 0
+
+    # JSONL parçaları yüzlerce kayıt taşır; her biri tek başına bir iş parçasıdır
+    shard_files = [f for f in json_files if f.endswith(JSONL_SHARD_SUFFIX)]
+    single_files = [f for f in json_files if not f.endswith(JSONL_SHARD_SUFFIX)]
+
+    if workers == 1 or (len(single_files) < PARALLEL_MIN_FILES and len(shard_files) < 2):
+        chunks = [json_files]
+    else:
+        # Her işçiye birden fazla parça düşsün ki yavaş parçalar yükü dengesizleştirmesin
+        chunk_size = chunk_size or max(50, -(-len(single_files) // (workers * 4)))
+        chunks = [single_files[i:i + chunk_size] for i in range(0, len(single_files), chunk_size)]
+        chunks += [[shard_file] for shard_file in shard_files]
+    done_members = 0
+
+    def merge(results):
+        nonlocal processed_count, done_members
+        for chunk, (chunk_texts, chunk_codes, processed, errors) in zip(chunks, results):
+            done_members += len(chunk)
+            texts.extend(chunk_texts)
+            codes.extend(chunk_codes)
+            processed_count += processed
+            for json_file, error in errors:
+                print(f"✗ {json_file} işlenirken hata: {error}")
+            print(f"İşlenen kayıt sayısı: {processed_count} ({done_members}/{len(json_files)} arşiv üyesi)")
+
+    if len(chunks) == 1:
+        merge(map(_ingest_zip_chunk, [zip_filename], chunks))
+    else:
+        # Colab/Jupyter'da tanımlı fonksiyonlar spawn ile aktarılamaz; fork tercih edilir
+        mp_context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+            merge(executor.map(_ingest_zip_chunk, repeat(zip_filename), chunks))
+
+    return pd.DataFrame({'text': texts, 'icd_code': codes}), processed_count
+
+def _write_jsonl_shards(zip_ref, records, prefix='collected_data/content/collected_jsonl', records_per_shard=1000):
+    """
+    Kayıtları Faz1,3 JSONL modunun arşiv düzeninde yazar: her kayıt ayrı gzip üyesi olan
+    shard-NNNNN.jsonl.gz parçaları ve (kod, parça, ofset, uzunluk) satırlı index.jsonl.
+    """
+    index_lines = []
+    for shard_no, start in enumerate(range(0, len(records), records_per_shard)):
+        shard = f"shard-{shard_no:05d}.jsonl.gz"
+        payloads = []
+        offset = 0
+        for data in records[start:start + records_per_shard]:
+            payload = gzip.compress((json.dumps(data, ensure_ascii=False) + "\n").encode('utf-8'), mtime=0)
+            index_lines.append(json.dumps({'icd_code': data['icd_code'], 'shard': shard,
+                                           'offset': offset, 'length': len(payload)}, ensure_ascii=False))
+            payloads.append(payload)
+            offset += len(payload)
+        zip_ref.writestr(f"{prefix}/{shard}", b''.join(payloads))
+    zip_ref.writestr(f"{prefix}/{JSONL_INDEX_FILENAME}", "\n".join(index_lines) + "\n")
+
+def benchmark_zip_ingestion(n_files=50000, articles_per_file=5, worker_counts=None, output_format='json'):
+    """
+    Sentetik bir arşivde farklı işçi sayılarıyla ingestion hızını ölçer.
+    output_format='jsonl' arşivi Faz1,3 JSONL parçaları olarak yazar (ilk kodun eski bir kaydı
+    da parçada kalır); her iki modda okunan başlık sayısı yazılanla karşılaştırılır.
+    """
+    worker_counts = worker_counts or sorted({1, 2, os.cpu_count() or 1})
+    results = []
+
+    records = [{
+        'icd_code': f"{chr(65 + i % 26)}{i % 100:02d}.{i % 10}-{i}",
+        'disease_name': f"Hastalık {i}",
+        'articles': [{'title': f"Makale {i}-{j} başlığı", 'abstract': 'Özet ' * 40}
+                     for j in range(articles_per_file)]
+    } for i in range(n_files)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_filename = os.path.join(tmp_dir, 'benchmark.zip')
+        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
+            if output_format == 'jsonl':
+                # Yeniden denenen kodun eski kaydı indeksle ezilmiş olmalı
+                stale = dict(records[0], articles=[{'title': 'Eski kayıt başlığı'}])
+                _write_jsonl_shards(zip_ref, [stale] + records)
+            elif output_format == 'json':
+                for i, data in enumerate(records):
+                    zip_ref.writestr(f"collected_json/{i}.json", json.dumps(data, ensure_ascii=False))
+            else:
+                raise ValueError(f"Desteklenmeyen format: {output_format}")
+
+        with zipfile.ZipFile(zip_filename, 'r') as zip_ref:
+            json_files = archive_members(zip_ref.namelist())
+
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            # İlerleme çıktısı ölçümü bozmasın
+            with open(os.devnull, 'w') as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    df, processed = ingest_zip_members(zip_filename, json_files, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            if len(df) != n_files * articles_per_file or 'Eski kayıt başlığı' in set(df['text']):
+                raise RuntimeError(f"{output_format} okuma hatalı: {len(df)} başlık, "
+                                   f"beklenen {n_files * articles_per_file}")
+
+            baseline = baseline or elapsed
+            results.append({'workers': workers, 'seconds': elapsed, 'files_per_sec': processed / elapsed,
+                            'speedup': baseline / elapsed, 'records': len(df)})
+            print(f"{workers} işçi: {elapsed:.2f} sn, {processed / elapsed:.0f} dosya/sn, "
+                  f"hızlanma {baseline / elapsed:.2f}x")
+
+    return results
+
+def _to_arrow_table(df):
+    """
+    (text, icd_code) DataFrame'ini Arrow tablosuna çevirir.
+    Satırlar icd_code'a göre (kararlı) sıralanır; böylece her satır grubu dar bir kod aralığı
+    kapsar ve kod filtreleri istatistiklerle grup atlayabilir. icd_code sözlük kodludur.
+    """
+    df = df.sort_values('icd_code', kind='stable')
+    return pa.table({
+        'text': pa.array(df['text'].to_numpy(), type=pa.string()),
+        'icd_code': pa.array(df['icd_code'].to_numpy(), type=pa.string()).dictionary_encode()
+    })
+
+def save_columnar_dataset(df, csv_filename, formats=COLUMNAR_FORMATS):
+    """
+    Veri setini Parquet (sıkıştırılmış, satır grubu istatistikli) ve/veya Arrow IPC
+    (sıkıştırmasız, bellek eşlemeli sıfır kopya okuma) olarak yazar. Yazılan dosya adlarını döndürür.
+    """
+    if pa is None:
+        print("⚠️ pyarrow yüklü değil, sütunlu çıktı atlandı (pip install pyarrow)")
+        return []
+
+    table = _to_arrow_table(df)
+    base_name = os.path.splitext(csv_filename)[0]
+    written = []
+
+    for output_format in formats:
+        if output_format == 'parquet':
+            output_filename = base_name + '.parquet'
+            pq.write_table(table, output_filename, row_group_size=COLUMNAR_ROW_GROUP_SIZE,
+                           use_dictionary=True, write_statistics=True, compression='zstd')
+        elif output_format == 'arrow':
+            output_filename = base_name + '.arrow'
+            with pa.OSFile(output_filename, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table, max_chunksize=COLUMNAR_ROW_GROUP_SIZE)
+        else:
+            raise ValueError(f"Desteklenmeyen format: {output_format}")
+
+        print(f"✓ {output_format} dosyası oluşturuldu: {output_filename} "
+              f"({os.path.getsize(output_filename)} bytes)")
+        written.append(output_filename)
+
+    return written
+
+def load_labeled_dataset(path, columns=None, icd_codes=None, as_pandas=True):
+    """
+    Etiketli veri setini CSV, Parquet veya Arrow dosyasından yükler.
+    columns: yalnızca okunacak sütunlar; icd_codes: yalnızca bu kodlara ait satırlar.
+    Arrow dosyaları bellek eşlemeyle açılır ve as_pandas=False ise kopyalanmadan döner.
+    """
+    columns = list(columns) if columns else None
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.csv':
+        read_columns = None
+        if columns:
+            read_columns = columns + (['icd_code'] if icd_codes is not None and 'icd_code' not in columns else [])
+        df = pd.read_csv(path, usecols=read_columns, dtype=str, keep_default_na=False)
+        if icd_codes is not None:
+            df = df[df['icd_code'].isin(set(icd_codes))]
+        return df[columns] if columns else df
+
+    if pa is None:
+        raise ImportError("Parquet/Arrow okumak için pyarrow gerekli: pip install pyarrow")
+
+    if extension == '.parquet':
+        # Kod filtresi satır grubu istatistikleriyle ilgisiz grupları hiç okumaz
+        filters = [('icd_code', 'in', list(icd_codes))] if icd_codes is not None else None
+        table = pq.read_table(path, columns=columns, filters=filters, memory_map=True)
+    elif extension in ('.arrow', '.feather'):
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+        if icd_codes is not None:
+            mask = pc.is_in(table.column('icd_code'), value_set=pa.array(list(icd_codes), type=pa.string()))
+            table = table.filter(mask)
+        if columns:
+            table = table.select(columns)
+    else:
+        raise ValueError(f"Desteklenmeyen dosya uzantısı: {extension}")
+
+    return table.to_pandas() if as_pandas else table
+
+def benchmark_dataset_load(n_rows=1000000, n_codes=5000, subset_size=10):
+    """
+    Aynı veri setini CSV, Parquet ve Arrow olarak yazar; tam yükleme, tek sütun
+    ve kod alt kümesi yükleme sürelerini ve dosya boyutlarını karşılaştırır.
+    """
+    if pa is None:
+        print("⚠️ pyarrow yüklü değil, benchmark atlandı")
+        return []
+
+    rng = np.random.default_rng(42)
+    code_pool = np.array([f"{chr(65 + i % 26)}{(i // 26) % 100:02d}.{i % 10}" for i in range(n_codes)])
+    df = pd.DataFrame({
+        'text': [f"Makale başlığı {i} hastalık çalışması sonuçları" for i in range(n_rows)],
+        'icd_code': code_pool[rng.integers(0, n_codes, n_rows)]
+    })
+    subset = list(code_pool[:subset_size])
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, 'dataset.csv')
+        df.to_csv(csv_path, index=False, encoding='utf-8')
+        with open(os.devnull, 'w') as devnull:
+            with contextlib.redirect_stdout(devnull):
+                save_columnar_dataset(df, csv_path)
+
+        for extension in ('.csv', '.parquet', '.arrow'):
+            path = os.path.splitext(csv_path)[0] + extension
+            timings = {}
+            for label, kwargs in (('full', {}), ('icd_code', {'columns': ['icd_code']}),
+                                  ('subset', {'icd_codes': subset})):
+                start = time.perf_counter()
+                loaded = load_labeled_dataset(path, **kwargs)
+                timings[label] = time.perf_counter() - start
+                if label == 'subset':
+                    subset_rows = len(loaded)
+
+            results.append({'format': extension[1:], 'bytes': os.path.getsize(path),
+                            'subset_rows': subset_rows, **timings})
+            print(f"{extension[1:]:>8}: {os.path.getsize(path) / 1e6:7.1f} MB | tam {timings['full']:.2f} sn | "
+                  f"icd_code {timings['icd_code']:.2f} sn | {subset_size} kod {timings['subset']:.3f} sn "
+                  f"({subset_rows} satır)")
+
+    return results
+
+def normalize_title(title):
+    """Büyük/küçük harf, noktalama ve boşluk farklarını yok sayan karşılaştırma metni."""
+    title = re.sub(r'[^\w\s]', ' ', str(title).casefold())
+    return re.sub(r'\s+', ' ', title).strip()
+
+def _lsh_bands(threshold, num_perm):
+    """
+    num_perm'i bölen (band, satır) çiftlerinden S eğrisinin eşiği (1/b)^(1/r) hedef eşiğin
+    altında kalan en yakın olanı seçer; kaçan çiftler yerine fazla aday tercih edilir
+    (adaylar imza benzerliğiyle ayrıca doğrulanır).
+    """
+    pairs = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    below = [pair for pair in pairs if (1 / pair[0]) ** (1 / pair[1]) <= threshold]
+    return max(below or pairs, key=lambda pair: (1 / pair[0]) ** (1 / pair[1]))
+
+def minhash_signatures(texts, num_perm=NEAR_DUPLICATE_NUM_PERM, shingle_size=NEAR_DUPLICATE_SHINGLE_SIZE,
+                       seed=42, batch_size=5000):
+    """
+    Metinlerin karakter k-gram (UTF-8 bayt) kümeleri için MinHash imzalarını hesaplar.
+    Shingle hash'leri ve permütasyonlar numpy ile toplu hesaplanır; süre toplam metin uzunluğuyla doğrusal.
+    """
+    rng = np.random.default_rng(seed)
+    # Çarp-kaydır hash ailesi: ((a * x + b) mod 2^64) >> 32, a tek sayı
+    a = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    powers = np.array([pow(1099511628211, j, 2 ** 64) for j in range(shingle_size)], dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    perm_chunk = 16
+
+    for batch_start in range(0, len(texts), batch_size):
+        # k'dan kısa metinler tek bir shingle olacak şekilde boşlukla doldurulur
+        encoded = [text.encode('utf-8').ljust(shingle_size) for text in texts[batch_start:batch_start + batch_size]]
+        lengths = np.array([len(item) for item in encoded], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        buffer = np.frombuffer(b''.join(encoded) + b'\0' * shingle_size, dtype=np.uint8).astype(np.uint64)
+
+        # Her bayt pozisyonundan başlayan k-gram'ın polinom hash'i
+        total = int(lengths.sum())
+        shingle_hashes = np.zeros(total, dtype=np.uint64)
+        for j in range(shingle_size):
+            shingle_hashes += buffer[j:j + total] * powers[j]
+
+        # Metin sınırını aşan k-gram'ları at
+        text_ids = np.repeat(np.arange(len(encoded)), lengths)
+        valid = (np.arange(total) - offsets[text_ids]) <= (lengths[text_ids] - shingle_size)
+        shingle_hashes = shingle_hashes[valid]
+        group_starts = np.concatenate(([0], np.cumsum(lengths - shingle_size + 1)[:-1]))
+
+        for perm_start in range(0, num_perm, perm_chunk):
+            perm_end = min(perm_start + perm_chunk, num_perm)
+            values = ((shingle_hashes[:, None] * a[perm_start:perm_end] + b[perm_start:perm_end])
+                      >> np.uint64(32)).astype(np.uint32)
+            signatures[batch_start:batch_start + len(encoded), perm_start:perm_end] = \
+                np.minimum.reduceat(values, group_starts, axis=0)
+
+    return signatures
+
+def find_near_duplicate_clusters(texts, threshold=NEAR_DUPLICATE_THRESHOLD, num_perm=NEAR_DUPLICATE_NUM_PERM,
+                                 shingle_size=NEAR_DUPLICATE_SHINGLE_SIZE):
+    """
+    MinHash + LSH bantlama ile yakın kopya kümelerini bulur.
+    Her satır için küme temsilcisinin (kümedeki ilk satır) indeksini döndürür.
+    """
+    n = len(texts)
+    labels = np.arange(n)
+    if n < 2:
+        return labels
+
+    signatures = minhash_signatures([normalize_title(text) for text in texts], num_perm, shingle_size)
+    bands, rows = _lsh_bands(threshold, num_perm)
+    multipliers = np.random.default_rng(7).integers(1, 2 ** 63, rows, dtype=np.uint64) | np.uint64(1)
+
+    # Aynı bant kovasındaki satırlar, sıralı kovada NEAR_DUPLICATE_BUCKET_WINDOW kadar uzaktaki
+    # üyelerle aday çift oluşturur; küçük kovalarda tüm çiftler karşılaştırılır, böylece ilk
+    # satırla eşleşmeyen iki varyant da birbiriyle doğrulanır
+    sources = []
+    targets = []
+    for band in range(bands):
+        keys = (signatures[:, band * rows:(band + 1) * rows].astype(np.uint64) * multipliers).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        for offset in range(1, min(NEAR_DUPLICATE_BUCKET_WINDOW, n - 1) + 1):
+            same_bucket = sorted_keys[offset:] == sorted_keys[:-offset]
+            if not same_bucket.any():
+                break
+            sources.append(order[:-offset][same_bucket])
+            targets.append(order[offset:][same_bucket])
+
+    if not sources:
+        return labels
+
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    pairs = np.unique(np.sort(np.stack([sources, targets], axis=1), axis=1), axis=0)
+
+    # Adayları tahmini Jaccard benzerliğiyle doğrula
+    keep = np.zeros(len(pairs), dtype=bool)
+    for start in range(0, len(pairs), 100000):
+        chunk = pairs[start:start + 100000]
+        similarity = (signatures[chunk[:, 0]] == signatures[chunk[:, 1]]).mean(axis=1)
+        keep[start:start + 100000] = similarity >= threshold
+    sources, targets = pairs[keep, 0], pairs[keep, 1]
+
+    # Bağlı bileşenler: etiketleri en küçük indekse yay ve işaretçi atlamasıyla sıkıştır
+    while True:
+        previous = labels.copy()
+        smallest = np.minimum(labels[sources], labels[targets])
+        np.minimum.at(labels, sources, smallest)
+        np.minimum.at(labels, targets, smallest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+def remove_near_duplicates(df, column='text', threshold=NEAR_DUPLICATE_THRESHOLD):
+    """
+    Yakın kopya başlıkları kaldırır (her kümeden ilk satır kalır).
+    (temiz DataFrame, kaldırılan küme sayısı, kaldırılan satır sayısı) döndürür.
+    """
+    if threshold is None or len(df) < 2:
+        return df, 0, 0
+
+    labels = find_near_duplicate_clusters(df[column].tolist(), threshold)
+    is_representative = labels == np.arange(len(df))
+    cluster_count = len(np.unique(labels[~is_representative]))
+    removed_count = int((~is_representative).sum())
+
+    return df[is_representative], cluster_count, removed_count
 
 def process_zip_data():
     """
@@ -28,59 +576,32 @@ def process_zip_data():
         print("ZIP içeriği:")
         file_list = zip_ref.namelist()
 
-        # JSON dosyalarını bul
-        json_files = [f for f in file_list if f.endswith('.json')]
-        print(f"Bulunan JSON dosyaları: {len(json_files)} adet")
+    # JSON dosyalarını ve JSONL parçalarını bul
+    json_files = archive_members(file_list)
+    print(f"Bulunan JSON dosyaları / JSONL parçaları: {len(json_files)} adet")
 
-        if not json_files:
-            print("ZIP dosyasında JSON dosyası bulunamadı!")
-            return
-
-        # Verileri işle
-        all_records = []
-        processed_count = 0
+    if not json_files:
+        print("ZIP dosyasında JSON dosyası veya JSONL parçası bulunamadı!")
+        return
 
-        for json_file in json_files:
-            try:
-                # JSON dosyasını oku
-                with zip_ref.open(json_file) as f:
-                    data = json.load(f)
-
-                # ICD kodu ve makaleler varsa işle
-                icd_code = data.get('icd_code')
-                articles = data.get('articles', [])
-
-                if icd_code and articles:
-                    for article in articles:
-                        title = article.get('title', '').strip()
-                        if title:  # Boş olmayan başlıklar
-                            all_records.append({
-                                'text': title,
-                                'icd_code': icd_code
-                            })
-
-                processed_count += 1
-                if processed_count % 10 == 0:
-                    print(f"İşlenen dosya sayısı: {processed_count}/{len(json_files)}")
-
-            except Exception as e:
-                print(f"✗ {json_file} işlenirken hata: {e}")
-                continue
+    # Verileri süreç havuzunda paralel işle
+    df, processed_count = ingest_zip_members(zip_filename, json_files)
 
     # Sonuçları kontrol et
-    if not all_records:
+    if df.empty:
         print("Hiç veri bulunamadı!")
         return
 
-    print(f"\nToplam {len(all_records)} kayıt bulundu")
-
-    # DataFrame oluştur
-    df = pd.DataFrame(all_records)
+    print(f"\nToplam {len(df)} kayıt bulundu")
 
     # Temizlik işlemleri
     initial_count = len(df)
     df = df.drop_duplicates(subset=['text'])  # Tekrarları kaldır
     df = df[df['text'].str.len() > 5]  # Çok kısa metinleri kaldır
+
+    # Noktalama/harf/kısaltma farkıyla tekrarlanan başlıkları kaldır
+    df, cluster_count, removed_count = remove_near_duplicates(df)
+    print(f"Yakın kopya: {cluster_count} küme, {removed_count} kayıt kaldırıldı")
     final_count = len(df)
 
     print(f"Temizlik sonrası: {final_count} kayıt ({initial_count - final_count} kayıt temizlendi)")
@@ -113,6 +634,10 @@ def process_zip_data():
             files.download(output_filename)
             print(f"✓ {output_filename} dosyası başarıyla indirildi!")
 
+            # Sütunlu (Parquet/Arrow) kopyaları oluştur ve indir
+            for columnar_filename in save_columnar_dataset(df, output_filename):
+                files.download(columnar_filename)
+
         else:
             print("❌ CSV dosyası oluşturulamadı!")
 
@@ -0,0 +1,313 @@
+# Etiketli veri setindeki makale başlıklarını cümle vektörlerine çeviren ve kalıcı vektör deposuna yazan kod
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import time
+import shutil
+import hashlib
+import resource
+import tempfile
+import zipfile
+from google.colab import files
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Türkçe ve İngilizce başlıkları aynı uzayda kodlayan çok dilli model
+EMBEDDING_MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+EMBEDDING_BATCH_SIZE = 64
+# Her bu kadar yeni vektörde depoya yazılır (yarıda kalan çalışma kaldığı yerden devam eder)
+EMBEDDING_FLUSH_SIZE = 4096
+EMBEDDING_STORE_DIR = 'umai_embeddings'
+
+def text_hash(text):
+    """Metnin 16 baytlık özeti (vektör deposu anahtarı)."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+class EmbeddingStore:
+    """
+    Metin özetine göre anahtarlanan, yalnızca eklemeli float16 vektör deposu.
+    vectors.f16 satır satır vektörleri, keys.bin aynı sıradaki 16 baytlık özetleri tutar;
+    meta.json'daki satır sayısı en son yazılır, böylece yarım kalan ekleme açılışta kesilir.
+    Vektörler np.memmap ile okunur, depo belleğe yüklenmez.
+    """
+
+    VECTORS_FILENAME = 'vectors.f16'
+    KEYS_FILENAME = 'keys.bin'
+    META_FILENAME = 'meta.json'
+    KEY_DTYPE = np.dtype('S16')
+
+    def __init__(self, path=EMBEDDING_STORE_DIR, model_name=EMBEDDING_MODEL_NAME, dim=None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        meta_path = os.path.join(path, self.META_FILENAME)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+            if self.meta['model'] != model_name:
+                raise ValueError(f"Depo '{self.meta['model']}' modeliyle oluşturulmuş, '{model_name}' ile kullanılamaz")
+            if dim is not None and self.meta['dim'] != dim:
+                raise ValueError(f"Depo boyutu {self.meta['dim']}, model boyutu {dim}")
+        else:
+            if dim is None:
+                raise ValueError("Yeni depo için vektör boyutu (dim) gerekli")
+            self.meta = {'model': model_name, 'dim': int(dim), 'count': 0, 'dtype': 'float16'}
+            self._write_meta()
+
+        self.dim = self.meta['dim']
+        self._truncate_to_count()
+        self._load_keys()
+        self._vectors = None
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _write_meta(self):
+        temp_path = self._file(self.META_FILENAME) + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._file(self.META_FILENAME))
+
+    def _truncate_to_count(self):
+        """meta.json'a işlenmemiş (yarım kalan) eklemeleri dosyalardan keser."""
+        count = self.meta['count']
+        for name, row_bytes in ((self.VECTORS_FILENAME, self.dim * 2), (self.KEYS_FILENAME, self.KEY_DTYPE.itemsize)):
+            file_path = self._file(name)
+            if not os.path.exists(file_path):
+                open(file_path, 'wb').close()
+            if os.path.getsize(file_path) > count * row_bytes:
+                with open(file_path, 'r+b') as f:
+                    f.truncate(count * row_bytes)
+
+    def _load_keys(self):
+        """Özetleri ve ikili arama için sıralı kopyalarını yükler."""
+        self.keys = np.fromfile(self._file(self.KEYS_FILENAME), dtype=self.KEY_DTYPE, count=self.meta['count'])
+        self._order = np.argsort(self.keys, kind='stable')
+        self._sorted_keys = self.keys[self._order]
+
+    def _merge_keys(self, hashes, first_row):
+        """Yeni özetleri diskten yeniden okumadan sıralı diziye yerleştirir (tam argsort yerine sıralı birleştirme)."""
+        new_order = np.argsort(hashes, kind='stable')
+        new_sorted = hashes[new_order]
+        positions = np.searchsorted(self._sorted_keys, new_sorted, side='right')
+        self._sorted_keys = np.insert(self._sorted_keys, positions, new_sorted)
+        self._order = np.insert(self._order, positions, new_order + first_row)
+        self.keys = np.concatenate([self.keys, hashes])
+
+    def __len__(self):
+        return self.meta['count']
+
+    @property
+    def vectors(self):
+        """(satır, dim) float16 memmap; ekleme sonrası yeniden açılır."""
+        if self._vectors is None or len(self._vectors) != len(self):
+            if len(self) == 0:
+                return np.zeros((0, self.dim), dtype=np.float16)
+            self._vectors = np.memmap(self._file(self.VECTORS_FILENAME), dtype=np.float16, mode='r',
+                                      shape=(len(self), self.dim))
+        return self._vectors
+
+    def lookup(self, hashes):
+        """Özetlerin depo satırlarını döndürür; depoda olmayanlar için -1."""
+        hashes = np.asarray(hashes, dtype=self.KEY_DTYPE)
+        rows = np.full(len(hashes), -1, dtype=np.int64)
+        if len(self) == 0 or len(hashes) == 0:
+            return rows
+
+        positions = np.searchsorted(self._sorted_keys, hashes)
+        positions = np.minimum(positions, len(self._sorted_keys) - 1)
+        found = self._sorted_keys[positions] == hashes
+        rows[found] = self._order[positions[found]]
+        return rows
+
+    def append(self, hashes, vectors):
+        """Yeni vektörleri ekler; önce veri, sonra anahtarlar, en son satır sayısı yazılır."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float16)
+        hashes = np.asarray(hashes, dtype=self.KEY_DTYPE)
+        if vectors.shape != (len(hashes), self.dim):
+            raise ValueError(f"Vektör biçimi {vectors.shape}, beklenen ({len(hashes)}, {self.dim})")
+
+        for name, payload in ((self.VECTORS_FILENAME, vectors), (self.KEYS_FILENAME, hashes)):
+            with open(self._file(name), 'ab') as f:
+                f.write(payload.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        first_row = self.meta['count']
+        self.meta['count'] += len(hashes)
+        self._write_meta()
+        self._merge_keys(hashes, first_row)
+
+    def get(self, texts):
+        """Metinlerin vektörlerini (float16) döndürür; depoda olmayan metin varsa KeyError."""
+        rows = self.lookup([text_hash(text) for text in texts])
+        if (rows < 0).any():
+            raise KeyError(f"{int((rows < 0).sum())} metnin vektörü depoda yok")
+        return np.asarray(self.vectors[rows])
+
+def load_embedding_model(model_name=EMBEDDING_MODEL_NAME, device='cpu'):
+    """sentence-transformers modelini yükler."""
+    if SentenceTransformer is None:
+        raise ImportError("sentence-transformers yüklü değil (pip install sentence-transformers)")
+    return SentenceTransformer(model_name, device=device)
+
+def length_sorted_batches(texts, batch_size=EMBEDDING_BATCH_SIZE, sort_by_length=True):
+    """
+    Metin indekslerini uzunluğa göre (uzundan kısaya) sıralayıp yığınlara böler;
+    benzer uzunluktaki başlıklar aynı yığında olduğundan dolgu (padding) hesabı azalır.
+    """
+    order = np.arange(len(texts))
+    if sort_by_length:
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        order = np.argsort(-lengths, kind='stable')
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+def embed_texts(texts, store, model, batch_size=EMBEDDING_BATCH_SIZE, flush_size=EMBEDDING_FLUSH_SIZE,
+                sort_by_length=True, show_progress=True):
+    """
+    Metinlerin depo satırlarını döndürür. Yalnızca depoda olmayan (yeni veya değişmiş) metinler
+    kodlanır; tekrar eden metinler bir kez kodlanır. Vektörler L2 normlu float16 olarak saklanır.
+    """
+    texts = [str(text) for text in texts]
+    hashes = np.array([text_hash(text) for text in texts], dtype=EmbeddingStore.KEY_DTYPE)
+
+    unique_hashes, first_index = np.unique(hashes, return_index=True)
+    missing = first_index[store.lookup(unique_hashes) < 0]
+    missing_texts = [texts[i] for i in missing]
+    missing_hashes = hashes[missing]
+
+    if show_progress:
+        print(f"{len(texts)} metin, {len(unique_hashes)} tekil, {len(missing_texts)} yeni metin kodlanacak")
+
+    pending_hashes, pending_vectors, pending_count = [], [], 0
+    encoded = 0
+    batches = length_sorted_batches(missing_texts, batch_size, sort_by_length)
+    for batch_no, batch in enumerate(batches, 1):
+        vectors = model.encode([missing_texts[i] for i in batch], batch_size=len(batch),
+                               convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+        pending_hashes.append(missing_hashes[batch])
+        pending_vectors.append(vectors.astype(np.float16))
+        pending_count += len(batch)
+
+        if pending_count >= flush_size or batch_no == len(batches):
+            store.append(np.concatenate(pending_hashes), np.concatenate(pending_vectors))
+            encoded += pending_count
+            pending_hashes, pending_vectors, pending_count = [], [], 0
+            if show_progress:
+                print(f"  {encoded}/{len(missing_texts)} vektör yazıldı")
+
+    return store.lookup(hashes)
+
+def peak_rss_mb():
+    """Sürecin şimdiye kadarki tepe bellek kullanımı (MB, Linux'ta ru_maxrss KB cinsindendir)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def benchmark_embedding(n_texts=20000, changed_fraction=0.1, model=None, batch_size=EMBEDDING_BATCH_SIZE):
+    """
+    Sentetik başlıklarla gömme hızını ölçer: uzunluğa göre sıralı ve sırasız yığınlarla
+    soğuk çalışma (kodlanan cümle/sn), ardından başlıkların bir kısmı değiştirilerek yeniden çalışma
+    (yalnızca değişenler kodlanmalı; depodan gelenler dahil toplam metin/sn ayrıca raporlanır).
+    Tepe bellek ve depo boyutu raporlanır.
+    """
+    if model is None:
+        if SentenceTransformer is None:
+            print("⚠️ sentence-transformers yüklü değil, benchmark atlandı")
+            return []
+        model = load_embedding_model()
+
+    rng = np.random.default_rng(42)
+    words = np.array(['cardiac', 'chronic', 'renal', 'failure', 'patients', 'randomized', 'trial', 'outcomes',
+                      'diabetes', 'mellitus', 'type', 'risk', 'cohort', 'study', 'analysis', 'children',
+                      'treatment', 'infection', 'acute', 'syndrome', 'hastalık', 'tedavi', 'sonuçları'])
+    lengths = rng.integers(4, 30, n_texts)
+    texts = [f"{i} " + " ".join(words[rng.integers(0, len(words), n)]) for i, n in enumerate(lengths)]
+    dim = model.get_sentence_embedding_dimension()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, sort_by_length in (('sırasız', False), ('uzunluğa göre sıralı', True)):
+            store = EmbeddingStore(os.path.join(tmp_dir, f"store_{sort_by_length}"), EMBEDDING_MODEL_NAME, dim)
+            start = time.perf_counter()
+            embed_texts(texts, store, model, batch_size=batch_size, sort_by_length=sort_by_length, show_progress=False)
+            elapsed = time.perf_counter() - start
+            results.append({'run': label, 'encoded': n_texts, 'seconds': elapsed,
+                            'sentences_per_sec': n_texts / elapsed, 'texts_per_sec': n_texts / elapsed,
+                            'peak_rss_mb': peak_rss_mb()})
+
+        # Yeniden çalışma: değişen başlıklar dışında her şey depodan gelir
+        changed = rng.choice(n_texts, int(n_texts * changed_fraction), replace=False)
+        for i in changed:
+            texts[i] = texts[i] + " revised"
+        before = len(store)
+        start = time.perf_counter()
+        rows = embed_texts(texts, store, model, batch_size=batch_size, show_progress=False)
+        elapsed = time.perf_counter() - start
+        assert (rows >= 0).all()
+        encoded = len(store) - before
+        results.append({'run': 'yeniden çalışma', 'encoded': encoded, 'seconds': elapsed,
+                        'sentences_per_sec': encoded / elapsed, 'texts_per_sec': n_texts / elapsed,
+                        'peak_rss_mb': peak_rss_mb()})
+        store_mb = sum(os.path.getsize(os.path.join(store.path, name)) for name in os.listdir(store.path)) / 1e6
+
+    for result in results:
+        print(f"{result['run']:>22}: {result['encoded']:6d} kodlanan | {result['seconds']:7.2f} sn | "
+              f"{result['sentences_per_sec']:8.0f} kodlanan cümle/sn | {result['texts_per_sec']:8.0f} metin/sn "
+              f"(depodan gelenler dahil) | tepe bellek {result['peak_rss_mb']:.0f} MB")
+    print(f"Depo boyutu: {store_mb:.1f} MB ({n_texts + len(changed)} vektör, {dim} boyut, float16)")
+
+    return results
+
+def embed_labeled_dataset():
+    """
+    Etiketli veri setini (CSV/Parquet) yükle, başlıkları vektörlere çevir ve depoyu ZIP olarak indir.
+    Daha önce indirilen depo ZIP'i de yüklenirse yalnızca yeni/değişen başlıklar kodlanır.
+    """
+    print("umai_labeled_dataset.csv (veya .parquet) dosyasını ve varsa önceki umai_embeddings.zip dosyasını seçin:")
+    uploaded = files.upload()
+
+    if not uploaded:
+        print("Dosya yüklenmedi!")
+        return
+
+    dataset_filename = next((name for name in uploaded if name.endswith(('.csv', '.parquet'))), None)
+    if dataset_filename is None:
+        print("Veri seti dosyası bulunamadı!")
+        return
+
+    # Önceki depo varsa aç (yalnızca değişen başlıklar kodlanır)
+    store_zip = f"{EMBEDDING_STORE_DIR}.zip"
+    if store_zip in uploaded:
+        with zipfile.ZipFile(store_zip, 'r') as zip_ref:
+            zip_ref.extractall('.')
+        print(f"Önceki vektör deposu açıldı: {EMBEDDING_STORE_DIR}")
+
+    if dataset_filename.endswith('.parquet'):
+        df = pd.read_parquet(dataset_filename, columns=['text', 'icd_code'])
+    else:
+        df = pd.read_csv(dataset_filename, encoding='utf-8')
+    df = df.dropna(subset=['text'])
+    print(f"Veri seti: {len(df)} kayıt, {df['icd_code'].nunique()} ICD kodu")
+
+    model = load_embedding_model()
+    store = EmbeddingStore(EMBEDDING_STORE_DIR, EMBEDDING_MODEL_NAME, model.get_sentence_embedding_dimension())
+
+    start = time.perf_counter()
+    rows = embed_texts(df['text'].tolist(), store, model)
+    elapsed = time.perf_counter() - start
+    print(f"✓ {len(rows)} başlık {elapsed:.1f} sn'de hazır (depoda {len(store)} vektör), "
+          f"tepe bellek {peak_rss_mb():.0f} MB")
+
+    # Depoyu indir
+    shutil.make_archive(EMBEDDING_STORE_DIR, 'zip', '.', EMBEDDING_STORE_DIR)
+    files.download(store_zip)
+    print(f"✓ {store_zip} dosyası indirildi")
+
+# Fonksiyonu çalıştır
+embed_labeled_dataset()
@@ -0,0 +1,430 @@
+# Etiketli makale vektörleri üzerinde en yakın komşu araması ile doktor notundan ICD-10 kod önerisi yapan kod
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import time
+import shutil
+import hashlib
+import zipfile
+from google.colab import files
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Faz1,6 vektör deposu ve modeli
+EMBEDDING_MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+EMBEDDING_STORE_DIR = 'umai_embeddings'
+
+# Bu sayıya kadar vektörde tam (brute-force) arama yapılır, üstünde bölümlü (IVF) indeks kullanılır
+EXACT_SEARCH_MAX_VECTORS = 100000
+# Tam aramada bir seferde skorlanan vektör sayısı (ara matris belleğini sınırlar)
+EXACT_SEARCH_CHUNK_SIZE = 65536
+# Bölüm sayısı ~ sqrt(N); aramada taranan bölüm sayısı
+IVF_DEFAULT_NPROBE = 16
+IVF_TRAIN_SAMPLE_SIZE = 65536
+IVF_TRAIN_ITERATIONS = 8
+
+# Komşu oylarının kod skorlarına çevrilmesinde benzerlik sıcaklığı (küçüldükçe en yakın komşular baskın)
+VOTE_TEMPERATURE = 0.05
+SUGGEST_NEIGHBORS = 50
+SUGGEST_TOP_CODES = 10
+SUGGESTION_INDEX_DIR = 'umai_icd_suggest_index'
+
+def text_hash(text):
+    """Faz1,6 vektör deposu anahtarı (metnin 16 baytlık özeti)."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+def load_embedding_store(path=EMBEDDING_STORE_DIR):
+    """Faz1,6 vektör deposunu salt okunur açar: (özetler, float16 vektör memmap'i, meta)."""
+    with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    keys = np.fromfile(os.path.join(path, 'keys.bin'), dtype='S16', count=meta['count'])
+    vectors = np.memmap(os.path.join(path, 'vectors.f16'), dtype=np.float16, mode='r',
+                        shape=(meta['count'], meta['dim']))
+    return keys, vectors, meta
+
+def lookup_store_rows(keys, texts):
+    """Metinlerin depo satırlarını döndürür; depoda olmayanlar için -1."""
+    hashes = np.array([text_hash(str(text)) for text in texts], dtype='S16')
+    order = np.argsort(keys, kind='stable')
+    positions = np.minimum(np.searchsorted(keys[order], hashes), max(len(keys) - 1, 0))
+    rows = np.full(len(hashes), -1, dtype=np.int64)
+    if len(keys):
+        found = keys[order][positions] == hashes
+        rows[found] = order[positions[found]]
+    return rows
+
+def _normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+def _merge_top_k(best_scores, best_ids, scores, ids, k):
+    """İki aday kümesinden satır başına en yüksek k skoru (azalan sırada) seçer."""
+    scores = np.concatenate([best_scores, scores], axis=1)
+    ids = np.concatenate([best_ids, ids], axis=1)
+    if scores.shape[1] > k:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, top, axis=1)
+        ids = np.take_along_axis(ids, top, axis=1)
+    order = np.argsort(-scores, axis=1, kind='stable')
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(ids, order, axis=1)
+
+def spherical_kmeans(vectors, n_clusters, iterations=IVF_TRAIN_ITERATIONS, seed=42):
+    """Birim vektörler üzerinde kosinüs k-ortalamalar; boş kalan merkezler rastgele noktalarla yenilenir."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = _normalize_rows(sums)
+
+    return centroids
+
+class ICDSuggestionIndex:
+    """
+    (metin vektörü, ICD kodu) satırları üzerinde kosinüs en yakın komşu indeksi.
+
+    Vektörler bölümlerine (IVF listeleri) göre sıralanmış tek bir float32 dizide tutulur;
+    tam arama tüm diziyi parça parça tarar, yaklaşık arama yalnızca sorguya en yakın
+    nprobe bölümün bitişik aralıklarını tarar. Komşuların kodları benzerlik ağırlıklı
+    oylarla sıralı kod listesine çevrilir. İndeks .npy dosyalarından memmap ile açılır.
+    """
+
+    ARRAY_NAMES = ('vectors', 'row_ids', 'label_ids', 'centroids', 'list_offsets', 'codes')
+
+    def __init__(self, arrays):
+        self.vectors = arrays['vectors']
+        self.row_ids = arrays['row_ids']
+        self.label_ids = arrays['label_ids']
+        self.centroids = arrays['centroids']
+        self.list_offsets = arrays['list_offsets']
+        self.codes = arrays['codes']
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def n_lists(self):
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, vectors, icd_codes, n_lists=None, seed=42):
+        """
+        Vektörlerden (float16/float32, memmap olabilir) ve satır başına ICD kodlarından indeks kurar.
+        n_lists verilmezse küçük setlerde bölümleme yapılmaz (tek liste), büyüklerde ~sqrt(N) bölüm
+        eğitilir. Normalizasyon parça parça yapılır; bellekte girdiye ek olarak yalnızca indeks kopyası tutulur.
+        """
+        n_vectors, dim = vectors.shape
+        if n_vectors == 0:
+            raise ValueError("İndeks kurmak için en az bir vektör gerekli")
+        codes, label_ids = np.unique(np.asarray(icd_codes).astype(str), return_inverse=True)
+
+        if n_lists is None:
+            n_lists = 1 if n_vectors <= EXACT_SEARCH_MAX_VECTORS else int(np.sqrt(n_vectors))
+        n_lists = max(1, min(n_lists, n_vectors))
+
+        chunks = range(0, n_vectors, EXACT_SEARCH_CHUNK_SIZE)
+        if n_lists == 1:
+            total = sum((_normalize_rows(vectors[start:start + EXACT_SEARCH_CHUNK_SIZE]).sum(axis=0) for start in chunks),
+                        np.zeros(dim, dtype=np.float32))
+            centroids = _normalize_rows(total[None, :])
+            assignment = np.zeros(n_vectors, dtype=np.int64)
+        else:
+            rng = np.random.default_rng(seed)
+            sample_size = min(n_vectors, max(IVF_TRAIN_SAMPLE_SIZE, n_lists * 32))
+            sample = _normalize_rows(vectors[np.sort(rng.choice(n_vectors, sample_size, replace=False))])
+            centroids = spherical_kmeans(sample, n_lists, seed=seed)
+
+            # Tüm vektörleri en yakın merkeze ata (parça parça)
+            assignment = np.empty(n_vectors, dtype=np.int64)
+            for start in chunks:
+                chunk = _normalize_rows(vectors[start:start + EXACT_SEARCH_CHUNK_SIZE])
+                assignment[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+
+        order = np.argsort(assignment, kind='stable')
+        list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        list_offsets[1:] = np.cumsum(np.bincount(assignment, minlength=n_lists))
+
+        # Bölüme göre sıralı, normalize float32 kopya
+        index_vectors = np.empty((n_vectors, dim), dtype=np.float32)
+        for start in chunks:
+            index_vectors[start:start + EXACT_SEARCH_CHUNK_SIZE] = _normalize_rows(
+                vectors[order[start:start + EXACT_SEARCH_CHUNK_SIZE]]
+            )
+
+        return cls({
+            'vectors': index_vectors,
+            'row_ids': order.astype(np.int64),
+            'label_ids': label_ids[order].astype(np.int32),
+            'centroids': centroids.astype(np.float32),
+            'list_offsets': list_offsets,
+            'codes': codes
+        })
+
+    def save(self, path=SUGGESTION_INDEX_DIR):
+        """İndeksi klasöre .npy dosyaları olarak yazar."""
+        os.makedirs(path, exist_ok=True)
+        for name in self.ARRAY_NAMES:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        return path
+
+    @classmethod
+    def load(cls, path=SUGGESTION_INDEX_DIR):
+        """İndeksi kopyalamadan (memmap) açar."""
+        return cls({name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r' if name != 'codes' else None)
+                    for name in cls.ARRAY_NAMES})
+
+    def search_exact(self, queries, k=SUGGEST_NEIGHBORS):
+        """Tüm vektörleri tarayan tam arama: (skorlar, indeks içi konumlar), satır başına azalan sırada."""
+        queries = _normalize_rows(np.atleast_2d(queries))
+        k = min(k, len(self))
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+
+        for start in range(0, len(self), EXACT_SEARCH_CHUNK_SIZE):
+            scores = queries @ self.vectors[start:start + EXACT_SEARCH_CHUNK_SIZE].T
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            best_scores, best_ids = _merge_top_k(best_scores, best_ids, scores, top + start, k)
+
+        return best_scores, best_ids
+
+    def search_ivf(self, queries, k=SUGGEST_NEIGHBORS, nprobe=IVF_DEFAULT_NPROBE):
+        """Sorguya en yakın nprobe bölümü tarayan yaklaşık arama."""
+        queries = _normalize_rows(np.atleast_2d(queries))
+        nprobe = min(nprobe, self.n_lists)
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+
+        all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        all_ids = np.zeros((len(queries), k), dtype=np.int64)
+        for q, lists in enumerate(probes):
+            ids = np.concatenate([np.arange(self.list_offsets[l], self.list_offsets[l + 1]) for l in lists])
+            if len(ids) == 0:
+                continue
+            # Bölümler bitişik olduğundan aralıklar tek seferde okunur
+            candidates = np.concatenate([self.vectors[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists])
+            scores = candidates @ queries[q]
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind='stable')]
+            all_scores[q, :len(top)] = scores[top]
+            all_ids[q, :len(top)] = ids[top]
+
+        return all_scores, all_ids
+
+    def search(self, queries, k=SUGGEST_NEIGHBORS, nprobe=IVF_DEFAULT_NPROBE, mode='auto'):
+        """mode: 'exact', 'ivf' veya 'auto' (tek bölümlü/küçük indekste tam arama)."""
+        if mode == 'auto':
+            mode = 'exact' if self.n_lists == 1 or len(self) <= EXACT_SEARCH_MAX_VECTORS else 'ivf'
+        if mode == 'exact':
+            return self.search_exact(queries, k)
+        if mode == 'ivf':
+            return self.search_ivf(queries, k, nprobe)
+        raise ValueError(f"Geçersiz arama modu: {mode}")
+
+    def aggregate_votes(self, scores, ids, top_codes=SUGGEST_TOP_CODES, temperature=VOTE_TEMPERATURE):
+        """
+        Komşu oylarını kod skorlarına çevirir: her komşu exp((benzerlik - en iyi) / sıcaklık)
+        ağırlığıyla kendi koduna oy verir, skorlar 1'e normalize edilir.
+        Sorgu başına [(kod, skor, komşu sayısı), ...] listesi döndürür.
+        """
+        suggestions = []
+        for row_scores, row_ids in zip(scores, ids):
+            valid = np.isfinite(row_scores)
+            if not valid.any():
+                suggestions.append([])
+                continue
+            labels = self.label_ids[row_ids[valid]]
+            weights = np.exp((row_scores[valid] - row_scores[valid].max()) / temperature)
+
+            code_ids, inverse = np.unique(labels, return_inverse=True)
+            code_scores = np.bincount(inverse, weights=weights)
+            code_votes = np.bincount(inverse)
+            code_scores /= code_scores.sum()
+
+            top = np.argsort(-code_scores, kind='stable')[:top_codes]
+            suggestions.append([(str(self.codes[code_ids[i]]), float(code_scores[i]), int(code_votes[i]))
+                                for i in top])
+        return suggestions
+
+    def suggest(self, query_vectors, top_codes=SUGGEST_TOP_CODES, k=SUGGEST_NEIGHBORS,
+                nprobe=IVF_DEFAULT_NPROBE, mode='auto'):
+        """Sorgu vektörleri için sıralı ICD kod önerileri döndürür."""
+        scores, ids = self.search(query_vectors, k=k, nprobe=nprobe, mode=mode)
+        return self.aggregate_votes(scores, ids, top_codes)
+
+def load_embedding_model(model_name=EMBEDDING_MODEL_NAME, device='cpu'):
+    """sentence-transformers modelini yükler."""
+    if SentenceTransformer is None:
+        raise ImportError("sentence-transformers yüklü değil (pip install sentence-transformers)")
+    return SentenceTransformer(model_name, device=device)
+
+def suggest_codes_for_notes(notes, index, model, top_codes=SUGGEST_TOP_CODES, **search_options):
+    """Doktor notlarını vektörleyip her not için ICD kod önerilerini döndürür."""
+    vectors = model.encode(list(notes), convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+    return index.suggest(vectors, top_codes=top_codes, **search_options)
+
+def build_index_from_dataset(df, store_dir=EMBEDDING_STORE_DIR, n_lists=None):
+    """
+    Etiketli veri setinin (text, icd_code) satırlarından Faz1,6 vektörleriyle indeks kurar.
+    Depoda veri setinin hiçbir başlığı yoksa (eski umai_embeddings.zip) None döndürür.
+    """
+    keys, store_vectors, meta = load_embedding_store(store_dir)
+    rows = lookup_store_rows(keys, df['text'].tolist())
+    missing = int((rows < 0).sum())
+    if missing:
+        print(f"⚠️ {missing} başlığın vektörü depoda yok, atlanıyor (Faz1,6'yı yeniden çalıştırın)")
+
+    keep = rows >= 0
+    if not keep.any():
+        print("❌ Veri setindeki başlıkların hiçbiri vektör deposunda yok; umai_embeddings.zip bu veri "
+              "setiyle üretilmemiş olabilir (Faz1,6'yı bu veri setiyle yeniden çalıştırın)")
+        return None
+    vectors = store_vectors[rows[keep]]
+    return ICDSuggestionIndex.build(vectors, df['icd_code'].to_numpy()[keep], n_lists=n_lists)
+
+def _synthetic_labeled_vectors(n_vectors, dim, n_codes, noise, rng, chunk_size=EXACT_SEARCH_CHUNK_SIZE):
+    """
+    Kod merkezleri etrafında gürültülü birim vektörler. Kodlar bölüm merkezleri etrafında
+    toplanır (aynı bölümdeki kodlar birbirine yakındır), gerçek başlık vektörlerine benzer kümelenme.
+    """
+    n_chapters = max(1, n_codes // 50)
+    chapter_centers = _normalize_rows(rng.standard_normal((n_chapters, dim), dtype=np.float32))
+    code_centers = _normalize_rows(chapter_centers[rng.integers(0, n_chapters, n_codes)]
+                                   + 0.6 * _normalize_rows(rng.standard_normal((n_codes, dim), dtype=np.float32)))
+    labels = rng.integers(0, n_codes, n_vectors)
+    vectors = np.empty((n_vectors, dim), dtype=np.float32)
+    for start in range(0, n_vectors, chunk_size):
+        end = min(start + chunk_size, n_vectors)
+        chunk = code_centers[labels[start:end]] + noise * rng.standard_normal((end - start, dim), dtype=np.float32)
+        vectors[start:end] = _normalize_rows(chunk)
+    return vectors, labels, code_centers
+
+def _recall(exact_ids, approx_ids):
+    """Yaklaşık aramanın tam aramadaki ilk k komşudan bulduğu oran."""
+    hits = sum(len(np.intersect1d(e, a, assume_unique=True)) for e, a in zip(exact_ids, approx_ids))
+    return hits / exact_ids.size
+
+def benchmark_suggestion_index(n_vectors=1000000, dim=384, n_codes=5000, n_queries=200, k=SUGGEST_NEIGHBORS,
+                               nprobe_values=(4, 8, 16, 32, 64), noise=0.08, seed=42):
+    """
+    Sentetik kümelenmiş vektörlerle (varsayılan 1M x 384) tam ve IVF aramayı karşılaştırır:
+    kurulum süresi, sorgu başına p50/p95 gecikme, tam aramaya göre komşu recall@k,
+    en iyi kod uyumu ve gerçek koda göre top-1 / top-5 doğruluğu.
+    """
+    rng = np.random.default_rng(seed)
+    vectors, labels, code_centers = _synthetic_labeled_vectors(n_vectors, dim, n_codes, noise, rng)
+    label_names = np.array([f"C{i:05d}" for i in range(n_codes)])
+
+    start = time.perf_counter()
+    index = ICDSuggestionIndex.build(vectors, label_names[labels], n_lists=int(np.sqrt(n_vectors)), seed=seed)
+    build_seconds = time.perf_counter() - start
+    del vectors
+
+    # Sorgular: bir kod merkezine yakın, indekste olmayan yeni "notlar"
+    query_labels = rng.integers(0, n_codes, n_queries)
+    queries = _normalize_rows(code_centers[query_labels] + noise * rng.standard_normal((n_queries, dim), dtype=np.float32))
+    truth = label_names[query_labels]
+
+    def run(search):
+        latencies, all_scores, all_ids = [], [], []
+        for query in queries:
+            t0 = time.perf_counter()
+            scores, ids = search(query[None, :])
+            latencies.append(time.perf_counter() - t0)
+            all_scores.append(scores[0])
+            all_ids.append(ids[0])
+        scores, ids = np.array(all_scores), np.array(all_ids)
+        suggestions = index.aggregate_votes(scores, ids, top_codes=5)
+        top1 = np.mean([bool(s) and s[0][0] == t for s, t in zip(suggestions, truth)])
+        top5 = np.mean([t in [code for code, _, _ in s] for s, t in zip(suggestions, truth)])
+        return ids, suggestions, np.array(latencies) * 1000, top1, top5
+
+    results = []
+    exact_ids, exact_suggestions, latencies, top1, top5 = run(lambda q: index.search_exact(q, k))
+    results.append({'mode': 'exact', 'p50_ms': np.percentile(latencies, 50), 'p95_ms': np.percentile(latencies, 95),
+                    'recall': 1.0, 'code_agreement': 1.0, 'top1': top1, 'top5': top5})
+
+    for nprobe in nprobe_values:
+        ids, suggestions, latencies, top1, top5 = run(lambda q: index.search_ivf(q, k, nprobe))
+        agreement = np.mean([bool(a) and bool(e) and a[0][0] == e[0][0]
+                             for a, e in zip(suggestions, exact_suggestions)])
+        results.append({'mode': f'ivf nprobe={nprobe}', 'p50_ms': np.percentile(latencies, 50),
+                        'p95_ms': np.percentile(latencies, 95), 'recall': _recall(exact_ids, ids),
+                        'code_agreement': agreement, 'top1': top1, 'top5': top5})
+
+    print(f"{n_vectors} vektör x {dim} boyut, {n_codes} kod, {index.n_lists} bölüm, kurulum {build_seconds:.1f} sn")
+    print(f"{'arama':>16} | {'p50 ms':>7} | {'p95 ms':>7} | recall@{k} | kod uyumu | top-1 | top-5")
+    for result in results:
+        print(f"{result['mode']:>16} | {result['p50_ms']:7.2f} | {result['p95_ms']:7.2f} | {result['recall']:9.3f} | "
+              f"{result['code_agreement']:9.3f} | {result['top1']:.3f} | {result['top5']:.3f}")
+
+    return results
+
+# Örnek doktor notları (indeks kurulduktan sonra öneriler gösterilir)
+EXAMPLE_NOTES = [
+    "Hastada 3 gündür ateş, öksürük ve nefes darlığı; akciğer grafisinde sağ alt lobda infiltrasyon",
+    "Type 2 diabetes mellitus with poor glycemic control and peripheral neuropathy",
+    "Acute myocardial infarction, ST elevation in anterior leads, troponin elevated",
+]
+
+def build_suggestion_index():
+    """
+    Etiketli veri setini ve Faz1,6 vektör deposunu (umai_embeddings.zip) yükle,
+    ICD kod öneri indeksini kur, örnek notlar için önerileri göster ve indeksi indir.
+    """
+    print("umai_labeled_dataset.csv (veya .parquet) ve umai_embeddings.zip dosyalarını seçin:")
+    uploaded = files.upload()
+
+    if not uploaded:
+        print("Dosya yüklenmedi!")
+        return
+
+    dataset_filename = next((name for name in uploaded if name.endswith(('.csv', '.parquet'))), None)
+    store_zip = f"{EMBEDDING_STORE_DIR}.zip"
+    if dataset_filename is None or store_zip not in uploaded:
+        print("Veri seti veya vektör deposu bulunamadı!")
+        return
+
+    with zipfile.ZipFile(store_zip, 'r') as zip_ref:
+        zip_ref.extractall('.')
+
+    if dataset_filename.endswith('.parquet'):
+        df = pd.read_parquet(dataset_filename, columns=['text', 'icd_code'])
+    else:
+        df = pd.read_csv(dataset_filename, encoding='utf-8')
+    df = df.dropna(subset=['text', 'icd_code'])
+
+    start = time.perf_counter()
+    index = build_index_from_dataset(df)
+    if index is None:
+        return
+    print(f"✓ İndeks kuruldu: {len(index)} vektör, {len(index.codes)} kod, {index.n_lists} bölüm "
+          f"({time.perf_counter() - start:.1f} sn)")
+
+    model = load_embedding_model()
+    for note, suggestions in zip(EXAMPLE_NOTES, suggest_codes_for_notes(EXAMPLE_NOTES, index, model, top_codes=5)):
+        print(f"\nNot: {note}")
+        for code, score, votes in suggestions:
+            print(f"  {code}: {score:.3f} ({votes} komşu)")
+
+    index.save(SUGGESTION_INDEX_DIR)
+    shutil.make_archive(SUGGESTION_INDEX_DIR, 'zip', '.', SUGGESTION_INDEX_DIR)
+    files.download(f"{SUGGESTION_INDEX_DIR}.zip")
+    print(f"\n✓ {SUGGESTION_INDEX_DIR}.zip dosyası indirildi")
+
+# Fonksiyonu çalıştır
+build_suggestion_index()
@@ -0,0 +1,299 @@
+# Etiketli veri setinden kelime ve karakter n-gram TF-IDF özellikleriyle hızlı ICD-10 sınıflandırıcı (CPU taban modeli) eğiten kod
+
+import pandas as pd
+import numpy as np
+import json
+import os
+import time
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from google.colab import files
+
+# Özellik uzayı: kelime (1-2 gram) ve karakter (3-5 gram, kelime sınırlı) n-gramları ayrı hash uzaylarında
+WORD_NGRAM_RANGE = (1, 2)
+CHAR_NGRAM_RANGE = (3, 5)
+HASH_FEATURES = 2 ** 20
+# Her kod vektöründe tutulan en ağırlıklı özellik sayısı (model boyutu ve tahmin süresini sınırlar)
+MAX_FEATURES_PER_CODE = 4000
+# Tahminde bir seferde yoğun skora çevrilen not sayısı
+PREDICT_CHUNK_SIZE = 2048
+CLASSIFIER_FILENAME = 'umai_tfidf_classifier.npz'
+
+# Türkçe büyük harfler (I -> ı, İ -> i) ve klavyede yazılmayan harfler ASCII karşılığına indirgenir;
+# böylece "Akciğer", "AKCİĞER" ve "akciger" aynı n-gramları üretir
+_TURKISH_FOLD = str.maketrans('ıİIğĞüÜşŞöÖçÇâÂîÎûÛ', 'iiigguussooccaaiiuu')
+
+def normalize_text(text):
+    """Türkçe kurallarıyla küçük harfe çevirir, ASCII'ye katlar ve boşlukları sadeleştirir."""
+    return " ".join(str(text).translate(_TURKISH_FOLD).lower().split())
+
+class TfidfICDClassifier:
+    """
+    Hash'lenmiş kelime + karakter n-gram TF-IDF özellikleri üzerinde kod merkezli (Rocchio) sınıflandırıcı.
+
+    Her ICD kodu, eğitim notlarının TF-IDF vektörlerinin normalize ortalamasıdır ve en ağırlıklı
+    MAX_FEATURES_PER_CODE özelliğe budanır. Toplu tahmin tek bir seyrek matris çarpımıdır
+    (notlar x özellikler) @ (özellikler x kodlar). Sözlük tutulmadığından model yalnızca IDF
+    vektörü ve seyrek ağırlık matrisinden oluşur; .npz dosyasından milisaniyeler içinde yüklenir.
+    """
+
+    def __init__(self, codes=None, idf=None, weights=None, max_features_per_code=MAX_FEATURES_PER_CODE):
+        self.codes = codes
+        self.idf = idf
+        # (özellik, kod) CSR: tahmin çarpımı doğrudan bu biçimle yapılır
+        self.weights = weights
+        self.max_features_per_code = max_features_per_code
+
+        # Metinler _term_counts'ta bir kez normalize edilir, vektörleştiriciler yeniden küçültmez
+        self.word_vectorizer = HashingVectorizer(
+            lowercase=False, analyzer='word', ngram_range=WORD_NGRAM_RANGE,
+            token_pattern=r'(?u)\b\w+\b', n_features=HASH_FEATURES, alternate_sign=False, norm=None,
+            dtype=np.float32
+        )
+        self.char_vectorizer = HashingVectorizer(
+            lowercase=False, analyzer='char_wb', ngram_range=CHAR_NGRAM_RANGE,
+            n_features=HASH_FEATURES, alternate_sign=False, norm=None, dtype=np.float32
+        )
+
+    def _term_counts(self, texts):
+        """Kelime ve karakter n-gram sayımları (not x 2*HASH_FEATURES seyrek matris)."""
+        texts = [normalize_text(text) for text in texts]
+        return sp.hstack([self.word_vectorizer.transform(texts), self.char_vectorizer.transform(texts)],
+                         format='csr', dtype=np.float32)
+
+    def _tfidf(self, counts):
+        """Alt doğrusal tf (1 + log tf) x idf, satır başına L2 normalize."""
+        counts = counts.copy()
+        np.log(counts.data, out=counts.data)
+        counts.data += 1
+        counts.data *= self.idf[counts.indices]
+        return normalize(counts, norm='l2', copy=False)
+
+    def transform(self, texts):
+        """Notları TF-IDF özellik matrisine çevirir."""
+        return self._tfidf(self._term_counts(texts))
+
+    def fit(self, texts, icd_codes):
+        """Kod merkezlerini hesaplar ve budar."""
+        counts = self._term_counts(texts)
+
+        # Düzgünleştirilmiş idf = log((1 + n) / (1 + df)) + 1
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        self.idf = (np.log((1 + counts.shape[0]) / (1 + document_frequency)) + 1).astype(np.float32)
+        features = self._tfidf(counts)
+
+        self.codes, labels = np.unique(np.asarray(icd_codes).astype(str), return_inverse=True)
+        membership = sp.csr_matrix(
+            (np.ones(len(labels), dtype=np.float32), (labels, np.arange(len(labels)))),
+            shape=(len(self.codes), len(labels))
+        )
+        centroids = (membership @ features).tocsr()
+        centroids.sort_indices()
+
+        # Her kodun yalnızca en ağırlıklı özelliklerini tut
+        keep = np.zeros(centroids.nnz, dtype=bool)
+        for row in range(centroids.shape[0]):
+            start, end = centroids.indptr[row], centroids.indptr[row + 1]
+            if end - start <= self.max_features_per_code:
+                keep[start:end] = True
+            else:
+                top = np.argpartition(-centroids.data[start:end], self.max_features_per_code - 1)
+                keep[start + top[:self.max_features_per_code]] = True
+
+        rows = np.repeat(np.arange(centroids.shape[0]), np.diff(centroids.indptr))
+        pruned = sp.csr_matrix((centroids.data[keep], (rows[keep], centroids.indices[keep])),
+                               shape=centroids.shape, dtype=np.float32)
+        self.weights = normalize(pruned, norm='l2').T.tocsr()
+        return self
+
+    def decision_scores(self, texts):
+        """Not x kod kosinüs skorları (seyrek): tek seyrek matris çarpımı."""
+        return self.transform(texts) @ self.weights
+
+    def predict_topk(self, texts, k=5):
+        """Her not için en olası k kodu ve skorlarını döndürür: (kodlar [n, k], skorlar [n, k])."""
+        scores = self.decision_scores(texts)
+        k = min(k, len(self.codes))
+        top_codes = np.empty((scores.shape[0], k), dtype=self.codes.dtype)
+        top_scores = np.empty((scores.shape[0], k), dtype=np.float32)
+
+        for start in range(0, scores.shape[0], PREDICT_CHUNK_SIZE):
+            dense = scores[start:start + PREDICT_CHUNK_SIZE].toarray()
+            top = np.argpartition(-dense, k - 1, axis=1)[:, :k] if dense.shape[1] > k else \
+                np.broadcast_to(np.arange(dense.shape[1]), dense.shape)
+            top_values = np.take_along_axis(dense, top, axis=1)
+            order = np.argsort(-top_values, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            top_codes[start:start + len(dense)] = self.codes[top]
+            top_scores[start:start + len(dense)] = np.take_along_axis(top_values, order, axis=1)
+
+        return top_codes, top_scores
+
+    def predict(self, texts):
+        """Her not için en olası ICD kodu."""
+        return self.predict_topk(texts, k=1)[0][:, 0]
+
+    def evaluate(self, texts, icd_codes, k_values=(1, 3, 5)):
+        """Top-k doğruluk ve toplu tahmin hızını (not/sn) döndürür."""
+        start = time.perf_counter()
+        top_codes, _ = self.predict_topk(texts, k=max(k_values))
+        elapsed = time.perf_counter() - start
+
+        truth = np.asarray(icd_codes).astype(str)[:, None]
+        result = {f"top{k}": float((top_codes[:, :k] == truth).any(axis=1).mean()) for k in k_values}
+        result['notes_per_sec'] = len(truth) / elapsed
+        return result
+
+    def save(self, path=CLASSIFIER_FILENAME):
+        """Modeli sıkıştırmasız .npz olarak yazar (ağırlıklar float16)."""
+        np.savez(
+            path,
+            config=np.frombuffer(json.dumps({
+                'word_ngram_range': WORD_NGRAM_RANGE, 'char_ngram_range': CHAR_NGRAM_RANGE,
+                'hash_features': HASH_FEATURES, 'max_features_per_code': self.max_features_per_code
+            }).encode('utf-8'), dtype=np.uint8),
+            codes=self.codes,
+            idf=self.idf.astype(np.float16),
+            weights_data=self.weights.data.astype(np.float16),
+            weights_indices=self.weights.indices.astype(np.int32),
+            weights_indptr=self.weights.indptr.astype(np.int64),
+        )
+        return path
+
+    @classmethod
+    def load(cls, path=CLASSIFIER_FILENAME):
+        """Kaydedilmiş modeli yükler; farklı özellik ayarlarıyla eğitilmiş modeli reddeder."""
+        with np.load(path) as arrays:
+            config = json.loads(arrays['config'].tobytes().decode('utf-8'))
+            if (tuple(config['word_ngram_range']) != WORD_NGRAM_RANGE or tuple(config['char_ngram_range']) != CHAR_NGRAM_RANGE
+                    or config['hash_features'] != HASH_FEATURES):
+                raise ValueError(f"Model farklı özellik ayarlarıyla eğitilmiş: {config}")
+
+            codes = arrays['codes']
+            weights = sp.csr_matrix(
+                (arrays['weights_data'].astype(np.float32), arrays['weights_indices'], arrays['weights_indptr']),
+                shape=(2 * HASH_FEATURES, len(codes))
+            )
+            return cls(codes=codes, idf=arrays['idf'].astype(np.float32), weights=weights,
+                       max_features_per_code=config['max_features_per_code'])
+
+def train_test_split_by_code(df, test_fraction=0.1, seed=42):
+    """Her koddan test payı ayırır; tek örnekli kodlar eğitimde kalır."""
+    rng = np.random.default_rng(seed)
+    shuffled = df.iloc[rng.permutation(len(df))]
+    rank = shuffled.groupby('icd_code').cumcount()
+    size = shuffled.groupby('icd_code')['icd_code'].transform('size')
+    is_test = (rank < (size * test_fraction).astype(int)) & (size > 1)
+    return shuffled[~is_test], shuffled[is_test]
+
+def measure_latency(model, texts, repeats=200):
+    """Tek notluk tahmin gecikmesi (ms): p50 / p95."""
+    latencies = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        model.predict_topk([texts[i % len(texts)]], k=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(latencies, 50)), float(np.percentile(latencies, 95))
+
+def benchmark_tfidf_classifier(n_train=200000, n_test=20000, n_codes=2000, seed=42):
+    """
+    Sentetik Türkçe/İngilizce notlarla eğitim süresi, model boyutu, yükleme süresi,
+    top-k doğruluk, toplu tahmin hızı (not/sn) ve tek not gecikmesini ölçer.
+    Notların bir kısmı Türkçe karakterler olmadan yazılır ve ekler rastgele değişir.
+    """
+    import tempfile
+
+    rng = np.random.default_rng(seed)
+    syllables = np.array(['ak', 'ci', 'ger', 'kal', 'bo', 'bre', 'kar', 'dio', 'nef', 'ro', 'pat', 'hep', 'gas',
+                          'tro', 'en', 'fek', 'si', 'yon', 'tü', 'mör', 'şe', 'ker', 'ağ', 'rı', 'ös', 'ür'])
+    suffixes = np.array(['', '', 'ler', 'ları', 'nin', 'de', 'inde', 'li', 'sı', 's', 'itis', 'oma'])
+    filler = ['hasta', 'patient', 'with', 'ile', 'şikayet', 'study', 'tedavi', 'of', 've', 'gün', 'acute', 'kronik']
+
+    # Her kodun 3 özgü terimi ve aynı bloktaki (10 kod) kodlarla paylaştığı 3 terimi var;
+    # yalnızca blok terimleri geçen notlar belirsizdir (gerçek verideki yakın kodlar gibi)
+    def new_term():
+        return "".join(rng.choice(syllables, rng.integers(2, 4)))
+    block_terms = [[new_term() for _ in range(3)] for _ in range((n_codes + 9) // 10)]
+    code_terms = [[new_term() for _ in range(3)] + block_terms[code // 10] for code in range(n_codes)]
+
+    def make_notes(n):
+        labels = rng.integers(0, n_codes, n)
+        notes = []
+        for label in labels:
+            terms = [term + rng.choice(suffixes) for term in rng.choice(code_terms[label], 2, replace=False)]
+            words = terms + list(rng.choice(filler, 4))
+            rng.shuffle(words)
+            note = " ".join(words)
+            if rng.random() < 0.3:
+                note = note.translate(_TURKISH_FOLD)
+            notes.append(note.capitalize())
+        return notes, np.array([f"K{label:05d}" for label in labels])
+
+    train_texts, train_codes = make_notes(n_train)
+    test_texts, test_codes = make_notes(n_test)
+
+    start = time.perf_counter()
+    model = TfidfICDClassifier().fit(train_texts, train_codes)
+    train_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = model.save(os.path.join(tmp_dir, CLASSIFIER_FILENAME))
+        size_mb = os.path.getsize(path) / 1e6
+        start = time.perf_counter()
+        model = TfidfICDClassifier.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+    result = model.evaluate(test_texts, test_codes)
+    result['p50_ms'], result['p95_ms'] = measure_latency(model, test_texts)
+    result.update({'train_seconds': train_seconds, 'model_mb': size_mb, 'load_ms': load_ms})
+
+    print(f"{n_train} eğitim / {n_test} test notu, {n_codes} kod")
+    print(f"Eğitim {train_seconds:.1f} sn | model {size_mb:.1f} MB | yükleme {load_ms:.0f} ms")
+    print(f"Top-1 {result['top1']:.3f} | top-3 {result['top3']:.3f} | top-5 {result['top5']:.3f}")
+    print(f"Toplu tahmin {result['notes_per_sec']:.0f} not/sn | tek not p50 {result['p50_ms']:.2f} ms, "
+          f"p95 {result['p95_ms']:.2f} ms")
+
+    return result
+
+def train_tfidf_classifier():
+    """
+    Etiketli veri setini yükle, TF-IDF sınıflandırıcıyı eğit, ayrılmış test payında
+    top-k doğruluk ve gecikmeyi raporla, modeli indir.
+    """
+    print("umai_labeled_dataset.csv (veya .parquet) dosyasını seçin:")
+    uploaded = files.upload()
+
+    if not uploaded:
+        print("Dosya yüklenmedi!")
+        return
+
+    dataset_filename = list(uploaded.keys())[0]
+    if dataset_filename.endswith('.parquet'):
+        df = pd.read_parquet(dataset_filename, columns=['text', 'icd_code'])
+    else:
+        df = pd.read_csv(dataset_filename, encoding='utf-8')
+    df = df.dropna(subset=['text', 'icd_code'])
+    print(f"Veri seti: {len(df)} kayıt, {df['icd_code'].nunique()} ICD kodu")
+
+    train_df, test_df = train_test_split_by_code(df)
+    print(f"Eğitim: {len(train_df)} | Test: {len(test_df)}")
+
+    start = time.perf_counter()
+    model = TfidfICDClassifier().fit(train_df['text'].tolist(), train_df['icd_code'].to_numpy())
+    print(f"✓ Model eğitildi ({time.perf_counter() - start:.1f} sn, {model.weights.nnz} ağırlık)")
+
+    if len(test_df):
+        result = model.evaluate(test_df['text'].tolist(), test_df['icd_code'].to_numpy())
+        p50, p95 = measure_latency(model, test_df['text'].tolist())
+        print(f"Top-1 {result['top1']:.3f} | top-3 {result['top3']:.3f} | top-5 {result['top5']:.3f}")
+        print(f"Toplu tahmin {result['notes_per_sec']:.0f} not/sn | tek not p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+    # Yayın modeli tüm veriyle yeniden eğitilir
+    model = TfidfICDClassifier().fit(df['text'].tolist(), df['icd_code'].to_numpy())
+    model.save(CLASSIFIER_FILENAME)
+    print(f"✓ {CLASSIFIER_FILENAME} ({os.path.getsize(CLASSIFIER_FILENAME) / 1e6:.1f} MB) indiriliyor")
+    files.download(CLASSIFIER_FILENAME)
+
+# Fonksiyonu çalıştır
+train_tfidf_classifier()